@@ -8,6 +8,15 @@ def set_run_arguments(parser: argparse.ArgumentParser):
     add_model_param(parser)
     add_server_arguments(parser)
 
+    parser.add_argument(
+        "--workers",
+        default=1,
+        type=int,
+        help="Number of worker processes which handle the requests. Use a "
+        "tracker store and a lock store shared by all workers when running "
+        "several workers.",
+    )
+
 
 def set_run_action_arguments(parser: argparse.ArgumentParser):
     import rasa_sdk.cli.arguments as sdk
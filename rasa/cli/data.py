@@ -11,8 +11,6 @@ from rasa.constants import DEFAULT_DATA_PATH
 def add_subparser(
     subparsers: argparse._SubParsersAction, parents: List[argparse.ArgumentParser]
 ):
-    import rasa.nlu.convert as convert
-
     data_parser = subparsers.add_parser(
         "data",
         conflict_handler="resolve",
@@ -38,7 +36,7 @@ def add_subparser(
         parents=parents,
         help="Converts NLU data between Markdown and json formats.",
     )
-    convert_nlu_parser.set_defaults(func=convert.main)
+    convert_nlu_parser.set_defaults(func=convert_nlu_data)
 
     arguments.set_convert_arguments(convert_nlu_parser)
 
@@ -63,6 +61,12 @@ def add_subparser(
     arguments.set_split_arguments(nlu_split_parser)
 
 
+def convert_nlu_data(args):
+    import rasa.nlu.convert as convert
+
+    convert.main(args)
+
+
 def split_nlu_data(args):
     from rasa.nlu.training_data.loading import load_data
     from rasa.nlu.training_data.util import get_file_format
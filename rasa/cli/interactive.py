@@ -1,6 +1,5 @@
 import argparse
 import os
-import shutil
 from typing import List, Text
 
 import rasa.cli.train as train
@@ -81,7 +80,7 @@ def perform_interactive_learning(args, zipped_model):
 
         do_interactive_learning(args, stories_directory)
 
-        shutil.rmtree(model_path)
+        model.remove_unpacked_model(model_path)
     else:
         print_error(
             "Interactive learning process cannot be started as no initial model was "
@@ -1,5 +1,4 @@
 import os
-import pkg_resources
 
 DEFAULT_ENDPOINTS_PATH = "endpoints.yml"
 DEFAULT_CREDENTIALS_PATH = "credentials.yml"
@@ -10,12 +9,16 @@ DEFAULT_MODELS_PATH = "models"
 DEFAULT_DATA_PATH = "data"
 DEFAULT_RESULTS_PATH = "results"
 DEFAULT_REQUEST_TIMEOUT = 60 * 5  # 5 minutes
+DEFAULT_CONNECTION_LIMIT = 100  # connections pooled per endpoint
+DEFAULT_KEEPALIVE_TIMEOUT = 15  # seconds an idle connection is kept open
+DEFAULT_MODEL_CACHE_SIZE = 3  # unpacked models kept in the model cache
+DEFAULT_PARSE_BATCH_SIZE = 64  # messages parsed together by the batch endpoint
 
 DOCS_BASE_URL = "https://rasa.com/docs/rasa"
 LEGACY_DOCS_BASE_URL = "https://legacy-docs.rasa.com"
 
-FALLBACK_CONFIG_PATH = pkg_resources.resource_filename(
-    __name__, "cli/default_config.yml"
+FALLBACK_CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__), "cli", "default_config.yml"
 )
 CONFIG_MANDATORY_KEYS_CORE = ["policies"]
 CONFIG_MANDATORY_KEYS_NLU = ["language", "pipeline"]
@@ -30,3 +33,25 @@ DEFAULT_LOG_LEVEL_RASA_X = "WARNING"
 DEFAULT_LOG_LEVEL_LIBRARIES = "ERROR"
 ENV_LOG_LEVEL = "LOG_LEVEL"
 ENV_LOG_LEVEL_LIBRARIES = "LOG_LEVEL_LIBRARIES"
+ENV_MODEL_CACHE_DIRECTORY = "MODEL_CACHE_DIRECTORY"
+ENV_MODEL_CACHE_SIZE = "MODEL_CACHE_SIZE"
+
+NLU_EXECUTION_MODES = ["inline", "thread", "process"]
+DEFAULT_NLU_EXECUTION_MODE = "inline"
+DEFAULT_NLU_MAX_WORKERS = 1
+DEFAULT_NLU_MAX_PENDING = 100  # parse requests queued for the workers
+DEFAULT_NLU_BATCH_WINDOW = 0  # seconds, messages aren't batched by default
+DEFAULT_NLU_MAX_BATCH_SIZE = 32
+DEFAULT_NLU_CACHE_SIZE = 0  # parse results aren't cached by default
+DEFAULT_NLU_HTTP_CACHE_TTL = 60  # seconds, the remote model might change
+ENV_NLU_EXECUTION_MODE = "NLU_EXECUTION_MODE"
+ENV_NLU_MAX_WORKERS = "NLU_MAX_WORKERS"
+ENV_NLU_MAX_PENDING = "NLU_MAX_PENDING"
+ENV_NLU_BATCH_WINDOW = "NLU_BATCH_WINDOW"
+ENV_NLU_MAX_BATCH_SIZE = "NLU_MAX_BATCH_SIZE"
+ENV_NLU_CACHE_SIZE = "NLU_CACHE_SIZE"
+
+DEFAULT_PREDICTION_BATCH_WINDOW = 0  # seconds, predictions aren't batched by default
+DEFAULT_MAX_PREDICTION_BATCH_SIZE = 32
+ENV_PREDICTION_BATCH_WINDOW = "PREDICTION_BATCH_WINDOW"
+ENV_MAX_PREDICTION_BATCH_SIZE = "MAX_PREDICTION_BATCH_SIZE"
@@ -1,7 +1,9 @@
+import asyncio
 import logging
 import os
 import shutil
 import tempfile
+import time
 import uuid
 from asyncio import CancelledError
 from sanic import Sanic
@@ -10,8 +12,14 @@ from typing import Any, Callable, Dict, List, Optional, Text, Tuple, Union
 import aiohttp
 
 import rasa
-import rasa.utils.io
-from rasa.constants import DEFAULT_DOMAIN_PATH, LEGACY_DOCS_BASE_URL
+from rasa.constants import (
+    DEFAULT_DOMAIN_PATH,
+    DEFAULT_MAX_PREDICTION_BATCH_SIZE,
+    DEFAULT_PREDICTION_BATCH_WINDOW,
+    ENV_MAX_PREDICTION_BATCH_SIZE,
+    ENV_PREDICTION_BATCH_WINDOW,
+    LEGACY_DOCS_BASE_URL,
+)
 from rasa.core import constants, jobs, training
 from rasa.core.channels import (
     InputChannel,
@@ -19,25 +27,44 @@ from rasa.core.channels import (
     UserMessage,
     CollectingOutputChannel,
 )
+from rasa.core.actions.action import ACTION_LISTEN_NAME
 from rasa.core.constants import DEFAULT_REQUEST_TIMEOUT
 from rasa.core.domain import Domain, InvalidDomain, check_domain_sanity
+from rasa.core.events import ActionExecuted
 from rasa.core.exceptions import AgentNotReady
-from rasa.core.interpreter import NaturalLanguageInterpreter, RegexInterpreter
+from rasa.core.interpreter import (
+    NaturalLanguageInterpreter,
+    RasaNLUInterpreter,
+    RegexInterpreter,
+)
 from rasa.core.nlg import NaturalLanguageGenerator
-from rasa.core.policies import FormPolicy, Policy
+from rasa.core.policies.form_policy import FormPolicy
+from rasa.core.policies.policy import Policy
 from rasa.core.policies.ensemble import PolicyEnsemble, SimplePolicyEnsemble
 from rasa.core.policies.memoization import MemoizationPolicy
 from rasa.core.processor import MessageProcessor
+from rasa.core.lock_store import InMemoryLockStore, LockStore
 from rasa.core.tracker_store import InMemoryTrackerStore, TrackerStore
 from rasa.core.trackers import DialogueStateTracker
-from rasa.core.utils import LockCounter
-from rasa.model import get_model_subdirectories, get_latest_model, unpack_model
+from rasa.model import (
+    get_latest_model,
+    get_model_subdirectories,
+    is_cached_model,
+    remove_unpacked_model,
+    unpack_model,
+    unpack_model_content,
+)
 from rasa.nlu.utils import is_url
+from rasa.utils.batching import Batcher
 from rasa.utils.common import update_sanic_log_level, set_log_level
 from rasa.utils.endpoints import EndpointConfig
 
 logger = logging.getLogger(__name__)
 
+# message and conversation used to warm up new models before they are used
+WARM_UP_TEXT = "hello"
+WARM_UP_SENDER_ID = "model_warm_up"
+
 
 async def load_from_server(
     agent, model_server: Optional[EndpointConfig] = None
@@ -61,18 +88,17 @@ async def load_from_server(
     return agent
 
 
-def _load_and_set_updated_model(
-    agent: "Agent", model_directory: Text, fingerprint: Text
-):
-    """Load the persisted model into memory and set the model on the agent."""
+def _load_updated_model(
+    agent: "Agent", model_directory: Text
+) -> Tuple[Optional[Domain], Optional[PolicyEnsemble], NaturalLanguageInterpreter]:
+    """Load the persisted model without changing the agent.
 
-    logger.debug("Found new model with fingerprint {}. Loading...".format(fingerprint))
+    Runs in a thread, while the agent keeps handling messages with its
+    current model."""
 
     core_path, nlu_path = get_model_subdirectories(model_directory)
 
     if os.path.exists(nlu_path):
-        from rasa.core.interpreter import RasaNLUInterpreter
-
         interpreter = RasaNLUInterpreter(model_directory=nlu_path)
     else:
         interpreter = (
@@ -80,23 +106,73 @@ def _load_and_set_updated_model(
         )
 
     domain = None
+    policy_ensemble = None
     if os.path.exists(core_path):
         domain_path = os.path.join(os.path.abspath(core_path), DEFAULT_DOMAIN_PATH)
         domain = Domain.load(domain_path)
+        policy_ensemble = PolicyEnsemble.load(core_path)
+
+    _warm_up_model(domain, policy_ensemble, interpreter)
+    return domain, policy_ensemble, interpreter
+
+
+def _warm_up_model(
+    domain: Optional[Domain],
+    policy_ensemble: Optional[PolicyEnsemble],
+    interpreter: NaturalLanguageInterpreter,
+) -> None:
+    """Run a first prediction with the model, so the first message doesn't
+    wait for the lazy initialisation of e.g. the tensorflow sessions.
+
+    A model which fails to predict is never swapped in."""
+
+    # in the process execution mode the workers load their own models
+    if isinstance(interpreter, RasaNLUInterpreter) and interpreter.interpreter:
+        interpreter.interpreter.parse(WARM_UP_TEXT)
+
+    if domain is not None and policy_ensemble is not None:
+        tracker = DialogueStateTracker(WARM_UP_SENDER_ID, domain.slots)
+        tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+        policy_ensemble.probabilities_using_best_policy(tracker, domain)
 
+
+async def _load_and_set_updated_model(
+    agent: "Agent", model_directory: Text, fingerprint: Text
+) -> None:
+    """Load the persisted model in the background and swap it in once it is
+    ready.
+
+    Messages which are handled in the meantime, or which are still in
+    flight when the model is swapped, use the previous model."""
+
+    logger.debug("Found new model with fingerprint {}. Loading...".format(fingerprint))
+
+    start = time.perf_counter()
     try:
-        policy_ensemble = None
-        if os.path.exists(core_path):
-            policy_ensemble = PolicyEnsemble.load(core_path)
+        loop = asyncio.get_event_loop()
+        domain, policy_ensemble, interpreter = await loop.run_in_executor(
+            None, _load_updated_model, agent, model_directory
+        )
+        loaded = time.perf_counter()
+
+        # nothing else runs on the event loop while the model is swapped, so
+        # every message sees either the previous or the new model
         agent.update_model(
             domain, policy_ensemble, fingerprint, interpreter, model_directory
         )
-        logger.debug("Finished updating agent to new model.")
     except Exception:
         logger.exception(
-            "Failed to load policy and update agent. "
-            "The previous model will stay loaded instead."
+            "Failed to load model with fingerprint {} and update agent. "
+            "The previous model will stay loaded instead.".format(fingerprint)
         )
+        return
+
+    logger.info(
+        "Updated agent to model with fingerprint {}. Loading the model took "
+        "{:.2f}s, swapping it {:.4f}s.".format(
+            fingerprint, loaded - start, time.perf_counter() - loaded
+        )
+    )
 
 
 async def _update_model_from_server(
@@ -112,7 +188,7 @@ async def _update_model_from_server(
     )
     if model_directory_and_fingerprint:
         model_directory, new_model_fingerprint = model_directory_and_fingerprint
-        _load_and_set_updated_model(agent, model_directory, new_model_fingerprint)
+        await _load_and_set_updated_model(agent, model_directory, new_model_fingerprint)
     else:
         logger.debug("No new model found at URL {}".format(model_server.url))
 
@@ -130,59 +206,62 @@ async def _pull_model_and_fingerprint(
 
     logger.debug("Requesting model from server {}...".format(model_server.url))
 
-    async with model_server.session() as session:
-        try:
-            set_log_level()
-            params = model_server.combine_parameters()
-            async with session.request(
-                "GET",
-                model_server.url,
-                timeout=DEFAULT_REQUEST_TIMEOUT,
-                headers=headers,
-                params=params,
-            ) as resp:
-
-                if resp.status in [204, 304]:
-                    logger.debug(
-                        "Model server returned {} status code, "
-                        "indicating that no new model is available. "
-                        "Current fingerprint: {}"
-                        "".format(resp.status, fingerprint)
-                    )
-                    return None
-                elif resp.status == 404:
-                    logger.debug(
-                        "Model server didn't find a model for our request. "
-                        "Probably no one did train a model for the project "
-                        "and tag combination yet."
-                    )
-                    return None
-                elif resp.status != 200:
-                    logger.debug(
-                        "Tried to fetch model from server, but server response "
-                        "status code is {}. We'll retry later..."
-                        "".format(resp.status)
-                    )
-                    return None
-
-                model_directory = tempfile.mkdtemp()
-                rasa.utils.io.unarchive(await resp.read(), model_directory)
+    session = model_server.session()
+    try:
+        set_log_level()
+        params = model_server.combine_parameters()
+        async with session.request(
+            "GET",
+            model_server.url,
+            timeout=DEFAULT_REQUEST_TIMEOUT,
+            headers=headers,
+            params=params,
+        ) as resp:
+
+            if resp.status in [204, 304]:
                 logger.debug(
-                    "Unzipped model to '{}'".format(os.path.abspath(model_directory))
+                    "Model server returned {} status code, "
+                    "indicating that no new model is available. "
+                    "Current fingerprint: {}"
+                    "".format(resp.status, fingerprint)
                 )
+                return None
+            elif resp.status == 404:
+                logger.debug(
+                    "Model server didn't find a model for our request. "
+                    "Probably no one did train a model for the project "
+                    "and tag combination yet."
+                )
+                return None
+            elif resp.status != 200:
+                logger.debug(
+                    "Tried to fetch model from server, but server response "
+                    "status code is {}. We'll retry later..."
+                    "".format(resp.status)
+                )
+                return None
 
-                # get the new fingerprint
-                new_fingerprint = resp.headers.get("ETag")
-                # return new tmp model directory and new fingerprint
-                return model_directory, new_fingerprint
-
-        except aiohttp.ClientError as e:
+            content = await resp.read()
+            # don't block the event loop while the model is unpacked
+            model_directory = await asyncio.get_event_loop().run_in_executor(
+                None, unpack_model_content, content
+            )
             logger.debug(
-                "Tried to fetch model from server, but "
-                "couldn't reach server. We'll retry later... "
-                "Error: {}.".format(e)
+                "Unzipped model to '{}'".format(os.path.abspath(model_directory))
             )
-            return None
+
+            # get the new fingerprint
+            new_fingerprint = resp.headers.get("ETag")
+            # return new tmp model directory and new fingerprint
+            return model_directory, new_fingerprint
+
+    except aiohttp.ClientError as e:
+        logger.debug(
+            "Tried to fetch model from server, but "
+            "couldn't reach server. We'll retry later... "
+            "Error: {}.".format(e)
+        )
+        return None
 
 
 async def _run_model_pulling_worker(
@@ -220,6 +299,7 @@ async def load_agent(
     generator: Union[EndpointConfig, NaturalLanguageGenerator] = None,
     tracker_store: Optional[TrackerStore] = None,
     action_endpoint: Optional[EndpointConfig] = None,
+    lock_store: Optional[LockStore] = None,
 ):
     try:
         if model_path is not None and os.path.exists(model_path):
@@ -231,6 +311,7 @@ async def load_agent(
                 action_endpoint=action_endpoint,
                 model_server=model_server,
                 remote_storage=remote_storage,
+                lock_store=lock_store,
             )
 
         elif model_server is not None:
@@ -242,6 +323,7 @@ async def load_agent(
                     action_endpoint=action_endpoint,
                     model_server=model_server,
                     remote_storage=remote_storage,
+                    lock_store=lock_store,
                 ),
                 model_server,
             )
@@ -255,6 +337,7 @@ async def load_agent(
                 tracker_store=tracker_store,
                 action_endpoint=action_endpoint,
                 model_server=model_server,
+                lock_store=lock_store,
             )
 
         else:
@@ -285,6 +368,7 @@ class Agent(object):
         model_directory: Optional[Text] = None,
         model_server: Optional[EndpointConfig] = None,
         remote_storage: Optional[Text] = None,
+        lock_store: Optional[LockStore] = None,
     ):
         # Initializing variables with the passed parameters.
         self.domain = self._create_domain(domain)
@@ -302,7 +386,8 @@ class Agent(object):
         self.nlg = NaturalLanguageGenerator.create(generator, self.domain)
         self.tracker_store = self.create_tracker_store(tracker_store, self.domain)
         self.action_endpoint = action_endpoint
-        self.conversations_in_processing = {}
+        self.lock_store = lock_store if lock_store is not None else InMemoryLockStore()
+        self.prediction_batcher = self._create_prediction_batcher()
 
         self._set_fingerprint(fingerprint)
         self.model_directory = model_directory
@@ -319,9 +404,19 @@ class Agent(object):
     ) -> None:
         self.domain = domain
         self.policy_ensemble = policy_ensemble
+        self.prediction_batcher = self._create_prediction_batcher()
 
         if interpreter:
+            previous_interpreter = self.interpreter
             self.interpreter = NaturalLanguageInterpreter.create(interpreter)
+            if (
+                previous_interpreter is not None
+                and previous_interpreter is not self.interpreter
+            ):
+                # shut down the workers of the previous model
+                previous_interpreter.close()
+        # the cached parse results might stem from the previous model
+        self.interpreter.clear_cache()
 
         self._set_fingerprint(fingerprint)
 
@@ -330,7 +425,15 @@ class Agent(object):
         if hasattr(self.nlg, "templates"):
             self.nlg.templates = domain.templates or []
 
+        previous_model_directory = self.model_directory
         self.model_directory = model_directory
+        if (
+            previous_model_directory
+            and previous_model_directory != model_directory
+            and is_cached_model(previous_model_directory)
+        ):
+            # the previous model can be evicted from the model cache again
+            remove_unpacked_model(previous_model_directory)
 
     @classmethod
     def load(
@@ -342,6 +445,7 @@ class Agent(object):
         action_endpoint: Optional[EndpointConfig] = None,
         model_server: Optional[EndpointConfig] = None,
         remote_storage: Optional[Text] = None,
+        lock_store: Optional[LockStore] = None,
     ) -> "Agent":
         """Load a persisted model from the passed path."""
         if not os.path.exists(unpacked_model_path) or not os.path.isdir(
@@ -383,6 +487,7 @@ class Agent(object):
             model_directory=unpacked_model_path,
             model_server=model_server,
             remote_storage=remote_storage,
+            lock_store=lock_store,
         )
 
     def is_ready(self):
@@ -420,34 +525,12 @@ class Agent(object):
 
         processor = self.create_processor(message_preprocessor)
 
-        # get the lock for the current conversation
-        lock = self.conversations_in_processing.get(message.sender_id)
-        if not lock:
-            logger.debug(
-                "Created a new lock for conversation '{}'".format(message.sender_id)
-            )
-            lock = LockCounter()
-            self.conversations_in_processing[message.sender_id] = lock
-
-        try:
-            async with lock:
-                # this makes sure that there can always only be one coroutine
-                # handling a conversation at any point in time
-                # Note: this doesn't support multi-processing, it just works
-                # for coroutines. If there are multiple processes handling
-                # messages, an external system needs to make sure messages
-                # for the same conversation are always processed by the same
-                # process.
-                return await processor.handle_message(message)
-        finally:
-            if not lock.is_someone_waiting():
-                # dispose of the lock if no one needs it to avoid
-                # accumulating locks
-                del self.conversations_in_processing[message.sender_id]
-                logger.debug(
-                    "Deleted lock for conversation '{}' (unused)"
-                    "".format(message.sender_id)
-                )
+        # this makes sure that there can always only be one message handled
+        # per conversation at any point in time. A lock store which is shared
+        # by multiple processes (e.g. the `RedisLockStore`) locks the
+        # conversation for all of them.
+        async with self.lock_store.lock(message.sender_id):
+            return await processor.handle_message(message)
 
     # noinspection PyUnusedLocal
     def predict_next(self, sender_id: Text, **kwargs: Any) -> Dict[Text, Any]:
@@ -456,6 +539,16 @@ class Agent(object):
         processor = self.create_processor()
         return processor.predict_next(sender_id)
 
+    # noinspection PyUnusedLocal
+    async def async_predict_next(
+        self, sender_id: Text, **kwargs: Any
+    ) -> Dict[Text, Any]:
+        """Handle a single message without blocking the event loop while
+        the tracker is retrieved and saved."""
+
+        processor = self.create_processor()
+        return await processor.async_predict_next(sender_id)
+
     # noinspection PyUnusedLocal
     async def log_message(
         self,
@@ -802,7 +895,36 @@ class Agent(object):
             self.nlg,
             action_endpoint=self.action_endpoint,
             message_preprocessor=preprocessor,
+            prediction_batcher=self.prediction_batcher,
+        )
+
+    def _create_prediction_batcher(self) -> Optional[Batcher]:
+        """Create the batcher which predicts the next actions of concurrent
+        conversations together, if the `PREDICTION_BATCH_WINDOW` is set."""
+
+        batch_window = float(
+            os.environ.get(ENV_PREDICTION_BATCH_WINDOW, DEFAULT_PREDICTION_BATCH_WINDOW)
         )
+        if batch_window <= 0 or self.policy_ensemble is None:
+            return None
+
+        max_batch_size = int(
+            os.environ.get(
+                ENV_MAX_PREDICTION_BATCH_SIZE, DEFAULT_MAX_PREDICTION_BATCH_SIZE
+            )
+        )
+        # the batcher keeps the model it was created for, processors which
+        # were created before a model update still predict with their model
+        policy_ensemble, domain = self.policy_ensemble, self.domain
+
+        async def predict(
+            trackers: List[DialogueStateTracker]
+        ) -> List[Tuple[List[float], Text]]:
+            return policy_ensemble.probabilities_using_best_policy_batch(
+                trackers, domain
+            )
+
+        return Batcher(predict, batch_window, max_batch_size)
 
     @staticmethod
     def _create_domain(domain: Union[None, Domain, Text]) -> Domain:
@@ -855,6 +977,7 @@ class Agent(object):
         action_endpoint: Optional[EndpointConfig] = None,
         model_server: Optional[EndpointConfig] = None,
         remote_storage: Optional[Text] = None,
+        lock_store: Optional[LockStore] = None,
     ) -> "Agent":
         if os.path.isfile(model_path):
             model_archive = model_path
@@ -865,8 +988,7 @@ class Agent(object):
             logger.warning("Could not load local model in '{}'".format(model_path))
             return Agent()
 
-        working_directory = tempfile.mkdtemp()
-        unpacked_model = unpack_model(model_archive, working_directory)
+        unpacked_model = unpack_model(model_archive)
 
         return Agent.load(
             unpacked_model,
@@ -876,6 +998,7 @@ class Agent(object):
             action_endpoint=action_endpoint,
             model_server=model_server,
             remote_storage=remote_storage,
+            lock_store=lock_store,
         )
 
     @staticmethod
@@ -887,6 +1010,7 @@ class Agent(object):
         tracker_store: Optional[TrackerStore] = None,
         action_endpoint: Optional[EndpointConfig] = None,
         model_server: Optional[EndpointConfig] = None,
+        lock_store: Optional[LockStore] = None,
     ) -> "Agent":
         from rasa.nlu.persistor import get_persistor
 
@@ -904,6 +1028,7 @@ class Agent(object):
                 action_endpoint=action_endpoint,
                 model_server=model_server,
                 remote_storage=remote_storage,
+                lock_store=lock_store,
             )
 
         return None
@@ -1,12 +1,25 @@
+import atexit
 import json
 import logging
-from typing import Any, Dict, Optional, Text
+import struct
+import threading
+import time
+from collections import deque
+from queue import Empty, Full, Queue
+from typing import Any, Dict, Iterator, List, Optional, Text
 
 from rasa.core.utils import class_from_module_path
 from rasa.utils.endpoints import EndpointConfig
 
 logger = logging.getLogger(__name__)
 
+# length prefix of the events of a binary `FileProducer` log
+_RECORD_LENGTH = struct.Struct(">I")
+
+# maximum time in seconds to wait for the buffered events to be published
+# when a producer is closed
+DEFAULT_CLOSE_TIMEOUT = 10
+
 
 def from_endpoint_config(
     broker_config: Optional[EndpointConfig]
@@ -53,8 +66,22 @@ class EventChannel(object):
 
         raise NotImplementedError("Event broker must implement the `publish` method.")
 
+    def close(self) -> None:
+        """Publish the events which weren't published yet and close the
+        connection, e.g. when the server stops."""
+
+        pass
+
 
 class PikaProducer(EventChannel):
+    """Publish events to a RabbitMQ queue.
+
+    Events are buffered and published in batches by a background thread,
+    which keeps the connection to RabbitMQ open and reconnects on failures.
+    If the buffer holds `max_buffer_size` events, new events are dropped.
+    The buffered events are published when the producer is closed, which
+    happens at the latest when the Python interpreter exits."""
+
     def __init__(
         self,
         host,
@@ -62,6 +89,10 @@ class PikaProducer(EventChannel):
         password,
         queue="rasa_core_events",
         loglevel=logging.WARNING,
+        batch_size: int = 100,
+        flush_interval: float = 0.1,
+        max_buffer_size: int = 10000,
+        retry_delay: float = 5,
     ):
         import pika
 
@@ -70,6 +101,20 @@ class PikaProducer(EventChannel):
         self.queue = queue
         self.host = host
         self.credentials = pika.PlainCredentials(username, password)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+
+        self.connection = None
+        self.channel = None
+        self.dropped_events = 0
+
+        # serialised events which wait to be published by the publisher thread
+        self._buffer = Queue(maxsize=max_buffer_size)
+        self._publisher = None
+        self._publisher_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._closed_at_exit = False
 
     @classmethod
     def from_endpoint_config(
@@ -80,11 +125,109 @@ class PikaProducer(EventChannel):
 
         return cls(broker_config.url, **broker_config.kwargs)
 
-    def publish(self, event):
-        self._open_connection()
-        self._publish(json.dumps(event))
+    def publish(self, event: Dict[Text, Any]) -> None:
+        """Add the event to the buffer, it is published in the background."""
+
+        self._start_publisher()
+
+        try:
+            self._buffer.put_nowait(json.dumps(event))
+        except Full:
+            self.dropped_events += 1
+            logger.error(
+                "Dropped event, because the buffer of events which weren't "
+                "published to queue {} at {} yet is full. {} events were "
+                "dropped so far.".format(self.queue, self.host, self.dropped_events)
+            )
+
+    def close(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """Publish the buffered events and close the connection.
+
+        Waits up to `timeout` seconds (forever if it's `None`) for the
+        events to be published."""
+
+        self._stopped.set()
+        if self._publisher is not None:
+            self._publisher.join(timeout)
+
+    def _start_publisher(self) -> None:
+        with self._publisher_lock:
+            if self._publisher is None or not self._publisher.is_alive():
+                if not self._closed_at_exit:
+                    # the publisher is a daemon thread, which would be killed
+                    # with the buffered events when the interpreter exits
+                    atexit.register(self.close)
+                    self._closed_at_exit = True
+                self._stopped.clear()
+                self._publisher = threading.Thread(
+                    target=self._run_publisher, name="pika-producer", daemon=True
+                )
+                self._publisher.start()
+
+    def _run_publisher(self) -> None:
+        while not (self._stopped.is_set() and self._buffer.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._publish_batch(batch)
+            elif self.connection is not None and self.connection.is_open:
+                # keep the idle connection alive by answering heartbeats
+                self._process_data_events()
+
         self._close()
 
+    def _next_batch(self) -> List[Text]:
+        """Wait up to `flush_interval` to collect up to `batch_size` events."""
+
+        try:
+            batch = [self._buffer.get(timeout=self.flush_interval)]
+        except Empty:
+            return []
+
+        deadline = time.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._buffer.get(timeout=max(0, deadline - time.time())))
+            except Empty:
+                break
+        return batch
+
+    def _publish_batch(self, batch: List[Text]) -> None:
+        import pika
+
+        pending = deque(batch)
+        while pending:
+            try:
+                if self.connection is None or not self.connection.is_open:
+                    self._open_connection()
+                while pending:
+                    self._publish(pending[0])
+                    pending.popleft()
+            except pika.exceptions.AMQPError as e:
+                self._close()
+                if self._stopped.is_set():
+                    logger.error(
+                        "Failed to publish {} events to queue {} at {} before "
+                        "shutting down: {}".format(
+                            len(pending), self.queue, self.host, e
+                        )
+                    )
+                    return
+
+                logger.warning(
+                    "Failed to publish events to queue {} at {}, retrying in {} "
+                    "seconds: {}".format(self.queue, self.host, self.retry_delay, e)
+                )
+                time.sleep(self.retry_delay)
+
+    def _process_data_events(self) -> None:
+        import pika
+
+        try:
+            self.connection.process_data_events()
+        except pika.exceptions.AMQPError as e:
+            logger.debug("Lost connection to pika event broker: {}".format(e))
+            self._close()
+
     def _open_connection(self):
         import pika
 
@@ -106,19 +249,39 @@ class PikaProducer(EventChannel):
         )
 
     def _close(self):
-        self.connection.close()
+        import pika
+
+        if self.connection is not None and self.connection.is_open:
+            try:
+                self.connection.close()
+            except pika.exceptions.AMQPError:
+                pass
+        self.connection = None
+        self.channel = None
 
 
 class FileProducer(EventChannel):
     """Log events to a file in json format.
 
-    There will be one event per line and each event is stored as json."""
+    There will be one event per line and each event is stored as json.
+    With `binary` every event is encoded with the `EventCodec` instead and
+    prefixed with its length, see `read_binary_events`."""
 
     DEFAULT_LOG_FILE_NAME = "rasa_event.log"
 
-    def __init__(self, path: Optional[Text] = None) -> None:
+    def __init__(
+        self, path: Optional[Text] = None, binary: bool = False, compress: bool = False
+    ) -> None:
         self.path = path or self.DEFAULT_LOG_FILE_NAME
-        self.event_logger = self._event_logger()
+        self.binary = binary
+        if binary:
+            from rasa.core.event_codec import EventCodec
+
+            self.codec = EventCodec(compress=compress)
+            self._lock = threading.Lock()
+            logger.info("Logging encoded events to '{}'.".format(self.path))
+        else:
+            self.event_logger = self._event_logger()
 
     @classmethod
     def from_endpoint_config(
@@ -149,9 +312,31 @@ class FileProducer(EventChannel):
     def publish(self, event: Dict) -> None:
         """Write event to file."""
 
+        if self.binary:
+            encoded = self.codec.encode_dicts([event])
+            with self._lock, open(self.path, "ab") as f:
+                f.write(_RECORD_LENGTH.pack(len(encoded)) + encoded)
+            return
+
         self.event_logger.info(json.dumps(event))
         self.event_logger.handlers[0].flush()
 
+    @staticmethod
+    def read_binary_events(path: Text) -> Iterator[Dict[Text, Any]]:
+        """Read the events of a file written with `binary`."""
+
+        from rasa.core.event_codec import EventCodec
+
+        codec = EventCodec()
+        with open(path, "rb") as f:
+            while True:
+                header = f.read(_RECORD_LENGTH.size)
+                if len(header) < _RECORD_LENGTH.size:
+                    return
+                (length,) = _RECORD_LENGTH.unpack(header)
+                for event in codec.decode_dicts(f.read(length)):
+                    yield event
+
 
 class KafkaProducer(EventChannel):
     def __init__(
@@ -5,7 +5,6 @@ import os
 import typing
 from typing import Any, Dict, List, Optional, Text, Tuple, Union
 
-import pkg_resources
 from pykwalify.errors import SchemaError
 from ruamel.yaml import YAMLError
 
@@ -309,6 +308,7 @@ class Domain(object):
     @classmethod
     def validate_domain_yaml(cls, yaml):
         """Validate domain yaml."""
+        import pkg_resources
         from pykwalify.core import Core
 
         log = logging.getLogger("pykwalify")
@@ -0,0 +1,344 @@
+import logging
+import numbers
+import struct
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Text, Tuple
+
+from rasa.core.events import Event, Restarted
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"REVC"
+VERSION = 1
+
+# flags of the header
+FLAG_COMPRESSED = 1
+
+# tags of the encoded values
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_STRING = 5
+_LIST = 6
+_DICT = 7
+
+# tags of the encoded timestamps
+_NO_TIMESTAMP = 0
+_TIMESTAMP_DELTA = 1
+_TIMESTAMP_RAW = 2
+
+# timestamps are encoded as multiples of 2^-22 seconds, which covers every
+# `time.time()` timestamp from 2004 until 2038 exactly
+_TIMESTAMP_UNITS = float(2 ** 22)
+
+_DOUBLE = struct.Struct("<d")
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if not value & 1 else -(value + 1) // 2
+
+
+class _Reader(object):
+    """Reads the values of an encoded payload."""
+
+    def __init__(self, data: bytes, position: int = 0) -> None:
+        self.data = data
+        self.position = position
+
+    def read_varint(self) -> int:
+        result = 0
+        shift = 0
+        while True:
+            byte = self.data[self.position]
+            self.position += 1
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def read_bytes(self, length: int) -> bytes:
+        end = self.position + length
+        if end > len(self.data):
+            raise IndexError("Encoded events are truncated.")
+        value = self.data[self.position : end]
+        self.position = end
+        return value
+
+    def read_double(self) -> float:
+        return _DOUBLE.unpack(self.read_bytes(_DOUBLE.size))[0]
+
+
+class _Encoder(object):
+    """Encodes event dictionaries, every string is stored only once."""
+
+    def __init__(self) -> None:
+        self.strings = {}
+        self.events = bytearray()
+        self.num_events = 0
+        self.previous_units = 0
+        # position of the latest restart: index of the event, offset in
+        # `events` and the timestamp units the following deltas refer to
+        self.restart = (0, 0, 0)
+
+    def add(self, event: Dict[Text, Any]) -> None:
+        event = dict(event)
+        type_name = event.pop("event", None)
+        timestamp = event.pop("timestamp", None)
+
+        if type_name == Restarted.type_name:
+            self.restart = (self.num_events, len(self.events), self.previous_units)
+
+        self._write_value(type_name)
+        self._write_timestamp(timestamp)
+        self._write_dict(event)
+        self.num_events += 1
+
+    def payload(self) -> bytes:
+        header = bytearray()
+        strings = sorted(self.strings, key=self.strings.get)
+        _write_varint(header, len(strings))
+        for string in strings:
+            encoded = string.encode("utf-8")
+            _write_varint(header, len(encoded))
+            header.extend(encoded)
+
+        _write_varint(header, self.num_events)
+        restart_index, restart_offset, restart_units = self.restart
+        _write_varint(header, restart_index)
+        _write_varint(header, restart_offset)
+        _write_varint(header, _zigzag(restart_units))
+        return bytes(header + self.events)
+
+    def _intern(self, string: Text) -> int:
+        index = self.strings.get(string)
+        if index is None:
+            index = len(self.strings)
+            self.strings[string] = index
+        return index
+
+    def _write_timestamp(self, timestamp: Optional[float]) -> None:
+        if timestamp is None:
+            self.events.append(_NO_TIMESTAMP)
+            return
+
+        units = timestamp * _TIMESTAMP_UNITS
+        if float(units).is_integer():
+            units = int(units)
+            self.events.append(_TIMESTAMP_DELTA)
+            _write_varint(self.events, _zigzag(units - self.previous_units))
+            self.previous_units = units
+        else:
+            self.events.append(_TIMESTAMP_RAW)
+            self.events.extend(_DOUBLE.pack(timestamp))
+
+    def _write_dict(self, value: Dict[Text, Any]) -> None:
+        _write_varint(self.events, len(value))
+        for k, v in value.items():
+            _write_varint(self.events, self._intern(k))
+            self._write_value(v)
+
+    def _write_value(self, value: Any) -> None:
+        if value is None:
+            self.events.append(_NONE)
+        elif value is True:
+            self.events.append(_TRUE)
+        elif value is False:
+            self.events.append(_FALSE)
+        elif isinstance(value, numbers.Integral):
+            self.events.append(_INT)
+            _write_varint(self.events, _zigzag(int(value)))
+        elif isinstance(value, numbers.Real):
+            self.events.append(_FLOAT)
+            self.events.extend(_DOUBLE.pack(value))
+        elif isinstance(value, str):
+            self.events.append(_STRING)
+            _write_varint(self.events, self._intern(value))
+        elif isinstance(value, (list, tuple)):
+            self.events.append(_LIST)
+            _write_varint(self.events, len(value))
+            for v in value:
+                self._write_value(v)
+        elif isinstance(value, dict):
+            self.events.append(_DICT)
+            self._write_dict(value)
+        else:
+            raise ValueError(
+                "Can't encode value '{}' of type '{}'."
+                "".format(value, type(value).__name__)
+            )
+
+
+class _Decoder(object):
+    """Decodes the event dictionaries of a payload."""
+
+    def __init__(self, payload: bytes) -> None:
+        self.reader = _Reader(payload)
+
+        num_strings = self.reader.read_varint()
+        self.strings = [
+            self.reader.read_bytes(self.reader.read_varint()).decode("utf-8")
+            for _ in range(num_strings)
+        ]
+        self.num_events = self.reader.read_varint()
+        self.restart_index = self.reader.read_varint()
+        self.restart_offset = self.reader.read_varint()
+        self.restart_units = _unzigzag(self.reader.read_varint())
+        self.events_start = self.reader.position
+        self.previous_units = 0
+
+    def events(self, since_restart: bool = False) -> List[Dict[Text, Any]]:
+        num_events = self.num_events
+        if since_restart:
+            # skip the events before the latest restart without parsing them
+            self.reader.position = self.events_start + self.restart_offset
+            self.previous_units = self.restart_units
+            num_events -= self.restart_index
+
+        return [self._read_event() for _ in range(num_events)]
+
+    def _read_event(self) -> Dict[Text, Any]:
+        type_name = self._read_value()
+        timestamp = self._read_timestamp()
+        event = self._read_dict()
+        if type_name is not None:
+            event["event"] = type_name
+        if timestamp is not None:
+            event["timestamp"] = timestamp
+        return event
+
+    def _read_timestamp(self) -> Optional[float]:
+        tag = self.reader.read_bytes(1)[0]
+        if tag == _NO_TIMESTAMP:
+            return None
+        elif tag == _TIMESTAMP_DELTA:
+            self.previous_units += _unzigzag(self.reader.read_varint())
+            return self.previous_units / _TIMESTAMP_UNITS
+        elif tag == _TIMESTAMP_RAW:
+            return self.reader.read_double()
+        else:
+            raise ValueError("Invalid timestamp tag {}.".format(tag))
+
+    def _read_dict(self) -> Dict[Text, Any]:
+        value = {}
+        for _ in range(self.reader.read_varint()):
+            key = self.strings[self.reader.read_varint()]
+            value[key] = self._read_value()
+        return value
+
+    def _read_value(self) -> Any:
+        tag = self.reader.read_bytes(1)[0]
+        if tag == _NONE:
+            return None
+        elif tag == _TRUE:
+            return True
+        elif tag == _FALSE:
+            return False
+        elif tag == _INT:
+            return _unzigzag(self.reader.read_varint())
+        elif tag == _FLOAT:
+            return self.reader.read_double()
+        elif tag == _STRING:
+            return self.strings[self.reader.read_varint()]
+        elif tag == _LIST:
+            return [self._read_value() for _ in range(self.reader.read_varint())]
+        elif tag == _DICT:
+            return self._read_dict()
+        else:
+            raise ValueError("Invalid value tag {}.".format(tag))
+
+
+class EventCodec(object):
+    """Compact, versioned binary encoding of events.
+
+    Every string (event types, intent, action and slot names, texts) is
+    stored once per payload and referenced by its index afterwards,
+    timestamps are stored as varint deltas. The header stores the position
+    of the latest `Restarted` event, so the events after it can be decoded
+    without parsing the preceding ones."""
+
+    def __init__(self, compress: bool = False, compression_level: int = 6) -> None:
+        self.compress = compress
+        self.compression_level = compression_level
+
+    @staticmethod
+    def is_encoded(data: bytes) -> bool:
+        """Check if `data` was encoded with an `EventCodec`."""
+
+        return data[: len(MAGIC)] == MAGIC
+
+    def encode(self, events: Iterable[Event]) -> bytes:
+        return self.encode_dicts(e.as_dict() for e in events)
+
+    def encode_dicts(self, events: Iterable[Dict[Text, Any]]) -> bytes:
+        """Encode serialised events, e.g. the events of an event broker."""
+
+        encoder = _Encoder()
+        for event in events:
+            encoder.add(event)
+        payload = encoder.payload()
+
+        flags = 0
+        if self.compress:
+            flags |= FLAG_COMPRESSED
+            payload = zlib.compress(payload, self.compression_level)
+        return MAGIC + bytes([VERSION, flags]) + payload
+
+    def decode(self, data: bytes) -> List[Event]:
+        return self._deserialise(self.decode_dicts(data))
+
+    def decode_since_restart(self, data: bytes) -> List[Event]:
+        """Decode the events from the latest `Restarted` event on."""
+
+        return self._deserialise(self.decode_dicts(data, since_restart=True))
+
+    def decode_dicts(
+        self, data: bytes, since_restart: bool = False
+    ) -> List[Dict[Text, Any]]:
+        version, flags, payload = self._split_header(data)
+        if flags & FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+
+        try:
+            return _Decoder(payload).events(since_restart)
+        except (IndexError, UnicodeDecodeError) as e:
+            raise ValueError("Invalid encoded events: {}".format(e))
+
+    @staticmethod
+    def _split_header(data: bytes) -> Tuple[int, int, bytes]:
+        if not EventCodec.is_encoded(data) or len(data) < len(MAGIC) + 2:
+            raise ValueError("Data wasn't encoded with an `EventCodec`.")
+
+        version, flags = data[len(MAGIC)], data[len(MAGIC) + 1]
+        if version > VERSION:
+            raise ValueError(
+                "Events were encoded with version {} of the codec, which "
+                "is newer than the supported version {}.".format(version, VERSION)
+            )
+        return version, flags, data[len(MAGIC) + 2 :]
+
+    @staticmethod
+    def _deserialise(events: List[Dict[Text, Any]]) -> List[Event]:
+        deserialised = []
+        for parameters in events:
+            event = Event.from_parameters(parameters)
+            if event:
+                deserialised.append(event)
+            else:
+                logger.warning(
+                    "Ignoring event ({}) while decoding events. "
+                    "Couldn't parse it.".format(parameters)
+                )
+        return deserialised
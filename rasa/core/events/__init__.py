@@ -1,3 +1,5 @@
+import copy
+import sys
 import time
 import typing
 
@@ -6,7 +8,7 @@ import jsonpickle
 import logging
 import uuid
 from dateutil import parser
-from typing import List, Dict, Text, Any, Type, Optional
+from typing import List, Dict, Text, Any, Type, Optional, Set
 
 from rasa.core import utils
 
@@ -15,6 +17,11 @@ if typing.TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# maps the type names of the events to their classes
+_event_types = {}  # type: Dict[Text, Type[Event]]
+# type names which weren't found in the registry, even after refreshing it
+_unknown_event_types = set()  # type: Set[Text]
+
 
 def deserialise_events(serialized_events: List[Dict[Text, Any]]) -> List["Event"]:
     """Convert a list of dictionaries to a list of corresponding events.
@@ -26,19 +33,35 @@ def deserialise_events(serialized_events: List[Dict[Text, Any]]) -> List["Event"
     deserialised = []
 
     for e in serialized_events:
-        if "event" in e:
+        if "event" not in e:
+            continue
+
+        # resolve the event classes directly, `Event.from_parameters`
+        # only has to handle unknown event names
+        event_class = _event_types.get(e["event"])
+        if event_class is not None:
+            event = event_class._from_parameters(e)
+        else:
             event = Event.from_parameters(e)
-            if event:
-                deserialised.append(event)
-            else:
-                logger.warning(
-                    "Ignoring event ({}) while deserialising "
-                    "events. Couldn't parse it."
-                )
+
+        if event:
+            deserialised.append(event)
+        else:
+            logger.warning(
+                "Ignoring event ({}) while deserialising "
+                "events. Couldn't parse it.".format(e)
+            )
 
     return deserialised
 
 
+def _intern(name: Any) -> Any:
+    """Intern names which repeat in many events, e.g. action and intent
+    names, so the events share a single copy of them."""
+
+    return sys.intern(name) if isinstance(name, str) else name
+
+
 def deserialise_entities(entities):
     if isinstance(entities, str):
         entities = json.loads(entities)
@@ -80,9 +103,27 @@ class Event(object):
 
     type_name = "event"
 
+    # events don't have a `__dict__`, which keeps the many events of the
+    # trackers small. Custom events without `__slots__` still have one.
+    __slots__ = ("timestamp",)
+
     def __init__(self, timestamp=None):
         self.timestamp = timestamp if timestamp else time.time()
 
+    def __getstate__(self) -> Dict[Text, Any]:
+        state = dict(getattr(self, "__dict__", {}))
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state: Dict[Text, Any]) -> None:
+        # events which were pickled before they had `__slots__` store their
+        # attributes in the same format
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __ne__(self, other):
         # Not strictly necessary, but to avoid having both x==y and x!=y
         # True at the same time
@@ -111,9 +152,6 @@ class Event(object):
 
         event_name = parameters.get("event")
         if event_name is not None:
-            copied = parameters.copy()
-            del copied["event"]
-
             event = Event.resolve_by_type(event_name, default)
             if event:
                 return event._from_parameters(parameters)
@@ -153,19 +191,45 @@ class Event(object):
     def resolve_by_type(
         type_name: Text, default: Optional[Type["Event"]] = None
     ) -> Optional[Type["Event"]]:
-        """Returns a slots class by its type name."""
-        from rasa.core import utils
-
-        for cls in utils.all_subclasses(Event):
-            if cls.type_name == type_name:
-                return cls
-        if type_name == "topic":
+        """Returns an event class by its type name.
+
+        Event classes which were imported after the registry was built, e.g.
+        custom events, are added to it on their first lookup. Unknown type
+        names only refresh the registry once."""
+
+        cls = _event_types.get(type_name)
+        if (
+            cls is None
+            and type_name != "topic"
+            and type_name not in _unknown_event_types
+        ):
+            Event.refresh_registry()
+            cls = _event_types.get(type_name)
+            if cls is None:
+                _unknown_event_types.add(type_name)
+
+        if cls is not None:
+            return cls
+        elif type_name == "topic":
             return None  # backwards compatibility to support old TopicSet evts
         elif default is not None:
             return default
         else:
             raise ValueError("Unknown event name '{}'.".format(type_name))
 
+    @staticmethod
+    def refresh_registry() -> None:
+        """Register all known (imported) event classes by their type name."""
+
+        num_registered = len(_event_types)
+        for cls in utils.all_subclasses(Event):
+            # the first class with a type name takes precedence
+            _event_types.setdefault(cls.type_name, cls)
+
+        if len(_event_types) > num_registered:
+            # the new classes might have one of the unknown type names
+            _unknown_event_types.clear()
+
     def apply_to(self, tracker: "DialogueStateTracker") -> None:
         pass
 
@@ -178,6 +242,15 @@ class UserUttered(Event):
 
     type_name = "user"
 
+    __slots__ = (
+        "text",
+        "intent",
+        "entities",
+        "input_channel",
+        "message_id",
+        "parse_data",
+    )
+
     def __init__(
         self,
         text,
@@ -189,12 +262,19 @@ class UserUttered(Event):
         message_id=None,
     ):
         self.text = text
-        self.intent = intent if intent else {}
+        # copy the intent so that interning its name doesn't change the
+        # caller's dict
+        self.intent = dict(intent) if intent else {}
+        if "name" in self.intent:
+            self.intent["name"] = _intern(self.intent["name"])
         self.entities = entities if entities else []
         self.input_channel = input_channel
         self.message_id = message_id
 
-        if parse_data:
+        if parse_data and intent is not None and parse_data.get("intent") is intent:
+            # keep sharing the intent between the event and its parse data
+            self.parse_data = dict(parse_data, intent=self.intent)
+        elif parse_data:
             self.parse_data = parse_data
         else:
             self.parse_data = {
@@ -244,6 +324,20 @@ class UserUttered(Event):
     def empty():
         return UserUttered(None)
 
+    def with_intent_ranking_length(self, length: int) -> "UserUttered":
+        """Return a copy of the event which only keeps the first `length`
+        intents of the ranking in its parse data.
+
+        Returns the event itself if its ranking isn't longer than `length`."""
+
+        ranking = self.parse_data.get("intent_ranking")
+        if not ranking or len(ranking) <= length:
+            return self
+
+        trimmed = copy.copy(self)
+        trimmed.parse_data = dict(self.parse_data, intent_ranking=ranking[:length])
+        return trimmed
+
     def as_dict(self):
         d = super(UserUttered, self).as_dict()
         input_channel = None  # for backwards compatibility (persisted evemts)
@@ -307,6 +401,8 @@ class BotUttered(Event):
 
     type_name = "bot"
 
+    __slots__ = ("text", "data", "_metadata")
+
     def __init__(self, text=None, data=None, metadata=None, timestamp=None):
         self.text = text
         self.data = data or {}
@@ -407,8 +503,10 @@ class SlotSet(Event):
 
     type_name = "slot"
 
+    __slots__ = ("key", "value")
+
     def __init__(self, key, value=None, timestamp=None):
-        self.key = key
+        self.key = _intern(key)
         self.value = value
         super(SlotSet, self).__init__(timestamp)
 
@@ -470,6 +568,8 @@ class Restarted(Event):
 
     type_name = "restart"
 
+    __slots__ = ()
+
     def __hash__(self):
         return hash(32143124312)
 
@@ -499,6 +599,8 @@ class UserUtteranceReverted(Event):
 
     type_name = "rewind"
 
+    __slots__ = ()
+
     def __hash__(self):
         return hash(32143124315)
 
@@ -526,6 +628,8 @@ class AllSlotsReset(Event):
 
     type_name = "reset_slots"
 
+    __slots__ = ()
+
     def __hash__(self):
         return hash(32143124316)
 
@@ -551,6 +655,8 @@ class ReminderScheduled(Event):
 
     type_name = "reminder"
 
+    __slots__ = ("action_name", "trigger_date_time", "kill_on_user_message", "name")
+
     def __init__(
         self,
         action_name,
@@ -572,7 +678,7 @@ class ReminderScheduled(Event):
             timestamp: creation date of the event
         """
 
-        self.action_name = action_name
+        self.action_name = _intern(action_name)
         self.trigger_date_time = trigger_date_time
         self.kill_on_user_message = kill_on_user_message
         self.name = name if name is not None else str(uuid.uuid1())
@@ -639,6 +745,8 @@ class ReminderCancelled(Event):
 
     type_name = "cancel_reminder"
 
+    __slots__ = ("action_name",)
+
     def __init__(self, action_name, timestamp=None):
         """
         Args:
@@ -680,6 +788,8 @@ class ActionReverted(Event):
 
     type_name = "undo"
 
+    __slots__ = ()
+
     def __hash__(self):
         return hash(32143124318)
 
@@ -703,6 +813,8 @@ class StoryExported(Event):
 
     type_name = "export"
 
+    __slots__ = ("path",)
+
     def __init__(self, path=None, timestamp=None):
         self.path = path
         super(StoryExported, self).__init__(timestamp)
@@ -730,8 +842,10 @@ class FollowupAction(Event):
 
     type_name = "followup"
 
+    __slots__ = ("action_name",)
+
     def __init__(self, name, timestamp=None):
-        self.action_name = name
+        self.action_name = _intern(name)
         super(FollowupAction, self).__init__(timestamp)
 
     def __hash__(self):
@@ -773,6 +887,8 @@ class ConversationPaused(Event):
 
     type_name = "pause"
 
+    __slots__ = ()
+
     def __hash__(self):
         return hash(32143124313)
 
@@ -798,6 +914,8 @@ class ConversationResumed(Event):
 
     type_name = "resume"
 
+    __slots__ = ()
+
     def __hash__(self):
         return hash(32143124314)
 
@@ -823,9 +941,11 @@ class ActionExecuted(Event):
 
     type_name = "action"
 
+    __slots__ = ("action_name", "policy", "confidence", "unpredictable")
+
     def __init__(self, action_name, policy=None, confidence=None, timestamp=None):
-        self.action_name = action_name
-        self.policy = policy
+        self.action_name = _intern(action_name)
+        self.policy = _intern(policy)
         self.confidence = confidence
         self.unpredictable = False
         super(ActionExecuted, self).__init__(timestamp)
@@ -885,6 +1005,8 @@ class AgentUttered(Event):
 
     type_name = "agent"
 
+    __slots__ = ("text", "data")
+
     def __init__(self, text=None, data=None, timestamp=None):
         self.text = text
         self.data = data
@@ -942,8 +1064,10 @@ class Form(Event):
 
     type_name = "form"
 
+    __slots__ = ("name",)
+
     def __init__(self, name, timestamp=None):
-        self.name = name
+        self.name = _intern(name)
         super(Form, self).__init__(timestamp)
 
     def __str__(self):
@@ -982,6 +1106,8 @@ class FormValidation(Event):
 
     type_name = "form_validation"
 
+    __slots__ = ("validate",)
+
     def __init__(self, validate, timestamp=None):
         self.validate = validate
         super(FormValidation, self).__init__(timestamp)
@@ -1016,9 +1142,11 @@ class ActionExecutionRejected(Event):
 
     type_name = "action_execution_rejected"
 
+    __slots__ = ("action_name", "policy", "confidence")
+
     def __init__(self, action_name, policy=None, confidence=None, timestamp=None):
-        self.action_name = action_name
-        self.policy = policy
+        self.action_name = _intern(action_name)
+        self.policy = _intern(policy)
         self.confidence = confidence
         super(ActionExecutionRejected, self).__init__(timestamp)
 
@@ -1063,3 +1191,28 @@ class ActionExecutionRejected(Event):
 
     def apply_to(self, tracker: "DialogueStateTracker") -> None:
         tracker.reject_action(self.action_name)
+
+
+class _EventHandler(jsonpickle.handlers.BaseHandler):
+    """Pickles events to the same flat format as before they had `__slots__`.
+
+    Without this handler jsonpickle would wrap the attributes of the events
+    in a `py/state` object."""
+
+    def flatten(self, obj: Event, data: Dict[Text, Any]) -> Dict[Text, Any]:
+        for name, value in obj.__getstate__().items():
+            data[name] = self.context.flatten(value, reset=False)
+        return data
+
+    def restore(self, obj: Dict[Text, Any]) -> Event:
+        cls = jsonpickle.unpickler.loadclass(obj[jsonpickle.tags.OBJECT])
+        event = cls.__new__(cls)
+        for name, value in obj.items():
+            if name != jsonpickle.tags.OBJECT:
+                setattr(event, name, self.context.restore(value, reset=False))
+        return event
+
+
+jsonpickle.handlers.register(Event, _EventHandler, base=True)
+
+Event.refresh_registry()
@@ -274,12 +274,18 @@ class TrackerFeaturizer(object):
         tracker: DialogueStateTracker,
         domain: Domain,
         is_binary_training: bool = False,
+        max_history: Optional[int] = None,
     ) -> List[Dict[Text, float]]:
         """Create states: a list of dictionaries.
             If use_intent_probabilities is False (default behaviour),
             pick the most probable intent out of all provided ones and
-            set its probability to 1.0, while all the others to 0.0."""
-        states = tracker.past_states(domain)
+            set its probability to 1.0, while all the others to 0.0.
+            If max_history is set, only the latest max_history states
+            are created."""
+        states = tracker.past_states(domain, max_history)
+
+        if max_history is not None and len(states) > max_history:
+            states = list(states)[-max_history:]
 
         # during training we encounter only 1 or 0
         if not self.use_intent_probabilities and not is_binary_training:
@@ -398,6 +404,11 @@ class TrackerFeaturizer(object):
             "Featurizer must have the capacity to create feature vector"
         )
 
+    def prediction_states_key(self) -> Tuple:
+        """Featurizers with equal keys create equal prediction states."""
+
+        return type(self), self.use_intent_probabilities
+
     # noinspection PyPep8Naming
     def create_X(
         self, trackers: List[DialogueStateTracker], domain: Domain
@@ -623,7 +634,8 @@ class MaxHistoryTrackerFeaturizer(TrackerFeaturizer):
     ) -> List[List[Dict[Text, float]]]:
 
         trackers_as_states = [
-            self._create_states(tracker, domain) for tracker in trackers
+            self._create_states(tracker, domain, max_history=self.max_history)
+            for tracker in trackers
         ]
         trackers_as_states = [
             self.slice_state_history(states, self.max_history)
@@ -631,3 +643,89 @@ class MaxHistoryTrackerFeaturizer(TrackerFeaturizer):
         ]
 
         return trackers_as_states
+
+    def prediction_states_key(self) -> Tuple:
+        """Featurizers with equal keys create equal prediction states."""
+
+        return type(self), self.use_intent_probabilities, self.max_history
+
+
+class FeaturizationContext(object):
+    """Featurizations of a tracker for a single prediction.
+
+    The policies of an ensemble share the context, so that the tracker
+    is only featurized once per compatible tracker featurizer: states are
+    shared between featurizers with the same `prediction_states_key` and
+    encoded states if their state featurizers are equal as well."""
+
+    def __init__(self, tracker: DialogueStateTracker, domain: Domain) -> None:
+        self.tracker = tracker
+        self.domain = domain
+
+        self._latest_event = None
+        self._num_events = None
+        self._states = {}
+        self._features = {}
+
+    def _reset_if_tracker_changed(self) -> None:
+        # policies might log events while predicting (e.g. the `FormPolicy`)
+        # which outdates the featurizations created so far
+        latest_event = self.tracker.events[-1] if self.tracker.events else None
+        if (
+            latest_event is not self._latest_event
+            or len(self.tracker.events) != self._num_events
+        ):
+            self._latest_event = latest_event
+            self._num_events = len(self.tracker.events)
+            self._states = {}
+            self._features = {}
+
+    def prediction_states(
+        self, featurizer: TrackerFeaturizer
+    ) -> List[List[Dict[Text, float]]]:
+        """Return `featurizer.prediction_states` for the tracker.
+
+        The returned states are shared, they must not be modified."""
+
+        self._reset_if_tracker_changed()
+
+        key = featurizer.prediction_states_key()
+        if key not in self._states:
+            self._states[key] = featurizer.prediction_states(
+                [self.tracker], self.domain
+            )
+        return self._states[key]
+
+    @staticmethod
+    def _equal_state_featurizers(
+        first: SingleStateFeaturizer, second: SingleStateFeaturizer
+    ) -> bool:
+        if first is second:
+            return True
+        if type(first) is not type(second):
+            return False
+        try:
+            return bool(first.__dict__ == second.__dict__)
+        except ValueError:
+            # attributes which can't be compared, e.g. numpy arrays
+            return False
+
+    # noinspection PyPep8Naming
+    def create_X(self, featurizer: TrackerFeaturizer) -> np.ndarray:
+        """Return `featurizer.create_X` for the tracker.
+
+        The returned array is shared, it must not be modified."""
+
+        trackers_as_states = self.prediction_states(featurizer)
+
+        key = featurizer.prediction_states_key()
+        features = self._features.setdefault(key, [])
+        for state_featurizer, X in features:
+            if self._equal_state_featurizers(
+                state_featurizer, featurizer.state_featurizer
+            ):
+                return X
+
+        X, _ = featurizer._featurize_states(trackers_as_states)
+        features.append((featurizer.state_featurizer, X))
+        return X
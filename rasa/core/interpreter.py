@@ -1,25 +1,75 @@
-import aiohttp
-
+import asyncio
 import json
 import logging
+import multiprocessing
 import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 
 import os
-from typing import Text, List, Dict, Any
-
+from typing import Any, Callable, Dict, List, Optional, Text
+
+from rasa.constants import (
+    DEFAULT_NLU_BATCH_WINDOW,
+    DEFAULT_NLU_CACHE_SIZE,
+    DEFAULT_NLU_HTTP_CACHE_TTL,
+    DEFAULT_NLU_EXECUTION_MODE,
+    DEFAULT_NLU_MAX_BATCH_SIZE,
+    DEFAULT_NLU_MAX_PENDING,
+    DEFAULT_NLU_MAX_WORKERS,
+    ENV_NLU_BATCH_WINDOW,
+    ENV_NLU_CACHE_SIZE,
+    ENV_NLU_EXECUTION_MODE,
+    ENV_NLU_MAX_BATCH_SIZE,
+    ENV_NLU_MAX_PENDING,
+    ENV_NLU_MAX_WORKERS,
+    NLU_EXECUTION_MODES,
+)
 from rasa.core import constants
 from rasa.core.constants import INTENT_MESSAGE_PREFIX
+from rasa.utils.batching import Batcher
 from rasa.utils.endpoints import EndpointConfig
+from rasa.utils.parse_cache import ParseCache
 
 logger = logging.getLogger(__name__)
 
 
 class NaturalLanguageInterpreter(object):
+    # cache of the parse results, if the interpreter caches them
+    cache = None  # type: Optional[ParseCache]
+
     async def parse(self, text, message_id=None):
         raise NotImplementedError(
             "Interpreter needs to be able to parse messages into structured output."
         )
 
+    async def parse_batch(
+        self, texts: List[Text], time: Any = None
+    ) -> List[Dict[Text, Any]]:
+        """Parse several text messages.
+
+        `time` is the reference time of the messages, interpreters which
+        don't resolve times relative to the message ignore it."""
+
+        return [await self.parse(text) for text in texts]
+
+    def cache_info(self) -> Optional[Dict[Text, Any]]:
+        """Return the statistics of the parse result cache, `None` if the
+        results aren't cached."""
+
+        return self.cache.cache_info() if self.cache is not None else None
+
+    def clear_cache(self) -> None:
+        """Remove the cached parse results, e.g. after the model changed."""
+
+        if self.cache is not None:
+            self.cache.clear()
+
+    def close(self) -> None:
+        """Release the resources of the interpreter, e.g. its workers."""
+
+        pass
+
     @staticmethod
     def create(obj, endpoint=None):
         if isinstance(obj, NaturalLanguageInterpreter):
@@ -172,8 +222,21 @@ class RegexInterpreter(NaturalLanguageInterpreter):
 
 
 class RasaNLUHttpInterpreter(NaturalLanguageInterpreter):
+    """Parses messages with a remote NLU server.
+
+    The latest `cache_size` results, by default the `cache_size` of the
+    endpoint configuration, are cached. The cache doesn't know the pipeline
+    of the remote model, so it should only be used if the model has no time
+    dependent components like the `DucklingHTTPExtractor`. The server might
+    load another model, so the results expire after `cache_ttl` seconds (the
+    `cache_ttl` of the endpoint configuration, 60 by default)."""
+
     def __init__(
-        self, model_name: Text = None, endpoint: EndpointConfig = None
+        self,
+        model_name: Text = None,
+        endpoint: EndpointConfig = None,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
     ) -> None:
 
         self.model_name = model_name
@@ -183,6 +246,17 @@ class RasaNLUHttpInterpreter(NaturalLanguageInterpreter):
         else:
             self.endpoint = EndpointConfig(constants.DEFAULT_SERVER_URL)
 
+        if cache_size is None:
+            cache_size = int(self.endpoint.kwargs.get("cache_size", 0))
+        self.cache = None  # type: Optional[ParseCache]
+        if cache_ttl is None:
+            cache_ttl = float(
+                self.endpoint.kwargs.get("cache_ttl", DEFAULT_NLU_HTTP_CACHE_TTL)
+            )
+        if cache_size > 0:
+            fingerprint = "{}:{}".format(self.endpoint.url, model_name)
+            self.cache = ParseCache(cache_size, fingerprint, ttl=cache_ttl)
+
     async def parse(self, text, message_id=None):
         """Parse a text message.
 
@@ -193,9 +267,18 @@ class RasaNLUHttpInterpreter(NaturalLanguageInterpreter):
             "entities": [],
             "text": "",
         }
+        if self.cache is not None:
+            result = self.cache.get(text)
+            if result is not None:
+                return result
+
         result = await self._rasa_http_parse(text, message_id)
+        if result is None:
+            return default_return
 
-        return result if result is not None else default_return
+        if self.cache is not None:
+            self.cache.set(text, result)
+        return result
 
     async def _rasa_http_parse(self, text, message_id=None):
         """Send a text message to a running rasa NLU http server.
@@ -219,16 +302,16 @@ class RasaNLUHttpInterpreter(NaturalLanguageInterpreter):
         url = "{}/parse".format(self.endpoint.url)
         # noinspection PyBroadException
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=params) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-                    else:
-                        logger.error(
-                            "Failed to parse text '{}' using rasa NLU over "
-                            "http. Error: {}".format(text, await resp.text())
-                        )
-                        return None
+            # reuse the pooled connections of the endpoint
+            async with self.endpoint.session().post(url, json=params) as resp:
+                if resp.status == 200:
+                    return await resp.json()
+                else:
+                    logger.error(
+                        "Failed to parse text '{}' using rasa NLU over "
+                        "http. Error: {}".format(text, await resp.text())
+                    )
+                    return None
         except Exception:
             logger.exception(
                 "Failed to parse text '{}' using rasa NLU over http.".format(text)
@@ -236,12 +319,127 @@ class RasaNLUHttpInterpreter(NaturalLanguageInterpreter):
             return None
 
 
+# interpreters loaded by the worker processes of the process execution mode
+_process_interpreters = {}  # type: Dict[Text, Any]
+
+
+def _process_interpreter(model_directory: Text) -> Any:
+    """Return the model of this process, which is loaded once per process."""
+
+    interpreter = _process_interpreters.get(model_directory)
+    if interpreter is None:
+        from rasa.nlu.model import Interpreter
+
+        # a process only keeps the latest model, previous ones aren't used
+        # anymore
+        _process_interpreters.clear()
+        interpreter = Interpreter.load(model_directory)
+        _process_interpreters[model_directory] = interpreter
+    return interpreter
+
+
+def _parse_in_process(model_directory: Text, text: Text) -> Dict[Text, Any]:
+    return _process_interpreter(model_directory).parse(text)
+
+
+def _parse_batch_in_process(
+    model_directory: Text, texts: List[Text], time: Any = None
+) -> List[Dict[Text, Any]]:
+    return _process_interpreter(model_directory).parse_batch(texts, time)
+
+
+def _process_pool_executor(max_workers: int) -> ProcessPoolExecutor:
+    # forked processes can deadlock if the threads of tensorflow were
+    # already started, so the workers are spawned where this is possible
+    try:
+        return ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    except TypeError:  # python < 3.7
+        return ProcessPoolExecutor(max_workers=max_workers)
+
+
 class RasaNLUInterpreter(NaturalLanguageInterpreter):
-    def __init__(self, model_directory, config_file=None, lazy_init=False):
+    """Parses messages with a locally loaded NLU model.
+
+    The `execution_mode` decides where the NLU pipeline runs:
+
+    - `inline`: on the event loop, which blocks it while a message is parsed
+    - `thread`: in a pool of `max_workers` threads
+    - `process`: in a pool of `max_workers` processes, which each load the
+      model once
+
+    At most `max_pending` messages are handed to the workers at the same
+    time, further messages wait until one of them is parsed.
+
+    If `batch_window` is set, the messages which arrive within this many
+    seconds are parsed together in batches of up to `max_batch_size`
+    messages.
+
+    If `cache_size` is set, the results of this many recently parsed texts
+    are cached, so repeated texts like button payloads aren't parsed again.
+
+    The defaults are read from the environment variables
+    `NLU_EXECUTION_MODE`, `NLU_MAX_WORKERS`, `NLU_MAX_PENDING`,
+    `NLU_BATCH_WINDOW`, `NLU_MAX_BATCH_SIZE` and `NLU_CACHE_SIZE`."""
+
+    def __init__(
+        self,
+        model_directory,
+        config_file=None,
+        lazy_init=False,
+        execution_mode: Optional[Text] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        batch_window: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        cache_size: Optional[int] = None,
+    ):
         self.model_directory = model_directory
         self.lazy_init = lazy_init
         self.config_file = config_file
 
+        self.execution_mode = execution_mode or os.environ.get(
+            ENV_NLU_EXECUTION_MODE, DEFAULT_NLU_EXECUTION_MODE
+        )
+        if self.execution_mode not in NLU_EXECUTION_MODES:
+            raise ValueError(
+                "Invalid NLU execution mode '{}', use one of {}.".format(
+                    self.execution_mode, ", ".join(NLU_EXECUTION_MODES)
+                )
+            )
+        self.max_workers = max_workers or int(
+            os.environ.get(ENV_NLU_MAX_WORKERS, DEFAULT_NLU_MAX_WORKERS)
+        )
+        self.max_pending = max_pending or int(
+            os.environ.get(ENV_NLU_MAX_PENDING, DEFAULT_NLU_MAX_PENDING)
+        )
+
+        if batch_window is None:
+            batch_window = float(
+                os.environ.get(ENV_NLU_BATCH_WINDOW, DEFAULT_NLU_BATCH_WINDOW)
+            )
+        max_batch_size = max_batch_size or int(
+            os.environ.get(ENV_NLU_MAX_BATCH_SIZE, DEFAULT_NLU_MAX_BATCH_SIZE)
+        )
+        self.batcher = None  # type: Optional[Batcher]
+        if batch_window > 0:
+            self.batcher = Batcher(
+                self._parse_batch_uncached, batch_window, max_batch_size
+            )
+
+        if cache_size is None:
+            cache_size = int(os.environ.get(ENV_NLU_CACHE_SIZE, DEFAULT_NLU_CACHE_SIZE))
+        self.cache = None  # type: Optional[ParseCache]
+        if cache_size > 0:
+            self.cache = self._create_cache(cache_size)
+
+        self._executor = None  # type: Optional[Executor]
+        self._closed = False
+        self._pending = None  # type: Optional[asyncio.Semaphore]
+        self._pending_loop = None  # type: Optional[asyncio.AbstractEventLoop]
+        self._load_lock = threading.Lock()
+
         if not lazy_init:
             self._load_interpreter()
         else:
@@ -252,13 +450,133 @@ class RasaNLUInterpreter(NaturalLanguageInterpreter):
 
         Return a default value if the parsing of the text failed."""
 
-        if self.lazy_init and self.interpreter is None:
-            self._load_interpreter()
-        result = self.interpreter.parse(text)
+        if self.cache is not None:
+            result = self.cache.get(text)
+            if result is not None:
+                return result
+
+        if self.batcher is not None:
+            result = await self.batcher.submit(text)
+        else:
+            result = await self._execute(_parse_in_process, self._parse, text)
 
+        if self.cache is not None:
+            self.cache.set(text, result)
         return result
 
+    async def parse_batch(
+        self, texts: List[Text], time: Any = None
+    ) -> List[Dict[Text, Any]]:
+        """Parse several text messages with a single run of the pipeline.
+
+        `time` is the reference time of the messages, e.g. the
+        `DucklingHTTPExtractor` resolves dates relative to it."""
+
+        if self.cache is None:
+            return await self._parse_batch_uncached(texts, time)
+
+        # only the texts without cached results are parsed
+        results = [self.cache.get(text, time) for text in texts]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        parsed = await self._parse_batch_uncached([texts[i] for i in missing], time)
+        for i, result in zip(missing, parsed):
+            self.cache.set(texts[i], result, time)
+            results[i] = result
+        return results
+
+    async def _parse_batch_uncached(
+        self, texts: List[Text], time: Any = None
+    ) -> List[Dict[Text, Any]]:
+        return await self._execute(
+            _parse_batch_in_process, self._parse_batch, texts, time
+        )
+
+    async def _execute(
+        self,
+        in_process: Callable[..., Any],
+        in_thread: Callable[..., Any],
+        *arguments: Any
+    ) -> Any:
+        """Run `in_thread` or `in_process` depending on the execution mode."""
+
+        if self.execution_mode == "inline" or self._closed:
+            # messages which arrive after the interpreter was closed, e.g.
+            # while the model is replaced, don't start new workers
+            return in_thread(*arguments)
+
+        loop = asyncio.get_event_loop()
+        if self.execution_mode == "process":
+            args = (in_process, self.model_directory) + arguments
+        else:
+            args = (in_thread,) + arguments
+
+        async with self._pending_slots(loop):
+            return await loop.run_in_executor(self._get_executor(), *args)
+
+    def _parse(self, text: Text) -> Dict[Text, Any]:
+        return self._loaded_interpreter().parse(text)
+
+    def _parse_batch(
+        self, texts: List[Text], time: Any = None
+    ) -> List[Dict[Text, Any]]:
+        return self._loaded_interpreter().parse_batch(texts, time)
+
+    def _loaded_interpreter(self) -> Any:
+        if (self.lazy_init or self._closed) and self.interpreter is None:
+            # several threads might try to load the model at the same time
+            with self._load_lock:
+                if self.interpreter is None:
+                    self._load_interpreter()
+        return self.interpreter
+
+    def _pending_slots(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        # the semaphore is bound to the event loop it was created in
+        if self._pending is None or self._pending_loop is not loop:
+            self._pending = asyncio.Semaphore(self.max_pending, loop=loop)
+            self._pending_loop = loop
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.execution_mode == "process":
+                self._executor = _process_pool_executor(self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the workers which parse the messages.
+
+        Messages which were already handed to the workers are still parsed,
+        this doesn't wait for them to block the event loop. Messages which
+        are parsed after the interpreter was closed are parsed inline."""
+
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _create_cache(self, cache_size: int) -> ParseCache:
+        from rasa.nlu import registry
+        from rasa.nlu.model import Metadata
+
+        # the model might not be loaded in this process, e.g. in the process
+        # execution mode, so its pipeline is looked up in the metadata
+        metadata = Metadata.load(self.model_directory)
+        time_dependent = any(
+            registry.get_component_class(name).time_dependent
+            for name in metadata.component_classes
+        )
+        return ParseCache(cache_size, metadata.fingerprint, time_dependent)
+
     def _load_interpreter(self):
         from rasa.nlu.model import Interpreter
 
-        self.interpreter = Interpreter.load(self.model_directory)
+        if self.execution_mode == "process" and not self._closed:
+            # the worker processes load their own copy of the model
+            self.interpreter = None
+        else:
+            self.interpreter = Interpreter.load(self.model_directory)
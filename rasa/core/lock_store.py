@@ -0,0 +1,379 @@
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Text
+
+from async_generator import async_generator, asynccontextmanager, yield_
+
+from rasa.core.utils import class_from_module_path
+from rasa.utils.endpoints import EndpointConfig
+
+logger = logging.getLogger(__name__)
+
+# lifetime of a ticket in seconds, after which the conversation is unlocked
+# even if the holder of the ticket didn't release it (e.g. its process
+# crashed). Messages which take longer don't lock the conversation anymore.
+DEFAULT_LOCK_LIFETIME = 60
+
+# maximum time in seconds to wait until a ticket is served
+DEFAULT_WAIT_TIMEOUT = 60
+
+# time in seconds between two checks whether a ticket is served (the
+# `InMemoryLockStore` wakes up waiting tickets instead)
+DEFAULT_POLL_INTERVAL = 0.01
+
+# the time between two checks doubles while a ticket waits, up to this
+# number of seconds
+MAX_POLL_INTERVAL = 0.1
+
+
+class LockError(Exception):
+    """Exception that is raised when a conversation couldn't be locked."""
+
+    pass
+
+
+class LockStore(object):
+    """Locks conversations, so only one message per conversation is handled
+    at the same time.
+
+    Every message draws a ticket for its conversation and waits until the
+    ticket is served. Tickets are served in the order they were issued and
+    expire after the lock lifetime (if it isn't `None`), so a crashed process
+    doesn't lock a conversation forever."""
+
+    def __init__(
+        self,
+        lock_lifetime: Optional[float] = DEFAULT_LOCK_LIFETIME,
+        wait_timeout: Optional[float] = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        self.lock_lifetime = lock_lifetime
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def find_lock_store(store: Optional[EndpointConfig] = None) -> "LockStore":
+        if store is None or store.type is None or store.type == "in_memory":
+            kwargs = store.kwargs if store is not None else {}
+            return InMemoryLockStore(**kwargs)
+        elif store.type == "redis":
+            return RedisLockStore(host=store.url, **store.kwargs)
+        else:
+            return LockStore.load_lock_store_from_module_string(store)
+
+    @staticmethod
+    def load_lock_store_from_module_string(store: EndpointConfig) -> "LockStore":
+        custom_lock_store = None
+        try:
+            custom_lock_store = class_from_module_path(store.type)
+        except (AttributeError, ImportError):
+            logger.warning(
+                "Lock store type '{}' not found. "
+                "Using InMemoryLockStore instead".format(store.type)
+            )
+
+        if custom_lock_store:
+            return custom_lock_store(url=store.url, **store.kwargs)
+        else:
+            return InMemoryLockStore()
+
+    def issue_ticket(self, conversation_id: Text, lifetime: Optional[float]) -> int:
+        """Issue the next ticket of the conversation, which expires after
+        `lifetime` seconds (never if it's `None`)."""
+
+        raise NotImplementedError()
+
+    def now_serving(self, conversation_id: Text) -> Optional[int]:
+        """Return the lowest ticket of the conversation which neither expired
+        nor was removed, `None` if there is none."""
+
+        raise NotImplementedError()
+
+    def remove_ticket(self, conversation_id: Text, ticket: int) -> None:
+        """Remove a ticket, which serves the next ticket of the conversation."""
+
+        raise NotImplementedError()
+
+    def is_locked(self, conversation_id: Text) -> bool:
+        """Check if a message of the conversation is currently handled."""
+
+        return self.now_serving(conversation_id) is not None
+
+    @asynccontextmanager
+    @async_generator  # needed for python 3.5 compatibility
+    async def lock(
+        self,
+        conversation_id: Text,
+        lock_lifetime: Optional[float] = None,
+        wait_timeout: Optional[float] = None,
+    ) -> None:
+        """Lock the conversation until the context is left.
+
+        Raises a `LockError` if the conversation isn't unlocked within the
+        wait timeout (if it isn't `None`)."""
+
+        if lock_lifetime is None:
+            lock_lifetime = self.lock_lifetime
+        if wait_timeout is None:
+            wait_timeout = self.wait_timeout
+
+        ticket = await self._call(self.issue_ticket, conversation_id, lock_lifetime)
+        try:
+            # the ticket can't be served anymore once it expired
+            timeouts = [t for t in (wait_timeout, lock_lifetime) if t is not None]
+            timeout = min(timeouts) if timeouts else None
+            await self._wait_for_ticket(conversation_id, ticket, timeout)
+            await yield_()
+        finally:
+            await self._call(self.remove_ticket, conversation_id, ticket)
+
+    async def _call(self, method: Callable[..., Any], *args: Any) -> Any:
+        """Call a method of the store from the event loop.
+
+        Stores which block on I/O should run the method in a thread."""
+
+        return method(*args)
+
+    async def _wait_for_ticket(
+        self, conversation_id: Text, ticket: int, timeout: Optional[float]
+    ) -> None:
+        deadline = _deadline(timeout)
+        poll_interval = self.poll_interval
+        while True:
+            now_serving = await self._call(self.now_serving, conversation_id)
+            if now_serving == ticket:
+                return
+
+            if time.time() >= deadline:
+                raise _lock_error(conversation_id, timeout, ticket, now_serving)
+
+            await asyncio.sleep(poll_interval)
+            # check less often while the conversation stays locked
+            poll_interval = min(
+                2 * poll_interval, max(self.poll_interval, MAX_POLL_INTERVAL)
+            )
+
+
+def _deadline(timeout: Optional[float]) -> float:
+    return float("inf") if timeout is None else time.time() + timeout
+
+
+def _lock_error(
+    conversation_id: Text,
+    timeout: Optional[float],
+    ticket: int,
+    now_serving: Optional[int],
+) -> LockError:
+    return LockError(
+        "Could not lock conversation '{}' within {} seconds, ticket {} waits "
+        "for ticket {}.".format(conversation_id, timeout, ticket, now_serving)
+    )
+
+
+class _TicketQueue(object):
+    """Issued tickets of a conversation and their expiration times."""
+
+    def __init__(self) -> None:
+        self.last_issued = 0
+        self.tickets = deque()  # type: Deque[int]
+        self.expirations = {}  # type: Dict[int, float]
+        # resolved when a ticket is removed
+        self._removed = None  # type: Optional[asyncio.Future]
+
+    def issue(self, lifetime: Optional[float]) -> int:
+        self.last_issued += 1
+        self.tickets.append(self.last_issued)
+        self.expirations[self.last_issued] = (
+            float("inf") if lifetime is None else time.time() + lifetime
+        )
+        return self.last_issued
+
+    def now_serving(self) -> Optional[int]:
+        now = time.time()
+        while self.tickets:
+            ticket = self.tickets[0]
+            expiration = self.expirations.get(ticket)
+            if expiration is not None and expiration > now:
+                return ticket
+
+            # the ticket was removed or expired
+            self.tickets.popleft()
+            self.expirations.pop(ticket, None)
+        return None
+
+    def remove(self, ticket: int) -> None:
+        self.expirations.pop(ticket, None)
+        if self._removed is not None:
+            if not self._removed.done():
+                self._removed.set_result(None)
+            self._removed = None
+
+    async def wait_for_removal(self, timeout: Optional[float]) -> None:
+        """Wait until a ticket is removed or `timeout` seconds passed."""
+
+        if self._removed is None:
+            self._removed = asyncio.get_event_loop().create_future()
+        try:
+            # all waiting tickets share the future, so a timeout must not
+            # cancel it
+            await asyncio.wait_for(asyncio.shield(self._removed), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class InMemoryLockStore(LockStore):
+    """Store which keeps the locks in the memory of the process.
+
+    Only locks the conversations for the coroutines of a single process. The
+    tickets don't expire and messages wait for their ticket without a
+    timeout by default, as the tickets are gone with the process. Waiting
+    tickets are woken up when a ticket is removed instead of polling."""
+
+    def __init__(
+        self,
+        lock_lifetime: Optional[float] = None,
+        wait_timeout: Optional[float] = None,
+    ) -> None:
+        self.queues = {}  # type: Dict[Text, _TicketQueue]
+        super(InMemoryLockStore, self).__init__(lock_lifetime, wait_timeout)
+
+    def issue_ticket(self, conversation_id: Text, lifetime: Optional[float]) -> int:
+        queue = self.queues.get(conversation_id)
+        if queue is None:
+            queue = self.queues[conversation_id] = _TicketQueue()
+        return queue.issue(lifetime)
+
+    def now_serving(self, conversation_id: Text) -> Optional[int]:
+        queue = self.queues.get(conversation_id)
+        if queue is None:
+            return None
+
+        now_serving = queue.now_serving()
+        if now_serving is None:
+            # dispose of the queue if no one needs it to avoid accumulating
+            # queues, tickets are unique per queue only
+            del self.queues[conversation_id]
+        return now_serving
+
+    def remove_ticket(self, conversation_id: Text, ticket: int) -> None:
+        queue = self.queues.get(conversation_id)
+        if queue is not None:
+            queue.remove(ticket)
+            self.now_serving(conversation_id)
+
+    async def _wait_for_ticket(
+        self, conversation_id: Text, ticket: int, timeout: Optional[float]
+    ) -> None:
+        deadline = _deadline(timeout)
+        while True:
+            now_serving = self.now_serving(conversation_id)
+            if now_serving == ticket:
+                return
+
+            now = time.time()
+            if now >= deadline:
+                raise _lock_error(conversation_id, timeout, ticket, now_serving)
+
+            # the queue exists as long as the waiting ticket is in it. The
+            # served ticket might expire before it's removed.
+            queue = self.queues[conversation_id]
+            wake_up = min(deadline, queue.expirations[now_serving])
+            await queue.wait_for_removal(
+                None if wake_up == float("inf") else wake_up - now
+            )
+
+
+class RedisLockStore(LockStore):
+    """Store which keeps the locks in Redis, so they are shared by all
+    processes which handle messages.
+
+    The ticket numbers of a conversation are drawn from a counter. Every
+    ticket is a key which expires after the lock lifetime, the issued
+    ticket numbers are kept in a sorted set. Drawing and queueing a ticket
+    is a single transaction."""
+
+    def __init__(
+        self,
+        host: Text = "localhost",
+        port: int = 6379,
+        db: int = 1,
+        password: Optional[Text] = None,
+        key_prefix: Text = "lock:",
+        lock_lifetime: float = DEFAULT_LOCK_LIFETIME,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        import redis
+
+        self.red = redis.StrictRedis(host=host, port=port, db=db, password=password)
+        self.key_prefix = key_prefix
+        super(RedisLockStore, self).__init__(lock_lifetime, wait_timeout, poll_interval)
+
+    def _key(self, conversation_id: Text, suffix: Text) -> Text:
+        return "{}{}:{}".format(self.key_prefix, conversation_id, suffix)
+
+    def _ticket_key(self, conversation_id: Text, ticket: int) -> Text:
+        return self._key(conversation_id, "ticket:{}".format(ticket))
+
+    def issue_ticket(self, conversation_id: Text, lifetime: float) -> int:
+        milliseconds = int(lifetime * 1000)
+        counter = self._key(conversation_id, "counter")
+        tickets = self._key(conversation_id, "tickets")
+
+        def issue(pipeline: "redis.client.Pipeline") -> int:
+            # the ticket is drawn and queued in one transaction, which is
+            # retried if another process draws a ticket in the meantime.
+            # Otherwise a later ticket could be queued (and served) first.
+            ticket = int(pipeline.get(counter) or 0) + 1
+            # the counter and the queue expire together with the ticket
+            # which lives longest
+            expire = max(milliseconds, pipeline.pttl(counter) or 0)
+
+            pipeline.multi()
+            pipeline.set(counter, ticket, px=expire)
+            pipeline.set(self._ticket_key(conversation_id, ticket), 1, px=milliseconds)
+            pipeline.zadd(tickets, {str(ticket): ticket})
+            pipeline.pexpire(tickets, expire)
+            return ticket
+
+        return self.red.transaction(issue, counter, value_from_callable=True)
+
+    async def _call(self, method: Callable[..., Any], *args: Any) -> Any:
+        # the Redis client blocks, so it's used from a thread
+        return await asyncio.get_event_loop().run_in_executor(
+            None, functools.partial(method, *args)
+        )
+
+    def now_serving(self, conversation_id: Text) -> Optional[int]:
+        tickets = self._key(conversation_id, "tickets")
+        queued = [int(ticket) for ticket in self.red.zrange(tickets, 0, -1)]
+        if not queued:
+            return None
+
+        # check all queued tickets in a single round trip
+        pipeline = self.red.pipeline(transaction=False)
+        for ticket in queued:
+            pipeline.exists(self._ticket_key(conversation_id, ticket))
+        exists = pipeline.execute()
+
+        expired = []
+        now_serving = None
+        for ticket, ticket_exists in zip(queued, exists):
+            if ticket_exists:
+                now_serving = ticket
+                break
+            # the ticket was removed or expired
+            expired.append(ticket)
+
+        if expired:
+            self.red.zrem(tickets, *expired)
+        return now_serving
+
+    def remove_ticket(self, conversation_id: Text, ticket: int) -> None:
+        pipeline = self.red.pipeline()
+        pipeline.delete(self._ticket_key(conversation_id, ticket))
+        pipeline.zrem(self._key(conversation_id, "tickets"), ticket)
+        pipeline.execute()
@@ -1,14 +1,54 @@
-# we need to import the policy first
-from rasa.core.policies.policy import Policy
-
-pass
-# and after that any implementation
-from rasa.core.policies.ensemble import SimplePolicyEnsemble, PolicyEnsemble
-from rasa.core.policies.embedding_policy import EmbeddingPolicy
-from rasa.core.policies.fallback import FallbackPolicy
-from rasa.core.policies.keras_policy import KerasPolicy
-from rasa.core.policies.memoization import MemoizationPolicy, AugmentedMemoizationPolicy
-from rasa.core.policies.sklearn_policy import SklearnPolicy
-from rasa.core.policies.form_policy import FormPolicy
-from rasa.core.policies.two_stage_fallback import TwoStageFallbackPolicy
-from rasa.core.policies.mapping_policy import MappingPolicy
+import sys
+
+# Modules of all policies which can be imported from this package. The
+# policies are imported when they are first used, so e.g. tensorflow is only
+# imported if a tensorflow based policy is used (only on Python >= 3.7, older
+# versions import all policies with the package).
+policy_modules = {
+    "Policy": "rasa.core.policies.policy",
+    "SimplePolicyEnsemble": "rasa.core.policies.ensemble",
+    "PolicyEnsemble": "rasa.core.policies.ensemble",
+    "EmbeddingPolicy": "rasa.core.policies.embedding_policy",
+    "FallbackPolicy": "rasa.core.policies.fallback",
+    "KerasPolicy": "rasa.core.policies.keras_policy",
+    "MemoizationPolicy": "rasa.core.policies.memoization",
+    "AugmentedMemoizationPolicy": "rasa.core.policies.memoization",
+    "SklearnPolicy": "rasa.core.policies.sklearn_policy",
+    "FormPolicy": "rasa.core.policies.form_policy",
+    "TwoStageFallbackPolicy": "rasa.core.policies.two_stage_fallback",
+    "MappingPolicy": "rasa.core.policies.mapping_policy",
+}
+
+if sys.version_info >= (3, 7):
+    import importlib
+
+    def __getattr__(name):
+        module_path = policy_modules.get(name)
+        if module_path is None:
+            raise AttributeError(
+                "module '{}' has no attribute '{}'".format(__name__, name)
+            )
+        return getattr(importlib.import_module(module_path), name)
+
+    def __dir__():
+        return sorted(list(globals().keys()) + list(policy_modules.keys()))
+
+
+else:  # pragma: no cover
+    # we need to import the policy first
+    from rasa.core.policies.policy import Policy
+
+    pass
+    # and after that any implementation
+    from rasa.core.policies.ensemble import SimplePolicyEnsemble, PolicyEnsemble
+    from rasa.core.policies.embedding_policy import EmbeddingPolicy
+    from rasa.core.policies.fallback import FallbackPolicy
+    from rasa.core.policies.keras_policy import KerasPolicy
+    from rasa.core.policies.memoization import (
+        MemoizationPolicy,
+        AugmentedMemoizationPolicy,
+    )
+    from rasa.core.policies.sklearn_policy import SklearnPolicy
+    from rasa.core.policies.form_policy import FormPolicy
+    from rasa.core.policies.two_stage_fallback import TwoStageFallbackPolicy
+    from rasa.core.policies.mapping_policy import MappingPolicy
@@ -18,6 +18,7 @@ from rasa.core.featurizers import (
     TrackerFeaturizer,
     FullDialogueTrackerFeaturizer,
     LabelTokenizerSingleStateFeaturizer,
+    FeaturizationContext,
 )
 from rasa.core.policies.policy import Policy
 
@@ -1336,53 +1337,81 @@ class EmbeddingPolicy(Policy):
             )
 
     def predict_action_probabilities(
-        self, tracker: DialogueStateTracker, domain: Domain
+        self,
+        tracker: DialogueStateTracker,
+        domain: Domain,
+        featurization: Optional[FeaturizationContext] = None,
     ) -> List[float]:
         """Predict the next action the bot should take.
 
         Return the list of probabilities for the next actions.
         """
 
+        featurizations = [featurization] if featurization is not None else None
+        return self.predict_action_probabilities_batch(
+            [tracker], domain, featurizations
+        )[0]
+
+    def predict_action_probabilities_batch(
+        self,
+        trackers: List[DialogueStateTracker],
+        domain: Domain,
+        featurizations: Optional[List[FeaturizationContext]] = None,
+    ) -> List[List[float]]:
+        """Predict the next actions of all trackers whose features have the
+        same shape with a single run of the tf graph."""
+
         if self.session is None:
             logger.error(
                 "There is no trained tf.session: "
                 "component is either not trained or "
                 "didn't receive enough training data"
             )
-            return [0.0] * domain.num_actions
+            return [[0.0] * domain.num_actions for _ in trackers]
+
+        if featurizations is None:
+            featurizations = [FeaturizationContext(t, domain) for t in trackers]
+
+        tracker_features = [f.create_X(self.featurizer) for f in featurizations]
+        probabilities = [None] * len(trackers)
 
         # noinspection PyPep8Naming
-        data_X = self.featurizer.create_X([tracker], domain)
-        session_data = self._create_tf_session_data(domain, data_X)
-        # noinspection PyPep8Naming
-        all_Y_d_x = np.stack(
-            [session_data.all_Y_d for _ in range(session_data.X.shape[0])]
-        )
+        for indices, data_X in self._batches_of_equal_shape(tracker_features):
+            session_data = self._create_tf_session_data(domain, data_X)
+            # noinspection PyPep8Naming
+            all_Y_d_x = np.stack(
+                [session_data.all_Y_d for _ in range(session_data.X.shape[0])]
+            )
 
-        _sim = self.session.run(
-            self.sim_op,
-            feed_dict={
-                self.a_in: session_data.X,
-                self.b_in: all_Y_d_x,
-                self.c_in: session_data.slots,
-                self.b_prev_in: session_data.previous_actions,
-                self._dialogue_len: session_data.X.shape[1],
-                self._x_for_no_intent_in: session_data.x_for_no_intent,
-                self._y_for_no_action_in: session_data.y_for_no_action,
-                self._y_for_action_listen_in: session_data.y_for_action_listen,
-            },
-        )
+            _sim = self.session.run(
+                self.sim_op,
+                feed_dict={
+                    self.a_in: session_data.X,
+                    self.b_in: all_Y_d_x,
+                    self.c_in: session_data.slots,
+                    self.b_prev_in: session_data.previous_actions,
+                    self._dialogue_len: session_data.X.shape[1],
+                    self._x_for_no_intent_in: session_data.x_for_no_intent,
+                    self._y_for_no_action_in: session_data.y_for_no_action,
+                    self._y_for_action_listen_in: session_data.y_for_action_listen,
+                },
+            )
 
-        result = _sim[0, -1, :]
-        if self.similarity_type == "cosine":
-            # clip negative values to zero
-            result[result < 0] = 0
-        elif self.similarity_type == "inner":
-            # normalize result to [0, 1] with softmax
-            result = np.exp(result)
-            result /= np.sum(result)
-
-        return result.tolist()
+            for i, sim in zip(
+                indices, self._split_batch(_sim, tracker_features, indices)
+            ):
+                result = sim[0, -1, :]
+                if self.similarity_type == "cosine":
+                    # clip negative values to zero
+                    result[result < 0] = 0
+                elif self.similarity_type == "inner":
+                    # normalize result to [0, 1] with softmax
+                    result = np.exp(result)
+                    result /= np.sum(result)
+
+                probabilities[i] = result.tolist()
+
+        return probabilities
 
     def _persist_tensor(self, name: Text, tensor: tf.Tensor) -> None:
         if tensor is not None:
@@ -10,6 +10,7 @@ from typing import Text, Optional, Any, List, Dict, Tuple
 import numpy as np
 
 import rasa.core
+import rasa.utils.common
 import rasa.utils.io
 from rasa.constants import MINIMUM_COMPATIBLE_VERSION, DOCS_BASE_URL
 
@@ -18,8 +19,8 @@ from rasa.core.actions.action import ACTION_LISTEN_NAME
 from rasa.core.domain import Domain
 from rasa.core.events import SlotSet, ActionExecuted, ActionExecutionRejected
 from rasa.core.exceptions import UnsupportedDialogueModelError
-from rasa.core.featurizers import MaxHistoryTrackerFeaturizer
-from rasa.core.policies import Policy
+from rasa.core.featurizers import MaxHistoryTrackerFeaturizer, FeaturizationContext
+from rasa.core.policies.policy import Policy
 from rasa.core.policies.fallback import FallbackPolicy
 from rasa.core.policies.memoization import MemoizationPolicy, AugmentedMemoizationPolicy
 from rasa.core.trackers import DialogueStateTracker
@@ -97,6 +98,13 @@ class PolicyEnsemble(object):
     ) -> Tuple[List[float], Text]:
         raise NotImplementedError
 
+    def probabilities_using_best_policy_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[Tuple[List[float], Text]]:
+        """Predict the next actions for several trackers at once."""
+
+        return [self.probabilities_using_best_policy(t, domain) for t in trackers]
+
     def _max_histories(self):
         # type: () -> List[Optional[int]]
         """Return max history."""
@@ -333,20 +341,66 @@ class SimplePolicyEnsemble(PolicyEnsemble):
     def probabilities_using_best_policy(
         self, tracker: DialogueStateTracker, domain: Domain
     ) -> Tuple[List[float], Text]:
+        return self.probabilities_using_best_policy_batch([tracker], domain)[0]
+
+    def probabilities_using_best_policy_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[Tuple[List[float], Text]]:
+        """Predict the next actions for several trackers at once.
+
+        Every policy predicts for all trackers in a single call, which
+        lets the ML policies share a forward pass of their model."""
+
+        # every tracker is featurized once for all policies
+        featurizations = [FeaturizationContext(t, domain) for t in trackers]
+        all_probabilities = []
+        all_rejected_actions = []
+        for p in self.policies:
+            all_probabilities.append(
+                p.predict_action_probabilities_batch(trackers, domain, featurizations)
+            )
+            # policies might log events while predicting (e.g. the `FormPolicy`),
+            # so the rejected action is checked after every policy
+            all_rejected_actions.append([self._rejected_action(t) for t in trackers])
+
+        return [
+            self._best_policy_prediction(
+                tracker,
+                domain,
+                [probabilities[j] for probabilities in all_probabilities],
+                [rejected_actions[j] for rejected_actions in all_rejected_actions],
+            )
+            for j, tracker in enumerate(trackers)
+        ]
+
+    @staticmethod
+    def _rejected_action(tracker: DialogueStateTracker) -> Optional[Text]:
+        if len(tracker.events) > 0 and isinstance(
+            tracker.events[-1], ActionExecutionRejected
+        ):
+            return tracker.events[-1].action_name
+        return None
+
+    def _best_policy_prediction(
+        self,
+        tracker: DialogueStateTracker,
+        domain: Domain,
+        policy_probabilities: List[List[float]],
+        rejected_actions: List[Optional[Text]],
+    ) -> Tuple[List[float], Text]:
+        """Pick the prediction of the best policy from the predictions of all
+        policies for the tracker."""
+
         result = None
         max_confidence = -1
         best_policy_name = None
         best_policy_priority = -1
 
-        for i, p in enumerate(self.policies):
-            probabilities = p.predict_action_probabilities(tracker, domain)
-
-            if len(tracker.events) > 0 and isinstance(
-                tracker.events[-1], ActionExecutionRejected
-            ):
-                probabilities[
-                    domain.index_for_action(tracker.events[-1].action_name)
-                ] = 0.0
+        for i, (p, probabilities, rejected_action) in enumerate(
+            zip(self.policies, policy_probabilities, rejected_actions)
+        ):
+            if rejected_action is not None:
+                probabilities[domain.index_for_action(rejected_action)] = 0.0
 
             confidence = np.max(probabilities)
             if (confidence, p.priority) > (max_confidence, best_policy_priority):
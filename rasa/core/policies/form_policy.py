@@ -4,7 +4,7 @@ from typing import List, Optional, Dict, Text
 from rasa.core.actions.action import ACTION_LISTEN_NAME
 from rasa.core.domain import PREV_PREFIX, ACTIVE_FORM_PREFIX, Domain
 from rasa.core.events import FormValidation
-from rasa.core.featurizers import TrackerFeaturizer
+from rasa.core.featurizers import TrackerFeaturizer, FeaturizationContext
 from rasa.core.policies.memoization import MemoizationPolicy
 from rasa.core.trackers import DialogueStateTracker
 
@@ -87,11 +87,14 @@ class FormPolicy(MemoizationPolicy):
         # modify the states
         return self._recall_states(self._modified_states(states))
 
-    def state_is_unhappy(self, tracker, domain):
+    def state_is_unhappy(self, tracker, domain, featurization=None):
         # since it is assumed that training stories contain
         # only unhappy paths, notify the form that
         # it should not be validated if predicted by other policy
-        tracker_as_states = self.featurizer.prediction_states([tracker], domain)
+        if featurization is None:
+            featurization = FeaturizationContext(tracker, domain)
+
+        tracker_as_states = featurization.prediction_states(self.featurizer)
         states = tracker_as_states[0]
 
         memorized_form = self.recall(states, tracker, domain)
@@ -111,7 +114,10 @@ class FormPolicy(MemoizationPolicy):
         return state_is_unhappy
 
     def predict_action_probabilities(
-        self, tracker: DialogueStateTracker, domain: Domain
+        self,
+        tracker: DialogueStateTracker,
+        domain: Domain,
+        featurization: Optional[FeaturizationContext] = None,
     ) -> List[float]:
         """Predicts the corresponding form action if there is an active form"""
         result = [0.0] * domain.num_actions
@@ -124,7 +130,7 @@ class FormPolicy(MemoizationPolicy):
                 # predict form action after user utterance
 
                 if tracker.active_form.get("rejected"):
-                    if self.state_is_unhappy(tracker, domain):
+                    if self.state_is_unhappy(tracker, domain, featurization):
                         tracker.update(FormValidation(False))
                         return result
 
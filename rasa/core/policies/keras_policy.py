@@ -15,7 +15,7 @@ from rasa.core.featurizers import (
     MaxHistoryTrackerFeaturizer,
     BinarySingleStateFeaturizer,
 )
-from rasa.core.featurizers import TrackerFeaturizer
+from rasa.core.featurizers import TrackerFeaturizer, FeaturizationContext
 from rasa.core.policies.policy import Policy
 from rasa.core.trackers import DialogueStateTracker
 from rasa.utils.common import obtain_verbosity
@@ -245,19 +245,46 @@ class KerasPolicy(Policy):
                 self.current_epoch += 1
 
     def predict_action_probabilities(
-        self, tracker: DialogueStateTracker, domain: Domain
+        self,
+        tracker: DialogueStateTracker,
+        domain: Domain,
+        featurization: Optional[FeaturizationContext] = None,
     ) -> List[float]:
 
+        featurizations = [featurization] if featurization is not None else None
+        return self.predict_action_probabilities_batch(
+            [tracker], domain, featurizations
+        )[0]
+
+    def predict_action_probabilities_batch(
+        self,
+        trackers: List[DialogueStateTracker],
+        domain: Domain,
+        featurizations: Optional[List[FeaturizationContext]] = None,
+    ) -> List[List[float]]:
+        """Predict the next actions of all trackers whose features have the
+        same shape with a single forward pass of the model."""
+
+        if featurizations is None:
+            featurizations = [FeaturizationContext(t, domain) for t in trackers]
+
+        tracker_features = [f.create_X(self.featurizer) for f in featurizations]
+        probabilities = [None] * len(trackers)
+
         # noinspection PyPep8Naming
-        X = self.featurizer.create_X([tracker], domain)
+        for indices, X in self._batches_of_equal_shape(tracker_features):
+            with self.graph.as_default(), self.session.as_default():
+                y_pred = self.model.predict(X, batch_size=X.shape[0])
 
-        with self.graph.as_default(), self.session.as_default():
-            y_pred = self.model.predict(X, batch_size=1)
+            for i, y in zip(
+                indices, self._split_batch(y_pred, tracker_features, indices)
+            ):
+                if len(y.shape) == 2:
+                    probabilities[i] = y[-1].tolist()
+                elif len(y.shape) == 3:
+                    probabilities[i] = y[0, -1].tolist()
 
-        if len(y_pred.shape) == 2:
-            return y_pred[-1].tolist()
-        elif len(y_pred.shape) == 3:
-            return y_pred[0, -1].tolist()
+        return probabilities
 
     def persist(self, path: Text) -> None:
 
@@ -12,7 +12,11 @@ import rasa.utils.io
 from rasa.core import utils
 from rasa.core.domain import Domain
 from rasa.core.events import ActionExecuted
-from rasa.core.featurizers import TrackerFeaturizer, MaxHistoryTrackerFeaturizer
+from rasa.core.featurizers import (
+    TrackerFeaturizer,
+    MaxHistoryTrackerFeaturizer,
+    FeaturizationContext,
+)
 from rasa.core.policies.policy import Policy
 from rasa.core.trackers import DialogueStateTracker
 from rasa.utils.common import is_logging_disabled
@@ -187,7 +191,10 @@ class MemoizationPolicy(Policy):
         return self._recall_states(states)
 
     def predict_action_probabilities(
-        self, tracker: DialogueStateTracker, domain: Domain
+        self,
+        tracker: DialogueStateTracker,
+        domain: Domain,
+        featurization: Optional[FeaturizationContext] = None,
     ) -> List[float]:
         """Predicts the next action the bot should take
             after seeing the tracker.
@@ -200,7 +207,10 @@ class MemoizationPolicy(Policy):
         if not self.is_enabled:
             return result
 
-        tracker_as_states = self.featurizer.prediction_states([tracker], domain)
+        if featurization is None:
+            featurization = FeaturizationContext(tracker, domain)
+
+        tracker_as_states = featurization.prediction_states(self.featurizer)
         states = tracker_as_states[0]
         logger.debug("Current tracker state {}".format(states))
         recalled = self.recall(states, tracker, domain)
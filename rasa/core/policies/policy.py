@@ -1,7 +1,10 @@
 import copy
 import logging
-import tensorflow as tf
-from typing import Any, List, Optional, Text, Dict, Callable
+from collections import OrderedDict
+
+import numpy as np
+import typing
+from typing import Any, List, Optional, Text, Dict, Callable, Tuple
 
 import rasa.utils.common
 from rasa.core.domain import Domain
@@ -9,10 +12,12 @@ from rasa.core.featurizers import (
     MaxHistoryTrackerFeaturizer,
     BinarySingleStateFeaturizer,
 )
-from rasa.core.featurizers import TrackerFeaturizer
+from rasa.core.featurizers import TrackerFeaturizer, FeaturizationContext
 from rasa.core.trackers import DialogueStateTracker
 from rasa.core.training.data import DialogueTrainingData
 
+if typing.TYPE_CHECKING:
+    import tensorflow as tf
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +37,11 @@ class Policy(object):
             return cls._standard_featurizer()
 
     @staticmethod
-    def _load_tf_config(config: Dict[Text, Any]) -> Optional[tf.ConfigProto]:
+    def _load_tf_config(config: Dict[Text, Any]) -> Optional["tf.ConfigProto"]:
         """Prepare tf.ConfigProto for training"""
         if config.get("tf_config") is not None:
+            import tensorflow as tf
+
             return tf.ConfigProto(**config.pop("tf_config"))
         else:
             return None
@@ -135,15 +142,78 @@ class Policy(object):
         pass
 
     def predict_action_probabilities(
-        self, tracker: DialogueStateTracker, domain: Domain
+        self,
+        tracker: DialogueStateTracker,
+        domain: Domain,
+        featurization: Optional[FeaturizationContext] = None,
     ) -> List[float]:
         """Predicts the next action the bot should take
         after seeing the tracker.
 
+        The ensemble passes a `featurization` which is shared between
+        all of its policies to avoid featurizing the tracker repeatedly.
+        Policies that don't take the argument are still supported.
+
         Returns the list of probabilities for the next actions"""
 
         raise NotImplementedError("Policy must have the capacity to predict.")
 
+    def predict_action_probabilities_batch(
+        self,
+        trackers: List[DialogueStateTracker],
+        domain: Domain,
+        featurizations: Optional[List[FeaturizationContext]] = None,
+    ) -> List[List[float]]:
+        """Predicts the next actions for several trackers at once.
+
+        `featurizations` holds the shared featurization of every tracker.
+        By default the trackers are predicted one after the other, policies
+        which can predict for several trackers faster (e.g. with a single
+        forward pass of their model) should overwrite this method.
+
+        Returns the list of probabilities for the next actions of
+        every tracker"""
+
+        if featurizations is None:
+            featurizations = [FeaturizationContext(t, domain) for t in trackers]
+
+        arguments = rasa.utils.common.arguments_of(self.predict_action_probabilities)
+        if "featurization" not in arguments:
+            # custom policies might not support the `featurization` argument
+            return [self.predict_action_probabilities(t, domain) for t in trackers]
+
+        return [
+            self.predict_action_probabilities(t, domain, featurization=f)
+            for t, f in zip(trackers, featurizations)
+        ]
+
+    @staticmethod
+    def _batches_of_equal_shape(
+        tracker_features: List[np.ndarray]
+    ) -> List[Tuple[List[int], np.ndarray]]:
+        """Concatenate the features of the trackers which have the same shape.
+
+        Returns the indices of the trackers in every batch and the batch."""
+
+        indices_by_shape = OrderedDict()
+        for i, X in enumerate(tracker_features):
+            indices_by_shape.setdefault(X.shape[1:], []).append(i)
+
+        return [
+            (indices, np.concatenate([tracker_features[i] for i in indices]))
+            for indices in indices_by_shape.values()
+        ]
+
+    @staticmethod
+    def _split_batch(
+        predictions: np.ndarray, tracker_features: List[np.ndarray], indices: List[int]
+    ) -> List[np.ndarray]:
+        """Split the predictions for a batch into the predictions per tracker."""
+
+        # the features of a tracker might take several rows of the batch
+        rows = [tracker_features[i].shape[0] for i in indices]
+        return np.split(predictions, np.cumsum(rows)[:-1])
+
     def persist(self, path: Text) -> None:
         """Persists the policy to a storage."""
         raise NotImplementedError("Policy must have the capacity to persist itself.")
@@ -17,7 +17,11 @@ from typing import Optional, Any, List, Text, Dict, Callable
 import rasa.utils.io
 from rasa.core import utils
 from rasa.core.domain import Domain
-from rasa.core.featurizers import TrackerFeaturizer, MaxHistoryTrackerFeaturizer
+from rasa.core.featurizers import (
+    TrackerFeaturizer,
+    MaxHistoryTrackerFeaturizer,
+    FeaturizationContext,
+)
 from rasa.core.policies.policy import Policy
 from rasa.core.trackers import DialogueStateTracker
 
@@ -160,12 +164,41 @@ class SklearnPolicy(Policy):
         return y_filled
 
     def predict_action_probabilities(
-        self, tracker: DialogueStateTracker, domain: Domain
+        self,
+        tracker: DialogueStateTracker,
+        domain: Domain,
+        featurization: Optional[FeaturizationContext] = None,
     ) -> List[float]:
-        X = self.featurizer.create_X([tracker], domain)
-        Xt = self._preprocess_data(X)
-        y_proba = self.model.predict_proba(Xt)
-        return self._postprocess_prediction(y_proba, domain)
+        featurizations = [featurization] if featurization is not None else None
+        return self.predict_action_probabilities_batch(
+            [tracker], domain, featurizations
+        )[0]
+
+    def predict_action_probabilities_batch(
+        self,
+        trackers: List[DialogueStateTracker],
+        domain: Domain,
+        featurizations: Optional[List[FeaturizationContext]] = None,
+    ) -> List[List[float]]:
+        """Predict the next actions of all trackers whose features have the
+        same shape with a single call of the model."""
+
+        if featurizations is None:
+            featurizations = [FeaturizationContext(t, domain) for t in trackers]
+
+        tracker_features = [f.create_X(self.featurizer) for f in featurizations]
+        probabilities = [None] * len(trackers)
+
+        for indices, X in self._batches_of_equal_shape(tracker_features):
+            Xt = self._preprocess_data(X)
+            y_proba = self.model.predict_proba(Xt)
+
+            for i, y in zip(
+                indices, self._split_batch(y_proba, tracker_features, indices)
+            ):
+                probabilities[i] = self._postprocess_prediction(y, domain)
+
+        return probabilities
 
     def persist(self, path: Text) -> None:
 
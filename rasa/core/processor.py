@@ -35,6 +35,7 @@ from rasa.core.nlg import NaturalLanguageGenerator
 from rasa.core.policies.ensemble import PolicyEnsemble
 from rasa.core.tracker_store import TrackerStore
 from rasa.core.trackers import DialogueStateTracker, EventVerbosity
+from rasa.utils.batching import Batcher
 from rasa.utils.endpoints import EndpointConfig
 
 logger = logging.getLogger(__name__)
@@ -52,6 +53,7 @@ class MessageProcessor(object):
         max_number_of_predictions: int = 10,
         message_preprocessor: Optional[LambdaType] = None,
         on_circuit_break: Optional[LambdaType] = None,
+        prediction_batcher: Optional[Batcher] = None,
     ):
         self.interpreter = interpreter
         self.nlg = generator
@@ -62,6 +64,7 @@ class MessageProcessor(object):
         self.message_preprocessor = message_preprocessor
         self.on_circuit_break = on_circuit_break
         self.action_endpoint = action_endpoint
+        self.prediction_batcher = prediction_batcher
 
     async def handle_message(self, message: UserMessage) -> Optional[List[Text]]:
         """Handle a single message with this processor."""
@@ -73,7 +76,7 @@ class MessageProcessor(object):
 
         await self._predict_and_execute_next_action(message, tracker)
         # save tracker state to continue conversation from this state
-        self._save_tracker(tracker)
+        await self._save_tracker(tracker)
 
         if isinstance(message.output_channel, CollectingOutputChannel):
             return message.output_channel.messages
@@ -84,7 +87,9 @@ class MessageProcessor(object):
 
         # we have a Tracker instance for each user
         # which maintains conversation state
-        tracker = self._get_tracker(sender_id)
+        tracker = self.tracker_store.get_or_create_tracker(
+            sender_id or UserMessage.DEFAULT_SENDER_ID
+        )
         if not tracker:
             logger.warning(
                 "Failed to retrieve or create tracker for sender "
@@ -94,7 +99,31 @@ class MessageProcessor(object):
 
         probabilities, policy = self._get_next_action_probabilities(tracker)
         # save tracker state to continue conversation from this state
-        self._save_tracker(tracker)
+        self.tracker_store.save(tracker)
+        return self._prediction(tracker, probabilities, policy)
+
+    async def async_predict_next(self, sender_id: Text) -> Optional[Dict[Text, Any]]:
+        """Predict the next action like `predict_next` without blocking the
+        event loop while the tracker is retrieved and saved."""
+
+        tracker = await self._get_tracker(sender_id)
+        if not tracker:
+            logger.warning(
+                "Failed to retrieve or create tracker for sender "
+                "'{}'.".format(sender_id)
+            )
+            return None
+
+        probabilities, policy = await self._get_batched_next_action_probabilities(
+            tracker
+        )
+        # save tracker state to continue conversation from this state
+        await self._save_tracker(tracker)
+        return self._prediction(tracker, probabilities, policy)
+
+    def _prediction(
+        self, tracker: DialogueStateTracker, probabilities: List[float], policy: Text
+    ) -> Dict[Text, Any]:
         scores = [
             {"action": a, "score": p}
             for a, p in zip(self.domain.action_names, probabilities)
@@ -113,11 +142,11 @@ class MessageProcessor(object):
             message.text = self.message_preprocessor(message.text)
         # we have a Tracker instance for each user
         # which maintains conversation state
-        tracker = self._get_tracker(message.sender_id)
+        tracker = await self._get_tracker(message.sender_id)
         if tracker:
             await self._handle_message_with_tracker(message, tracker)
             # save tracker state to continue conversation from this state
-            self._save_tracker(tracker)
+            await self._save_tracker(tracker)
         else:
             logger.warning(
                 "Failed to retrieve or create tracker for sender "
@@ -137,7 +166,7 @@ class MessageProcessor(object):
 
         # we have a Tracker instance for each user
         # which maintains conversation state
-        tracker = self._get_tracker(sender_id)
+        tracker = await self._get_tracker(sender_id)
         if tracker:
             action = self._get_action(action_name)
             await self._run_action(
@@ -145,7 +174,7 @@ class MessageProcessor(object):
             )
 
             # save tracker state to continue conversation from this state
-            self._save_tracker(tracker)
+            await self._save_tracker(tracker)
         else:
             logger.warning(
                 "Failed to retrieve or create tracker for sender "
@@ -162,7 +191,24 @@ class MessageProcessor(object):
         ML to predict the action. Returns the index of the next action."""
 
         action_confidences, policy = self._get_next_action_probabilities(tracker)
+        return self._action_for_probabilities(action_confidences, policy)
+
+    async def _predict_next_action_batched(
+        self, tracker: DialogueStateTracker
+    ) -> Tuple[Action, Text, float]:
+        """Predicts the next action like `predict_next_action`.
+
+        If the processor has a prediction batcher, the prediction is made
+        together with the predictions for concurrent conversations."""
 
+        action_confidences, policy = await self._get_batched_next_action_probabilities(
+            tracker
+        )
+        return self._action_for_probabilities(action_confidences, policy)
+
+    def _action_for_probabilities(
+        self, action_confidences: List[float], policy: Text
+    ) -> Tuple[Action, Text, float]:
         max_confidence_index = int(np.argmax(action_confidences))
         action = self.domain.action_for_index(
             max_confidence_index, self.action_endpoint
@@ -211,7 +257,7 @@ class MessageProcessor(object):
     ) -> None:
         """Handle a reminder that is triggered asynchronously."""
 
-        tracker = self._get_tracker(sender_id)
+        tracker = await self._get_tracker(sender_id)
 
         if not tracker:
             logger.warning(
@@ -243,7 +289,7 @@ class MessageProcessor(object):
                 user_msg = UserMessage(None, output_channel, sender_id)
                 await self._predict_and_execute_next_action(user_msg, tracker)
             # save tracker state to continue conversation from this state
-            self._save_tracker(tracker)
+            await self._save_tracker(tracker)
 
     @staticmethod
     def _log_slots(tracker):
@@ -336,7 +382,9 @@ class MessageProcessor(object):
             and num_predicted_actions < self.max_number_of_predictions
         ):
             # this actually just calls the policy's method by the same name
-            action, policy, confidence = self.predict_next_action(tracker)
+            action, policy, confidence = await self._predict_next_action_batched(
+                tracker
+            )
 
             should_predict_another_action = await self._run_action(
                 action, tracker, message.output_channel, self.nlg, policy, confidence
@@ -511,12 +559,12 @@ class MessageProcessor(object):
             e.timestamp = time.time()
             tracker.update(e)
 
-    def _get_tracker(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+    async def _get_tracker(self, sender_id: Text) -> Optional[DialogueStateTracker]:
         sender_id = sender_id or UserMessage.DEFAULT_SENDER_ID
-        return self.tracker_store.get_or_create_tracker(sender_id)
+        return await self.tracker_store.async_get_or_create_tracker(sender_id)
 
-    def _save_tracker(self, tracker):
-        self.tracker_store.save(tracker)
+    async def _save_tracker(self, tracker: DialogueStateTracker) -> None:
+        await self.tracker_store.async_save(tracker)
 
     def _prob_array_for_action(
         self, action_name: Text
@@ -529,12 +577,9 @@ class MessageProcessor(object):
         else:
             return None, None
 
-    def _get_next_action_probabilities(
+    def _followup_action_probabilities(
         self, tracker: DialogueStateTracker
-    ) -> Tuple[Optional[List[float]], Optional[Text]]:
-        """Collect predictions from ensemble and return action and predictions.
-        """
-
+    ) -> Optional[Tuple[Optional[List[float]], Optional[Text]]]:
         followup_action = tracker.followup_action
         if followup_action:
             tracker.clear_followup_action()
@@ -547,7 +592,33 @@ class MessageProcessor(object):
                     "Instead of running that, we will ignore the action "
                     "and predict the next action.".format(followup_action)
                 )
+        return None
+
+    def _get_next_action_probabilities(
+        self, tracker: DialogueStateTracker
+    ) -> Tuple[Optional[List[float]], Optional[Text]]:
+        """Collect predictions from ensemble and return action and predictions.
+        """
+
+        result = self._followup_action_probabilities(tracker)
+        if result:
+            return result
 
         return self.policy_ensemble.probabilities_using_best_policy(
             tracker, self.domain
         )
+
+    async def _get_batched_next_action_probabilities(
+        self, tracker: DialogueStateTracker
+    ) -> Tuple[Optional[List[float]], Optional[Text]]:
+        """Collect predictions like `_get_next_action_probabilities`, the
+        prediction batcher predicts for several conversations at once."""
+
+        if self.prediction_batcher is None:
+            return self._get_next_action_probabilities(tracker)
+
+        result = self._followup_action_probabilities(tracker)
+        if result:
+            return result
+
+        return await self.prediction_batcher.submit(tracker)
@@ -96,7 +96,7 @@ async def replay_events(tracker: DialogueStateTracker, agent: "Agent") -> None:
             for m in out.messages:
                 console.print_bot_output(m)
 
-            tracker = agent.tracker_store.retrieve(tracker.sender_id)
+            tracker = await agent.tracker_store.async_retrieve(tracker.sender_id)
             last_prediction = actions_since_last_utterance(tracker)
 
         elif isinstance(event, ActionExecuted):
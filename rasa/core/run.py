@@ -1,5 +1,9 @@
 import asyncio
+import gc
 import logging
+import os
+import shutil
+import tempfile
 from functools import partial
 from typing import List, Optional, Text, Union
 
@@ -13,10 +17,13 @@ from rasa.core import constants, utils
 from rasa.core.agent import load_agent, Agent
 from rasa.core.channels import BUILTIN_CHANNELS, InputChannel, console
 from rasa.core.interpreter import NaturalLanguageInterpreter
+from rasa.core.lock_store import LockStore
 from rasa.core.tracker_store import TrackerStore
+from rasa.constants import ENV_MODEL_CACHE_DIRECTORY
 from rasa.core.utils import AvailableEndpoints
-from rasa.model import get_model_subdirectories, get_model
+from rasa.model import get_model_cache_directory, get_model_subdirectories, get_model
 from rasa.utils.common import update_sanic_log_level
+from rasa.utils.endpoints import close_sessions
 
 logger = logging.getLogger()  # get the root logger
 
@@ -125,12 +132,20 @@ def serve_application(
     jwt_method: Optional[Text] = None,
     endpoints: Optional[AvailableEndpoints] = None,
     remote_storage: Optional[Text] = None,
+    workers: int = 1,
 ):
     if not channel and not credentials:
         channel = "cmdline"
 
     input_channels = create_http_input_channels(channel, credentials)
 
+    if workers > 1 and "cmdline" in {c.name() for c in input_channels}:
+        logger.warning(
+            "The command line channel can't be served by several workers, "
+            "starting a single worker instead."
+        )
+        workers = 1
+
     app = configure_app(
         input_channels, cors, auth_token, enable_api, jwt_secret, jwt_method, port=port
     )
@@ -144,10 +159,90 @@ def serve_application(
         partial(load_agent_on_start, model_path, endpoints, remote_storage),
         "before_server_start",
     )
+    app.register_listener(
+        partial(close_endpoint_sessions, endpoints), "after_server_stop"
+    )
+    app.register_listener(close_interpreter, "after_server_stop")
+    app.register_listener(close_event_broker, "after_server_stop")
 
     update_sanic_log_level()
 
-    app.run(host="0.0.0.0", port=port)
+    if workers > 1:
+        _run_workers(app, port, workers, model_path, endpoints)
+    else:
+        app.run(host="0.0.0.0", port=port)
+
+
+def _run_workers(
+    app: Sanic,
+    port: int,
+    workers: int,
+    model_path: Optional[Text],
+    endpoints: Optional[AvailableEndpoints],
+) -> None:
+    """Serve the app with several worker processes which are forked from
+    this process.
+
+    The workers load their own agent, since tensorflow sessions can't be
+    used in forked processes. The model is unpacked only once into a model
+    cache shared by all workers, and the modules imported so far are shared
+    copy-on-write."""
+
+    _warn_about_process_local_stores(endpoints, workers)
+
+    model_cache = None
+    if not get_model_cache_directory():
+        model_cache = tempfile.mkdtemp()
+        os.environ[ENV_MODEL_CACHE_DIRECTORY] = model_cache
+
+    try:
+        if model_path and os.path.exists(model_path):
+            # the workers find the model in the model cache
+            get_model(model_path)
+
+        if hasattr(gc, "freeze"):
+            # objects created so far are never touched by the garbage
+            # collector of the workers, so their memory stays shared
+            gc.freeze()
+
+        logger.info("Starting {} workers.".format(workers))
+        app.run(host="0.0.0.0", port=port, workers=workers)
+    finally:
+        if model_cache:
+            del os.environ[ENV_MODEL_CACHE_DIRECTORY]
+            shutil.rmtree(model_cache, ignore_errors=True)
+
+
+def _warn_about_process_local_stores(
+    endpoints: Optional[AvailableEndpoints], workers: int
+) -> None:
+    """Warn if conversations are kept or locked per worker process, so
+    messages of the same conversation handled by different workers don't
+    see each other."""
+
+    tracker_store = endpoints.tracker_store if endpoints else None
+    lock_store = endpoints.lock_store if endpoints else None
+
+    if tracker_store is None or tracker_store.type is None:
+        logger.warning(
+            "Each of the {} workers keeps its own conversations in memory. "
+            "Configure a tracker store which is shared by all workers, e.g. "
+            "the `RedisTrackerStore`.".format(workers)
+        )
+    elif "cache" in tracker_store.kwargs:
+        logger.warning(
+            "Each of the {} workers caches its own trackers, the caches don't "
+            "see the messages handled by the other workers. Remove the "
+            "`cache` of the tracker store when running several workers."
+            "".format(workers)
+        )
+
+    if lock_store is None or lock_store.type in {None, "in_memory"}:
+        logger.warning(
+            "Each of the {} workers locks the conversations only within its "
+            "own process. Configure a lock store which is shared by all "
+            "workers, e.g. the `RedisLockStore`.".format(workers)
+        )
 
 
 # noinspection PyUnusedLocal
@@ -172,9 +267,12 @@ async def load_agent_on_start(
         _interpreter = None
 
     _broker = broker.from_endpoint_config(endpoints.event_broker)
+    # the broker is closed when the server stops
+    app.event_broker = _broker
     _tracker_store = TrackerStore.find_tracker_store(
         None, endpoints.tracker_store, _broker
     )
+    _lock_store = LockStore.find_lock_store(endpoints.lock_store)
 
     model_server = endpoints.model if endpoints and endpoints.model else None
 
@@ -186,6 +284,7 @@ async def load_agent_on_start(
         generator=endpoints.nlg,
         tracker_store=_tracker_store,
         action_endpoint=endpoints.action,
+        lock_store=_lock_store,
     )
 
     if not app.agent:
@@ -200,11 +299,52 @@ async def load_agent_on_start(
             action_endpoint=endpoints.action,
             model_server=model_server,
             remote_storage=remote_storage,
+            lock_store=_lock_store,
         )
 
     return app.agent
 
 
+# noinspection PyUnusedLocal
+async def close_endpoint_sessions(
+    endpoints: Optional[AvailableEndpoints], app: Sanic, loop: Text
+) -> None:
+    """Close the HTTP sessions of the configured endpoints.
+
+    Used to be scheduled on server stop
+    (hence the `app` and `loop` arguments)."""
+
+    if endpoints:
+        await close_sessions(
+            [endpoints.action, endpoints.nlg, endpoints.nlu, endpoints.model]
+        )
+
+
+# noinspection PyUnusedLocal
+async def close_interpreter(app: Sanic, loop: Text) -> None:
+    """Shut down the workers of the agent's NLU interpreter.
+
+    Used to be scheduled on server stop
+    (hence the `app` and `loop` arguments)."""
+
+    agent = getattr(app, "agent", None)
+    if agent is not None and agent.interpreter is not None:
+        agent.interpreter.close()
+
+
+# noinspection PyUnusedLocal
+async def close_event_broker(app: Sanic, loop: Text) -> None:
+    """Publish the buffered events of the event broker and close it.
+
+    Used to be scheduled on server stop
+    (hence the `app` and `loop` arguments)."""
+
+    event_broker = getattr(app, "event_broker", None)
+    if event_broker is not None:
+        # publishing the remaining events blocks
+        await asyncio.get_event_loop().run_in_executor(None, event_broker.close)
+
+
 if __name__ == "__main__":
     raise RuntimeError(
         "Calling `rasa.core.run` directly is no longer supported. "
@@ -1,34 +1,85 @@
+import asyncio
+import contextlib
+import copy
+import functools
 import json
 import logging
 import pickle
-from typing import Iterator, Optional, Text, Iterable
-
-import itertools
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional, Text, Iterable, List, Tuple
 
 # noinspection PyPep8Naming
 from time import sleep
 
 from rasa.core.actions.action import ACTION_LISTEN_NAME
 from rasa.core.broker import EventChannel
+from rasa.core.conversation import Dialogue
 from rasa.core.domain import Domain
-from rasa.core.trackers import ActionExecuted, DialogueStateTracker, EventVerbosity
+from rasa.core.event_codec import EventCodec
+from rasa.core.events import Event, Restarted, deserialise_events
+from rasa.core.trackers import ActionExecuted, DialogueStateTracker
 from rasa.core.utils import class_from_module_path
 
 logger = logging.getLogger(__name__)
 
+# number of stored events from the latest restart on, which is kept in the
+# conversation documents of the `MongoTrackerStore`
+NUM_EVENTS_SINCE_RESTART = "num_events_since_restart"
+
+
+def _num_events_since_restart(events: Iterable[Event]) -> int:
+    """Count the events from the latest `Restarted` event on."""
+
+    events = list(events)
+    for i, event in enumerate(reversed(events)):
+        if isinstance(event, Restarted):
+            return i + 1
+    return len(events)
+
 
 class TrackerStore(object):
+    # maximum number of threads which run the blocking calls of the
+    # store's asynchronous methods
+    max_executor_workers = 10
+
     def __init__(
-        self, domain: Optional[Domain], event_broker: Optional[EventChannel] = None
+        self,
+        domain: Optional[Domain],
+        event_broker: Optional[EventChannel] = None,
+        max_intent_ranking: Optional[int] = None,
     ) -> None:
         self.domain = domain
         self.event_broker = event_broker
         self.max_event_history = None
+        # maximum number of intents which the trackers keep in the ranking of
+        # the user messages, `None` keeps the whole ranking
+        self.max_intent_ranking = max_intent_ranking
+        self._hashed_domain = None
+        self._domain_hash = None
+        self._executor = None
 
     @staticmethod
     def find_tracker_store(domain, store=None, event_broker=None):
-        if store is None or store.type is None:
+        if store is not None and "cache" in store.kwargs:
+            # the configured store is wrapped by a `CachingTrackerStore`
+            store = copy.copy(store)
+            store.kwargs = dict(store.kwargs)
+            cache_config = store.kwargs.pop("cache") or {}
+            return CachingTrackerStore(
+                TrackerStore.find_tracker_store(domain, store, event_broker),
+                **cache_config
+            )
+
+        if store is None:
             return InMemoryTrackerStore(domain, event_broker=event_broker)
+        elif store.type is None:
+            return InMemoryTrackerStore(
+                domain, event_broker=event_broker, **store.kwargs
+            )
         elif store.type == "redis":
             return RedisTrackerStore(
                 domain=domain, host=store.url, event_broker=event_broker, **store.kwargs
@@ -70,7 +121,10 @@ class TrackerStore(object):
     def init_tracker(self, sender_id):
         if self.domain:
             return DialogueStateTracker(
-                sender_id, self.domain.slots, max_event_history=self.max_event_history
+                sender_id,
+                self.domain.slots,
+                max_event_history=self.max_event_history,
+                max_intent_ranking=self.max_intent_ranking,
             )
         else:
             return None
@@ -93,11 +147,57 @@ class TrackerStore(object):
     def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
         raise NotImplementedError()
 
+    async def async_get_or_create_tracker(
+        self, sender_id: Text, max_event_history: Optional[int] = None
+    ) -> Optional[DialogueStateTracker]:
+        """Asynchronous version of `get_or_create_tracker`."""
+
+        tracker = await self.async_retrieve(sender_id)
+        self.max_event_history = max_event_history
+        if tracker is None:
+            tracker = self.init_tracker(sender_id)
+            if tracker:
+                tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+                await self.async_save(tracker)
+        return tracker
+
+    async def async_save(self, tracker: DialogueStateTracker) -> None:
+        """Save the tracker without blocking the event loop.
+
+        Runs `save` in the thread pool of the store, stores with an
+        asynchronous client can override this."""
+
+        await self._run_in_executor(self.save, tracker)
+
+    async def async_retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        """Retrieve the tracker without blocking the event loop.
+
+        Runs `retrieve` in the thread pool of the store, stores with an
+        asynchronous client can override this."""
+
+        return await self._run_in_executor(self.retrieve, sender_id)
+
+    async def async_keys(self) -> Iterable[Text]:
+        """Return the stored sender ids without blocking the event loop."""
+
+        return await self._run_in_executor(lambda: list(self.keys()))
+
+    async def _run_in_executor(self, func: Callable, *args: Any) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_executor_workers,
+                thread_name_prefix="tracker-store",
+            )
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args)
+        )
+
     def stream_events(self, tracker: DialogueStateTracker) -> None:
-        old_tracker = self.retrieve(tracker.sender_id)
-        offset = len(old_tracker.events) if old_tracker else 0
-        evts = tracker.events
-        for evt in list(itertools.islice(evts, offset, len(evts))):
+        """Publish the events which were added since the tracker was last
+        persisted to the event broker."""
+
+        for evt in tracker.unpersisted_events():
             body = {"sender_id": tracker.sender_id}
             body.update(evt.as_dict())
             self.event_broker.publish(body)
@@ -105,46 +205,240 @@ class TrackerStore(object):
     def keys(self) -> Iterable[Text]:
         raise NotImplementedError()
 
+    def create_snapshot(self, tracker: DialogueStateTracker) -> Dict[Text, Any]:
+        """Take a snapshot of the tracker's state, which is versioned with
+        the hash of the current domain."""
+
+        snapshot = tracker.snapshot()
+        snapshot["domain_hash"] = self.domain_hash()
+        return snapshot
+
+    def domain_hash(self) -> Optional[Text]:
+        """Return the hash of the domain, which is only recomputed if the
+        domain was replaced (e.g. by loading a new model)."""
+
+        if self.domain is None:
+            return None
+
+        if self._hashed_domain is not self.domain:
+            self._hashed_domain = self.domain
+            self._domain_hash = str(hash(self.domain))
+        return self._domain_hash
+
+    def recreate_tracker(
+        self,
+        sender_id: Text,
+        evts: List[Event],
+        snapshot: Optional[Dict[Text, Any]] = None,
+    ) -> DialogueStateTracker:
+        """Recreate a tracker from its stored events.
+
+        If the snapshot matches the events and the current domain, only the
+        events after the snapshot are replayed. Otherwise all events are
+        replayed and the next save stores an up to date snapshot."""
+
+        tracker = None
+        if snapshot and snapshot.get("domain_hash") == self.domain_hash():
+            tracker = DialogueStateTracker.from_snapshot(
+                sender_id,
+                evts,
+                snapshot,
+                self.domain.slots,
+                max_event_history=self.max_event_history,
+                max_intent_ranking=self.max_intent_ranking,
+            )
+        if tracker is None:
+            tracker = DialogueStateTracker.from_events(
+                sender_id,
+                evts,
+                self.domain.slots,
+                self.max_event_history,
+                self.max_intent_ranking,
+            )
+        tracker.mark_events_persisted()
+        return tracker
+
     @staticmethod
     def serialise_tracker(tracker):
-        dialogue = tracker.as_dialogue()
-        return pickle.dumps(dialogue)
+        return EventCodec().encode(tracker.events)
 
     def deserialise_tracker(self, sender_id, _json):
-        dialogue = pickle.loads(_json)
+        if EventCodec.is_encoded(_json):
+            dialogue = Dialogue(sender_id, EventCodec().decode(_json))
+        else:
+            # trackers which were stored before the `EventCodec` was used
+            dialogue = pickle.loads(_json)
         tracker = self.init_tracker(sender_id)
         tracker.recreate_from_dialogue(dialogue)
+        tracker.mark_events_persisted()
         return tracker
 
 
+class _StoredConversation(object):
+    """Events and snapshot of a conversation in the `InMemoryTrackerStore`."""
+
+    def __init__(self) -> None:
+        # encoded lists of events, every save appends the new events
+        self.chunks = []
+        self.snapshot = None
+        self.num_bytes = 0
+        self.last_access = time.time()
+
+    def append(
+        self, events: List[Event], snapshot: Dict[Text, Any], codec: EventCodec
+    ) -> None:
+        if events:
+            self.chunks.append(codec.encode(events))
+        self.snapshot = pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL)
+        self.num_bytes = sum(len(c) for c in self.chunks) + len(self.snapshot)
+
+
 class InMemoryTrackerStore(TrackerStore):
+    """Store which keeps the conversations in the memory of the process.
+
+    Saving a tracker appends its new events in encoded form and stores a
+    snapshot of its state, so retrieving it doesn't replay the events.
+    If `max_conversations` or `max_bytes` are exceeded, the least recently
+    used conversations are removed. Conversations which weren't used for
+    `idle_timeout` seconds are removed as well. With `compress` the encoded
+    events are compressed, which saves memory at the cost of CPU time. With
+    `retrieve_since_restart` only the events since the latest restart are
+    decoded, the trackers are then recreated by replaying these events."""
+
     def __init__(
-        self, domain: Domain, event_broker: Optional[EventChannel] = None
+        self,
+        domain: Domain,
+        event_broker: Optional[EventChannel] = None,
+        max_conversations: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        max_intent_ranking: Optional[int] = None,
+        compress: bool = False,
+        retrieve_since_restart: bool = False,
     ) -> None:
-        self.store = {}
-        super(InMemoryTrackerStore, self).__init__(domain, event_broker)
+        self.store = OrderedDict()
+        self.codec = EventCodec(compress=compress)
+        self.retrieve_since_restart = retrieve_since_restart
+        self.max_conversations = max_conversations
+        self.max_bytes = max_bytes
+        self.idle_timeout = idle_timeout
+        self._num_bytes = 0
+        self._lock = threading.RLock()
+        super(InMemoryTrackerStore, self).__init__(
+            domain, event_broker, max_intent_ranking
+        )
 
     def save(self, tracker: DialogueStateTracker) -> None:
         if self.event_broker:
             self.stream_events(tracker)
-        serialised = InMemoryTrackerStore.serialise_tracker(tracker)
-        self.store[tracker.sender_id] = serialised
+
+        events = tracker.unpersisted_events()
+        snapshot = self.create_snapshot(tracker)
+        with self._lock:
+            self._remove_expired()
+            stored = self.store.get(tracker.sender_id)
+            if stored is None or len(events) == len(tracker.events):
+                # the tracker wasn't loaded from the store or its conversation
+                # was removed since, it replaces the stored conversation
+                self._remove(tracker.sender_id)
+                stored = _StoredConversation()
+                self.store[tracker.sender_id] = stored
+                events = list(tracker.events)
+
+            self._num_bytes -= stored.num_bytes
+            stored.append(events, snapshot, self.codec)
+            self._num_bytes += stored.num_bytes
+            self._touch(tracker.sender_id, stored)
+            self._remove_least_recently_used()
+        tracker.mark_events_persisted()
 
     def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
-        if sender_id in self.store:
+        with self._lock:
+            self._remove_expired()
+            stored = self.store.get(sender_id)
+            if stored is not None:
+                self._touch(sender_id, stored)
+                chunks, snapshot = list(stored.chunks), stored.snapshot
+
+        if stored is not None:
             logger.debug("Recreating tracker for id '{}'".format(sender_id))
-            return self.deserialise_tracker(sender_id, self.store[sender_id])
+            if self.retrieve_since_restart:
+                # the snapshot doesn't match the events since the restart
+                events = self._decode_since_restart(chunks)
+                return self.recreate_tracker(sender_id, events)
+
+            events = [e for chunk in chunks for e in self.codec.decode(chunk)]
+            return self.recreate_tracker(sender_id, events, pickle.loads(snapshot))
         else:
             logger.debug("Creating a new tracker for id '{}'.".format(sender_id))
             return None
 
     def keys(self) -> Iterable[Text]:
-        return self.store.keys()
+        with self._lock:
+            self._remove_expired()
+            return list(self.store.keys())
+
+    def _decode_since_restart(self, chunks: List[bytes]) -> List[Event]:
+        """Decode the events since the latest restart, starting with the
+        latest chunk. Chunks before the one with the restart aren't decoded."""
+
+        decoded = []
+        for chunk in reversed(chunks):
+            events = self.codec.decode_since_restart(chunk)
+            decoded.append(events)
+            if events and isinstance(events[0], Restarted):
+                break
+        return [e for events in reversed(decoded) for e in events]
+
+    def memory_footprint(self) -> int:
+        """Return the number of bytes of the stored events and snapshots."""
+
+        return self._num_bytes
+
+    def _touch(self, sender_id: Text, stored: _StoredConversation) -> None:
+        stored.last_access = time.time()
+        self.store.move_to_end(sender_id)
+
+    def _remove(self, sender_id: Text) -> None:
+        stored = self.store.pop(sender_id, None)
+        if stored is not None:
+            self._num_bytes -= stored.num_bytes
+
+    def _remove_expired(self) -> None:
+        if self.idle_timeout is None:
+            return
+
+        # the conversations are ordered by their last access
+        expired_before = time.time() - self.idle_timeout
+        while self.store:
+            sender_id, stored = next(iter(self.store.items()))
+            if stored.last_access >= expired_before:
+                break
+            logger.debug("Removing idle conversation '{}'.".format(sender_id))
+            self._remove(sender_id)
+
+    def _remove_least_recently_used(self) -> None:
+        # the most recently saved conversation is kept in any case
+        while len(self.store) > 1 and (
+            (self.max_conversations and len(self.store) > self.max_conversations)
+            or (self.max_bytes and self._num_bytes > self.max_bytes)
+        ):
+            sender_id = next(iter(self.store))
+            logger.debug(
+                "Removing least recently used conversation '{}'.".format(sender_id)
+            )
+            self._remove(sender_id)
 
 
 class RedisTrackerStore(TrackerStore):
     def keys(self) -> Iterable[Text]:
-        return self.red.keys()
+        # skip the keys which store the latest restarts of `append_only`
+        # conversations
+        return [k for k in self.red.keys() if not k.endswith(self._RESTART_SUFFIX)]
+
+    # suffix of the keys which store the index of the latest restart in the
+    # list of events of an `append_only` conversation
+    _RESTART_SUFFIX = b":restart"
 
     def __init__(
         self,
@@ -155,13 +449,20 @@ class RedisTrackerStore(TrackerStore):
         password=None,
         event_broker=None,
         record_exp=None,
+        append_only=False,
+        max_intent_ranking=None,
+        retrieve_since_restart=False,
     ):
 
         import redis
 
         self.red = redis.StrictRedis(host=host, port=port, db=db, password=password)
         self.record_exp = record_exp
-        super(RedisTrackerStore, self).__init__(domain, event_broker)
+        self.append_only = append_only
+        self.retrieve_since_restart = retrieve_since_restart
+        super(RedisTrackerStore, self).__init__(
+            domain, event_broker, max_intent_ranking
+        )
 
     def save(self, tracker, timeout=None):
         if self.event_broker:
@@ -170,16 +471,183 @@ class RedisTrackerStore(TrackerStore):
         if not timeout and self.record_exp:
             timeout = self.record_exp
 
-        serialised_tracker = self.serialise_tracker(tracker)
-        self.red.set(tracker.sender_id, serialised_tracker, ex=timeout)
+        if self.append_only:
+            self._append_tracker_events(tracker, timeout)
+        else:
+            serialised_tracker = self.serialise_tracker(tracker)
+            self.red.set(tracker.sender_id, serialised_tracker, ex=timeout)
+        tracker.mark_events_persisted()
 
     def retrieve(self, sender_id):
+        if self.append_only:
+            return self._retrieve_appended(sender_id)
+
         stored = self.red.get(sender_id)
-        if stored is not None:
-            return self.deserialise_tracker(sender_id, stored)
-        else:
+        if stored is None:
+            return None
+
+        if self.retrieve_since_restart and EventCodec.is_encoded(stored):
+            # only the events after the latest restart are decoded
+            return self.recreate_tracker(
+                sender_id, EventCodec().decode_since_restart(stored)
+            )
+        return self.deserialise_tracker(sender_id, stored)
+
+    def migrate_pickled_trackers(self) -> int:
+        """Convert all trackers stored as a single value (encoded events or
+        pickled dialogues) to lists of events, which are used if the store
+        is ``append_only``.
+
+        Returns the number of migrated trackers."""
+
+        migrated = 0
+        for key in self.keys():
+            if self.red.type(key) == b"string":
+                self._migrate_pickled_tracker(key.decode("utf-8"))
+                migrated += 1
+        return migrated
+
+    def _append_tracker_events(
+        self, tracker: DialogueStateTracker, timeout: Optional[int] = None
+    ) -> None:
+        """Append the unpersisted events of the tracker to the stored events.
+
+        A tracker which wasn't loaded from the store, or whose stored events
+        expired since it was loaded, replaces the stored events with all of
+        its events."""
+
+        sender_id = tracker.sender_id
+        events = tracker.unpersisted_events()
+
+        def append(pipeline: "redis.client.Pipeline") -> None:
+            # the watched key is checked before the transaction starts, the
+            # transaction is retried if the key changes in between
+            num_stored = pipeline.llen(sender_id)
+            replace = len(events) == len(tracker.events) or num_stored == 0
+            pipeline.multi()
+            self._queue_events(
+                pipeline,
+                sender_id,
+                list(tracker.events) if replace else events,
+                replace,
+                timeout,
+                num_stored,
+            )
+
+        self.red.transaction(append, sender_id)
+
+    def _append_events(
+        self,
+        sender_id: Text,
+        events: List[Event],
+        replace: bool = False,
+        timeout: Optional[int] = None,
+    ) -> None:
+        """Append events to the list of stored events of the conversation."""
+
+        pipeline = self.red.pipeline()
+        self._queue_events(pipeline, sender_id, events, replace, timeout)
+        pipeline.execute()
+
+    def _queue_events(
+        self,
+        pipeline: "redis.client.Pipeline",
+        sender_id: Text,
+        events: List[Event],
+        replace: bool = False,
+        timeout: Optional[int] = None,
+        num_stored: int = 0,
+    ) -> None:
+        """Queue the commands which append `events` to the `num_stored`
+        stored events (or replace them) and update the index of the latest
+        restart."""
+
+        restart_key = self._restart_key(sender_id)
+        if replace:
+            num_stored = 0
+            pipeline.delete(sender_id)
+        if events:
+            pipeline.rpush(sender_id, *[self._serialise_event(e) for e in events])
+
+        restarts = [i for i, e in enumerate(events) if isinstance(e, Restarted)]
+        if restarts:
+            pipeline.set(restart_key, num_stored + restarts[-1])
+        elif replace:
+            pipeline.set(restart_key, 0)
+
+        if timeout:
+            pipeline.expire(sender_id, timeout)
+            pipeline.expire(restart_key, timeout)
+
+    @classmethod
+    def _restart_key(cls, sender_id: Text) -> bytes:
+        return sender_id.encode("utf-8") + cls._RESTART_SUFFIX
+
+    def _retrieve_appended(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        """Recreate a tracker from the events stored after the latest restart."""
+
+        from redis.exceptions import ResponseError
+
+        restart = self.red.get(self._restart_key(sender_id))
+        start = int(restart or 0)
+        try:
+            # only the events from the latest restart on are read
+            serialised_events = self.red.lrange(sender_id, start, -1)
+        except ResponseError:
+            # the key still holds a tracker which was stored as a single value
+            return self._migrate_pickled_tracker(sender_id)
+
+        if restart is None or (
+            start > 0
+            and not (serialised_events and self._is_restart(serialised_events[0]))
+        ):
+            # the events were appended before the index of the latest restart
+            # was stored, or they were replaced after the index was read
+            serialised_events = self._events_since_latest_restart(
+                self.red.lrange(sender_id, 0, -1)
+            )
+
+        if not serialised_events:
             return None
 
+        tracker = self.init_tracker(sender_id)
+        for serialised in serialised_events:
+            tracker.update(Event.from_parameters(json.loads(serialised)))
+        tracker.mark_events_persisted()
+        return tracker
+
+    def _migrate_pickled_tracker(self, sender_id: Text) -> DialogueStateTracker:
+        """Store a tracker which was stored as a single value as list of
+        events."""
+
+        logger.debug("Migrating pickled tracker for id '{}'.".format(sender_id))
+        tracker = self.deserialise_tracker(sender_id, self.red.get(sender_id))
+        self._append_events(
+            sender_id, list(tracker.events), replace=True, timeout=self.record_exp
+        )
+        return tracker
+
+    @staticmethod
+    def _serialise_event(event: Event) -> Text:
+        return json.dumps(event.as_dict(), separators=(",", ":"))
+
+    @staticmethod
+    def _events_since_latest_restart(serialised_events: List[bytes]) -> List[bytes]:
+        """Skip the events before the latest restart without parsing them."""
+
+        for i in range(len(serialised_events) - 1, -1, -1):
+            if RedisTrackerStore._is_restart(serialised_events[i]):
+                return serialised_events[i:]
+        return serialised_events
+
+    @staticmethod
+    def _is_restart(serialised: bytes) -> bool:
+        marker = '"event":"{}"'.format(Restarted.type_name).encode("utf-8")
+        return (
+            marker in serialised
+            and json.loads(serialised).get("event") == Restarted.type_name
+        )
+
 
 class MongoTrackerStore(TrackerStore):
     def __init__(
@@ -192,6 +660,9 @@ class MongoTrackerStore(TrackerStore):
         auth_source="admin",
         collection="conversations",
         event_broker=None,
+        retrieve_since_restart=False,
+        snapshots=False,
+        max_intent_ranking=None,
     ):
         from pymongo.database import Database
         from pymongo import MongoClient
@@ -207,7 +678,14 @@ class MongoTrackerStore(TrackerStore):
 
         self.db = Database(self.client, db)
         self.collection = collection
-        super(MongoTrackerStore, self).__init__(domain, event_broker)
+        self.retrieve_since_restart = retrieve_since_restart
+        self.snapshots = snapshots
+        # stored top level fields of the conversations of the trackers which
+        # were saved or retrieved, keyed by the `id` of the tracker
+        self._stored_fields = {}  # type: Dict[int, Dict[Text, Any]]
+        super(MongoTrackerStore, self).__init__(
+            domain, event_broker, max_intent_ranking
+        )
 
         self._ensure_indices()
 
@@ -222,14 +700,104 @@ class MongoTrackerStore(TrackerStore):
         if self.event_broker:
             self.stream_events(tracker)
 
-        state = tracker.current_state(EventVerbosity.ALL)
+        events = tracker.unpersisted_events()
+        if len(events) == len(tracker.events) or not self._push_events(tracker, events):
+            # the tracker wasn't loaded from the store (or the stored
+            # conversation doesn't track restarts yet), replace the document
+            fields = self._tracker_fields(tracker)
+            state = dict(fields, events=[e.as_dict() for e in tracker.events])
+            state[NUM_EVENTS_SINCE_RESTART] = _num_events_since_restart(tracker.events)
+            self.conversations.update_one(
+                {"sender_id": tracker.sender_id}, {"$set": state}, upsert=True
+            )
+            self._remember_stored_fields(tracker, fields)
+        tracker.mark_events_persisted()
+
+    def _tracker_fields(
+        self, tracker: DialogueStateTracker, include_snapshot: bool = True
+    ) -> Dict[Text, Any]:
+        """Return the top level fields of the stored conversation besides the
+        events and the number of events since the latest restart."""
+
+        fields = tracker.current_state()
+        del fields["events"]
+        if self.snapshots and include_snapshot:
+            fields["snapshot"] = self.create_snapshot(tracker)
+        return fields
+
+    def _remember_stored_fields(
+        self, tracker: DialogueStateTracker, fields: Dict[Text, Any]
+    ) -> None:
+        key = id(tracker)
+        if key not in self._stored_fields:
+            # forget the fields before the `id` can be reused
+            weakref.finalize(tracker, self._stored_fields.pop, key, None)
+        self._stored_fields[key] = fields
+
+    def _push_events(self, tracker: DialogueStateTracker, events: List[Event]) -> bool:
+        """Append the new events to the stored conversation and update the
+        top level fields which changed since the tracker was last saved or
+        retrieved.
+
+        Returns `False` if there is no stored conversation which knows the
+        number of events since its latest restart."""
+
+        fields = self._tracker_fields(tracker)
+        stored_fields = self._stored_fields.get(id(tracker), {})
+        changed = {
+            k: v
+            for k, v in fields.items()
+            if k not in stored_fields or stored_fields[k] != v
+        }
+
+        update = {}
+        if changed:
+            update["$set"] = changed
+        if events:
+            update["$push"] = {"events": {"$each": [e.as_dict() for e in events]}}
+            if any(isinstance(e, Restarted) for e in events):
+                update.setdefault("$set", {})[
+                    NUM_EVENTS_SINCE_RESTART
+                ] = _num_events_since_restart(events)
+            else:
+                update["$inc"] = {NUM_EVENTS_SINCE_RESTART: len(events)}
+
+        if not update:
+            # the stored conversation is up to date
+            return True
+
+        result = self.conversations.update_one(
+            {
+                "sender_id": tracker.sender_id,
+                NUM_EVENTS_SINCE_RESTART: {"$exists": True},
+            },
+            update,
+        )
+        if result.matched_count == 0:
+            return False
+
+        self._remember_stored_fields(tracker, fields)
+        return True
+
+    def _find_conversation(self, sender_id: Text) -> Optional[Dict[Text, Any]]:
+        if not self.retrieve_since_restart:
+            return self.conversations.find_one({"sender_id": sender_id})
+
+        # only fetch the events since the latest restart, conversations
+        # which don't track their restarts are fetched completely
+        stored = self.conversations.find_one(
+            {"sender_id": sender_id}, {NUM_EVENTS_SINCE_RESTART: True}
+        )
+        if stored is None or NUM_EVENTS_SINCE_RESTART not in stored:
+            return self.conversations.find_one({"sender_id": sender_id})
 
-        self.conversations.update_one(
-            {"sender_id": tracker.sender_id}, {"$set": state}, upsert=True
+        return self.conversations.find_one(
+            {"sender_id": sender_id},
+            {"events": {"$slice": -stored[NUM_EVENTS_SINCE_RESTART]}},
         )
 
     def retrieve(self, sender_id):
-        stored = self.conversations.find_one({"sender_id": sender_id})
+        stored = self._find_conversation(sender_id)
 
         # look for conversations which have used an `int` sender_id in the past
         # and update them.
@@ -244,9 +812,18 @@ class MongoTrackerStore(TrackerStore):
 
         if stored is not None:
             if self.domain:
-                return DialogueStateTracker.from_dict(
-                    sender_id, stored.get("events"), self.domain.slots
+                # conversations which are only fetched since their latest
+                # restart don't include the snapshot
+                snapshot = stored.get("snapshot") if self.snapshots else None
+                tracker = self.recreate_tracker(
+                    sender_id, deserialise_events(stored.get("events")), snapshot
                 )
+                # the stored snapshot might be outdated, it's updated by the
+                # next save
+                self._remember_stored_fields(
+                    tracker, self._tracker_fields(tracker, include_snapshot=False)
+                )
+                return tracker
             else:
                 logger.warning(
                     "Can't recreate tracker from mongo storage "
@@ -269,9 +846,12 @@ class SQLTrackerStore(TrackerStore):
     Base = declarative_base()
 
     class SQLEvent(Base):
-        from sqlalchemy import Column, Integer, String, Float
+        from sqlalchemy import Column, Index, Integer, String, Float
 
         __tablename__ = "events"
+        __table_args__ = (
+            Index("ix_events_sender_id_timestamp", "sender_id", "timestamp"),
+        )
 
         id = Column(Integer, primary_key=True)
         sender_id = Column(String, nullable=False)
@@ -281,6 +861,14 @@ class SQLTrackerStore(TrackerStore):
         action_name = Column(String)
         data = Column(String)
 
+    class SQLSnapshot(Base):
+        from sqlalchemy import Column, String
+
+        __tablename__ = "snapshots"
+
+        sender_id = Column(String, primary_key=True)
+        data = Column(String)
+
     def __init__(
         self,
         domain: Optional[Domain] = None,
@@ -292,11 +880,15 @@ class SQLTrackerStore(TrackerStore):
         password: Text = None,
         event_broker: Optional[EventChannel] = None,
         login_db: Optional[Text] = None,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        retrieve_since_restart: bool = False,
+        snapshots: bool = False,
+        max_intent_ranking: Optional[int] = None,
     ) -> None:
         import sqlalchemy
         from sqlalchemy.orm import sessionmaker
         from sqlalchemy.engine.url import URL
-        from sqlalchemy import create_engine
 
         engine_url = URL(
             dialect,
@@ -312,10 +904,21 @@ class SQLTrackerStore(TrackerStore):
             'via "{}"'.format(engine_url.__to_string__())
         )
 
+        # SQLite uses its own pool implementations, all other dialects
+        # share a pool of connections between the sessions of this store
+        if dialect == "sqlite":
+            self._engine_kwargs = {}
+        else:
+            self._engine_kwargs = {
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_pre_ping": True,
+            }
+
         # Database might take a while to come up
         while True:
             try:
-                self.engine = create_engine(engine_url)
+                self.engine = self._create_engine(engine_url)
 
                 # if `login_db` has been provided, use current connection with
                 # that database to create working database `db`
@@ -324,6 +927,7 @@ class SQLTrackerStore(TrackerStore):
 
                 try:
                     self.Base.metadata.create_all(self.engine)
+                    self._create_missing_indices()
                 except (
                     sqlalchemy.exc.OperationalError,
                     sqlalchemy.exc.ProgrammingError,
@@ -333,7 +937,7 @@ class SQLTrackerStore(TrackerStore):
                     # the first services finishes the table creation.
                     logger.error("Could not create tables: {}".format(e))
 
-                self.session = sessionmaker(bind=self.engine)()
+                self.sessionmaker = sessionmaker(bind=self.engine)
                 break
             except (
                 sqlalchemy.exc.OperationalError,
@@ -345,17 +949,37 @@ class SQLTrackerStore(TrackerStore):
 
         logger.debug("Connection to SQL database '{}' successful".format(db))
 
-        super(SQLTrackerStore, self).__init__(domain, event_broker)
+        self.retrieve_since_restart = retrieve_since_restart
+        self.snapshots = snapshots
+        super(SQLTrackerStore, self).__init__(domain, event_broker, max_intent_ranking)
+
+    def _create_missing_indices(self) -> None:
+        """Create the indices of the events table if the table already existed,
+        `create_all` doesn't add indices to existing tables."""
+
+        import sqlalchemy
+
+        table = self.SQLEvent.__table__
+        existing = {
+            index["name"]
+            for index in sqlalchemy.inspect(self.engine).get_indexes(table.name)
+        }
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(self.engine)
+
+    def _create_engine(self, engine_url: "URL") -> "Engine":
+        from sqlalchemy import create_engine
+
+        return create_engine(engine_url, **self._engine_kwargs)
 
     def _create_database_and_update_engine(self, db: Text, engine_url: "URL"):
         """Create databse `db` and update engine to reflect the updated
             `engine_url`."""
 
-        from sqlalchemy import create_engine
-
         self._create_database(self.engine, db)
         engine_url.database = db
-        self.engine = create_engine(engine_url)
+        self.engine = self._create_engine(engine_url)
 
     @staticmethod
     def _create_database(engine: "Engine", db: Text):
@@ -380,21 +1004,51 @@ class SQLTrackerStore(TrackerStore):
         cursor.close()
         conn.close()
 
+    @contextlib.contextmanager
+    def session_scope(self) -> Iterator["Session"]:
+        """Provide a transactional scope around a series of operations.
+
+        Every operation gets its own session, so concurrent coroutines and
+        threads never share a session. The connections are pooled by the
+        engine."""
+
+        session = self.sessionmaker()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
     def keys(self) -> Iterable[Text]:
-        sender_ids = self.session.query(self.SQLEvent.sender_id).distinct().all()
-        return [sender_id for (sender_id,) in sender_ids]
+        with self.session_scope() as session:
+            sender_ids = session.query(self.SQLEvent.sender_id).distinct().all()
+            return [sender_id for (sender_id,) in sender_ids]
 
     def retrieve(self, sender_id: Text) -> DialogueStateTracker:
         """Create a tracker from all previously stored events."""
 
-        query = self.session.query(self.SQLEvent)
-        result = query.filter_by(sender_id=sender_id).all()
-        events = [json.loads(event.data) for event in result]
+        with self.session_scope() as session:
+            query = session.query(self.SQLEvent.data).filter_by(sender_id=sender_id)
+            if self.retrieve_since_restart:
+                latest_restart = self._latest_restart_id(session, sender_id)
+                if latest_restart is not None:
+                    query = query.filter(self.SQLEvent.id >= latest_restart)
+            result = query.order_by(self.SQLEvent.id).all()
+            events = [json.loads(data) for (data,) in result]
+
+            snapshot = None
+            if self.snapshots and not self.retrieve_since_restart:
+                snapshot = self._stored_snapshot(session, sender_id)
 
         if self.domain and len(events) > 0:
             logger.debug("Recreating tracker from sender id '{}'".format(sender_id))
 
-            return DialogueStateTracker.from_dict(sender_id, events, self.domain.slots)
+            return self.recreate_tracker(
+                sender_id, deserialise_events(events), snapshot
+            )
         else:
             logger.debug(
                 "Can't retrieve tracker matching"
@@ -402,49 +1056,89 @@ class SQLTrackerStore(TrackerStore):
                 "Returning `None` instead.".format(sender_id)
             )
 
+    def _latest_restart_id(self, session: "Session", sender_id: Text) -> Optional[int]:
+        """Return the id of the latest `Restarted` event of the conversation."""
+
+        from sqlalchemy import func
+
+        return (
+            session.query(func.max(self.SQLEvent.id))
+            .filter_by(sender_id=sender_id, type_name=Restarted.type_name)
+            .scalar()
+        )
+
+    def _stored_snapshot(
+        self, session: "Session", sender_id: Text
+    ) -> Optional[Dict[Text, Any]]:
+        data = (
+            session.query(self.SQLSnapshot.data).filter_by(sender_id=sender_id).scalar()
+        )
+        return json.loads(data) if data else None
+
     def save(self, tracker: DialogueStateTracker) -> None:
         """Update database with events from the current conversation."""
 
         if self.event_broker:
             self.stream_events(tracker)
 
-        events = self._additional_events(tracker)  # only store recent events
-
-        for event in events:
-            data = event.as_dict()
-
-            intent = data.get("parse_data", {}).get("intent", {}).get("name")
-            action = data.get("name")
-            timestamp = data.get("timestamp")
+        with self.session_scope() as session:
+            if self.snapshots:
+                # noinspection PyArgumentList
+                session.merge(
+                    self.SQLSnapshot(
+                        sender_id=tracker.sender_id,
+                        data=json.dumps(self.create_snapshot(tracker)),
+                    )
+                )
 
-            # noinspection PyArgumentList
-            self.session.add(
-                self.SQLEvent(
-                    sender_id=tracker.sender_id,
-                    type_name=event.type_name,
-                    timestamp=timestamp,
-                    intent_name=intent,
-                    action_name=action,
-                    data=json.dumps(data),
+            # only store recent events
+            events = self._additional_events(session, tracker)
+            if events:
+                # `render_nulls` keeps the columns of all rows the same, so
+                # the rows are inserted with a single statement
+                session.bulk_insert_mappings(
+                    self.SQLEvent,
+                    [self._as_row(tracker.sender_id, e) for e in events],
+                    render_nulls=True,
                 )
-            )
-        self.session.commit()
+        tracker.mark_events_persisted()
 
         logger.debug(
             "Tracker with sender_id '{}' "
             "stored to database".format(tracker.sender_id)
         )
 
-    def _additional_events(self, tracker: DialogueStateTracker) -> Iterator:
+    @staticmethod
+    def _as_row(sender_id: Text, event: Event) -> Dict[Text, Any]:
+        data = event.as_dict()
+
+        return {
+            "sender_id": sender_id,
+            "type_name": event.type_name,
+            "timestamp": data.get("timestamp"),
+            "intent_name": data.get("parse_data", {}).get("intent", {}).get("name"),
+            "action_name": data.get("name"),
+            "data": json.dumps(data),
+        }
+
+    def _additional_events(
+        self, session: "Session", tracker: DialogueStateTracker
+    ) -> List[Event]:
         """Return events from the tracker which aren't currently stored."""
 
+        events = tracker.unpersisted_events()
+        if len(events) < len(tracker.events):
+            # the tracker was loaded from the store, so only the unpersisted
+            # events are new
+            return events
+
         from sqlalchemy import func
 
-        query = self.session.query(func.max(self.SQLEvent.timestamp))
+        query = session.query(func.max(self.SQLEvent.timestamp))
         max_timestamp = query.filter_by(sender_id=tracker.sender_id).scalar()
 
         if max_timestamp is None:
-            max_timestamp = 0
+            return events
 
         latest_events = []
 
@@ -454,4 +1148,285 @@ class SQLTrackerStore(TrackerStore):
             else:
                 break
 
-        return reversed(latest_events)
+        return list(reversed(latest_events))
+
+
+class _CachedTracker(object):
+    """Entry of the `CachingTrackerStore`."""
+
+    def __init__(self, tracker: DialogueStateTracker, dirty: bool = False) -> None:
+        self.tracker = tracker
+        # number of events when the tracker was saved or loaded, trackers
+        # with more events were modified without saving them
+        self.num_events = len(tracker.events)
+        self.last_access = time.time()
+        self.last_write = self.last_access if not dirty else 0.0
+        # the tracker has changes which aren't written to the wrapped store
+        self.dirty = dirty
+
+    def mark_written(self) -> None:
+        self.dirty = False
+        self.last_write = time.time()
+
+    def pending_write(
+        self
+    ) -> Tuple[DialogueStateTracker, Optional[DialogueStateTracker]]:
+        """Mark the tracker as written and return it with a copy to write to
+        the wrapped store, the cached tracker might change meanwhile."""
+
+        self.mark_written()
+        return self.tracker, self.tracker.snapshot_copy()
+
+
+class CachingTrackerStore(TrackerStore):
+    """Keeps the recently used trackers in memory in front of another store.
+
+    Cached trackers are returned as they are, without loading, deserialising
+    and replaying their events. At most `max_size` trackers are cached, the
+    least recently used ones are evicted first, as well as trackers which
+    weren't used for `ttl` seconds.
+
+    In the default write-through mode every save is written to the wrapped
+    store. With `write_behind` a tracker is only written to the wrapped
+    store if its last write is older than `flush_interval` seconds, or when
+    it's evicted from the cache or the cache is flushed. These deferred
+    writes save a copy of the tracker, as the cached tracker might change
+    while it's written.
+
+    The cache is local to the process, the wrapped store mustn't be shared
+    with other Rasa processes."""
+
+    def __init__(
+        self,
+        store: TrackerStore,
+        max_size: int = 1000,
+        ttl: Optional[float] = None,
+        write_behind: bool = False,
+        flush_interval: float = 5.0,
+    ) -> None:
+        self.store = store
+        self.max_size = max_size
+        self.ttl = ttl
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict()
+        # evicted trackers with pending changes and their copies, which
+        # still have to be written to the wrapped store
+        self._evicted = []
+        self._lock = threading.RLock()
+        # the wrapped store streams the events to the event broker
+        super(CachingTrackerStore, self).__init__(
+            store.domain, max_intent_ranking=store.max_intent_ranking
+        )
+
+    @property
+    def domain(self) -> Optional[Domain]:
+        return self.store.domain
+
+    @domain.setter
+    def domain(self, domain: Optional[Domain]) -> None:
+        if domain is not self.store.domain:
+            # the cached trackers use the slots of the previous domain
+            self.flush()
+            self.clear()
+        self.store.domain = domain
+
+    @property
+    def max_event_history(self) -> Optional[int]:
+        return self.store.max_event_history
+
+    @max_event_history.setter
+    def max_event_history(self, max_event_history: Optional[int]) -> None:
+        # trackers which aren't cached are retrieved from the wrapped store
+        self.store.max_event_history = max_event_history
+
+    @property
+    def max_intent_ranking(self) -> Optional[int]:
+        return self.store.max_intent_ranking
+
+    @max_intent_ranking.setter
+    def max_intent_ranking(self, max_intent_ranking: Optional[int]) -> None:
+        self.store.max_intent_ranking = max_intent_ranking
+
+    def cache_info(self) -> Dict[Text, int]:
+        """Return the cache statistics, e.g. to monitor the hit rate."""
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._cache),
+                "pending_writes": sum(1 for e in self._cache.values() if e.dirty),
+            }
+
+    def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        tracker = self._get_cached(sender_id)
+        # evicted trackers are written first, as they might be retrieved next
+        self._write_evicted()
+
+        if tracker is None:
+            tracker = self.store.retrieve(sender_id)
+            self._cache_tracker(tracker)
+            self._write_evicted()
+        return tracker
+
+    async def async_retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        tracker = self._get_cached(sender_id)
+        await self._async_write_evicted()
+
+        if tracker is None:
+            tracker = await self.store.async_retrieve(sender_id)
+            self._cache_tracker(tracker)
+            await self._async_write_evicted()
+        return tracker
+
+    def save(self, tracker: DialogueStateTracker) -> None:
+        for write in self._cache_saved_tracker(tracker):
+            self._write(*write)
+
+    async def async_save(self, tracker: DialogueStateTracker) -> None:
+        for write in self._cache_saved_tracker(tracker):
+            await self._async_write(*write)
+
+    def keys(self) -> Iterable[Text]:
+        with self._lock:
+            pending = [k for k, e in self._cache.items() if e.dirty]
+        keys = list(self.store.keys())
+        stored = set(keys)
+        return keys + [k for k in pending if k not in stored]
+
+    def flush(self) -> None:
+        """Write all pending changes of cached trackers to the wrapped store."""
+
+        with self._lock:
+            writes = [e.pending_write() for e in self._cache.values() if e.dirty]
+        for write in writes + self._pop_evicted():
+            self._write(*write)
+
+    def clear(self) -> None:
+        """Drop all cached trackers, pending changes are lost."""
+
+        with self._lock:
+            self._cache.clear()
+
+    def _get_cached(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        with self._lock:
+            self._evict_expired()
+            entry = self._cache.get(sender_id)
+            if entry is not None and len(entry.tracker.events) != entry.num_events:
+                # the tracker was modified, but not saved afterwards (e.g.
+                # because its message couldn't be handled). Pending changes
+                # are written including these events.
+                self._evict(sender_id)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            entry.last_access = time.time()
+            self._cache.move_to_end(sender_id)
+            return entry.tracker
+
+    def _cache_tracker(
+        self, tracker: Optional[DialogueStateTracker], dirty: bool = False
+    ) -> Optional[_CachedTracker]:
+        if tracker is None:
+            return None
+
+        with self._lock:
+            entry = self._cache.get(tracker.sender_id)
+            if entry is not None and entry.tracker is tracker:
+                entry.num_events = len(tracker.events)
+                entry.last_access = time.time()
+                entry.dirty = entry.dirty or dirty
+            else:
+                if entry is not None:
+                    self._evict(tracker.sender_id)
+                entry = _CachedTracker(tracker, dirty)
+                self._cache[tracker.sender_id] = entry
+            self._cache.move_to_end(tracker.sender_id)
+
+            while len(self._cache) > self.max_size:
+                self._evict(next(iter(self._cache)))
+            return entry
+
+    def _cache_saved_tracker(
+        self, tracker: DialogueStateTracker
+    ) -> List[Tuple[DialogueStateTracker, Optional[DialogueStateTracker]]]:
+        """Cache a saved tracker.
+
+        Returns the trackers which have to be written to the wrapped store,
+        together with the copies to write instead for deferred writes."""
+
+        with self._lock:
+            entry = self._cache_tracker(tracker, dirty=self.write_behind)
+            to_write = self._pop_evicted()
+            if not self.write_behind:
+                to_write.append((tracker, None))
+            elif time.time() - entry.last_write >= self.flush_interval:
+                to_write.append(entry.pending_write())
+            return to_write
+
+    def _evict_expired(self) -> None:
+        if self.ttl is None:
+            return
+
+        # the entries are ordered by their last access
+        expired_before = time.time() - self.ttl
+        while self._cache:
+            sender_id, entry = next(iter(self._cache.items()))
+            if entry.last_access >= expired_before:
+                break
+            self._evict(sender_id)
+
+    def _evict(self, sender_id: Text) -> None:
+        entry = self._cache.pop(sender_id)
+        self.evictions += 1
+        if entry.dirty:
+            self._evicted.append(entry.pending_write())
+
+    def _pop_evicted(
+        self
+    ) -> List[Tuple[DialogueStateTracker, Optional[DialogueStateTracker]]]:
+        with self._lock:
+            evicted, self._evicted = self._evicted, []
+            return evicted
+
+    def _write(
+        self, tracker: DialogueStateTracker, copied: Optional[DialogueStateTracker]
+    ) -> None:
+        if copied is None:
+            self.store.save(tracker)
+            return
+
+        num_events = len(copied.unpersisted_events())
+        self.store.save(copied)
+        # events which were added to the cached tracker after it was copied
+        # are still unpersisted
+        tracker.mark_events_persisted(num_events)
+
+    async def _async_write(
+        self, tracker: DialogueStateTracker, copied: Optional[DialogueStateTracker]
+    ) -> None:
+        if copied is None:
+            await self.store.async_save(tracker)
+            return
+
+        num_events = len(copied.unpersisted_events())
+        await self.store.async_save(copied)
+        tracker.mark_events_persisted(num_events)
+
+    def _write_evicted(self) -> None:
+        for write in self._pop_evicted():
+            self._write(*write)
+
+    async def _async_write_evicted(self) -> None:
+        for write in self._pop_evicted():
+            await self._async_write(*write)
@@ -1,10 +1,11 @@
 import copy
+import itertools
 import logging
 import typing
 from collections import deque
 from enum import Enum
 import typing
-from typing import Dict, Text, Any, Optional, Iterator, Type, List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Text, Type
 
 from rasa.core import events
 from rasa.core.actions.action import ACTION_LISTEN_NAME
@@ -76,13 +77,45 @@ class DialogueStateTracker(object):
         evts: List[Event],
         slots: List[Slot],
         max_event_history: Optional[int] = None,
+        max_intent_ranking: Optional[int] = None,
     ):
-        tracker = cls(sender_id, slots, max_event_history)
+        tracker = cls(sender_id, slots, max_event_history, max_intent_ranking)
         for e in evts:
             tracker.update(e)
         return tracker
 
-    def __init__(self, sender_id, slots, max_event_history=None):
+    @classmethod
+    def from_snapshot(
+        cls,
+        sender_id: Text,
+        evts: List[Event],
+        snapshot: Dict[Text, Any],
+        slots: List[Slot],
+        max_event_history: Optional[int] = None,
+        max_intent_ranking: Optional[int] = None,
+    ) -> Optional["DialogueStateTracker"]:
+        """Create a tracker from a snapshot of its state and its events.
+
+        Only the events which were added after the snapshot was taken are
+        replayed. Returns `None` if the snapshot doesn't match the events."""
+
+        num_events = snapshot.get("num_events", 0)
+        if not 0 < num_events <= len(evts) or evts[
+            num_events - 1
+        ].timestamp != snapshot.get("latest_event_time"):
+            return None
+
+        tracker = cls(sender_id, slots, max_event_history, max_intent_ranking)
+        tracker.events.extend(evts[:num_events])
+        tracker._num_unpersisted_events += num_events
+        tracker._restore_snapshot(snapshot)
+        for e in evts[num_events:]:
+            tracker.update(e)
+        return tracker
+
+    def __init__(
+        self, sender_id, slots, max_event_history=None, max_intent_ranking=None
+    ):
         """Initialize the tracker.
 
         A set of events can be stored externally, and we will run through all
@@ -91,6 +124,8 @@ class DialogueStateTracker(object):
 
         # maximum number of events to store
         self._max_event_history = max_event_history
+        # maximum number of intents to store in the ranking of user messages
+        self._max_intent_ranking = max_intent_ranking
         # list of previously seen events
         self.events = self._create_events([])
         # id of the source of the messages
@@ -111,6 +146,13 @@ class DialogueStateTracker(object):
         # Stores the most recent message sent by the user
         self.latest_message = None
         self.latest_bot_utterance = None
+        # incrementally featurized states of the applied events,
+        # see `past_states`
+        self._past_states_cache = None
+        self._unfeaturized_events = []
+        # number of events added since the tracker was last persisted to or
+        # loaded from a tracker store, see `unpersisted_events`
+        self._num_unpersisted_events = 0
         self._reset()
         self.active_form = {}
 
@@ -148,8 +190,34 @@ class DialogueStateTracker(object):
             "latest_action_name": self.latest_action_name,
         }
 
-    def past_states(self, domain) -> deque:
-        """Generate the past states of this tracker based on the history."""
+    def past_states(self, domain, max_history: Optional[int] = None) -> deque:
+        """Generate the past states of this tracker based on the history.
+
+        If `max_history` is set, only the latest `max_history` states are
+        returned.
+
+        The states are cached and only the events which were added since
+        the last call are featurized, unless an event rewrote the history
+        (e.g. a restart or a revert) - in that case all applied events are
+        replayed once to rebuild the cache. The cache keeps as many states
+        as the largest `max_history` it was asked for."""
+
+        cache = self._past_states_cache
+        if cache is None or not cache.covers(domain, max_history):
+            kept_history = max_history
+            if cache is not None and cache.domain is domain:
+                kept_history = _max_history(max_history, cache.max_history)
+            cache = _PastStatesCache(domain, self, kept_history)
+            cache.extend(self.applied_events())
+            self._past_states_cache = cache
+        else:
+            cache.extend(self._unfeaturized_events)
+
+        self._unfeaturized_events = []
+        return cache.past_states(max_history)
+
+    def _past_states_from_history(self, domain) -> deque:
+        """Generate the past states by replaying the whole history."""
 
         generated_states = domain.states_for_tracker_history(self)
         return deque((frozenset(s.items()) for s in generated_states))
@@ -245,7 +313,10 @@ class DialogueStateTracker(object):
         from rasa.core.channels import UserMessage
 
         return DialogueStateTracker(
-            UserMessage.DEFAULT_SENDER_ID, self.slots.values(), self._max_event_history
+            UserMessage.DEFAULT_SENDER_ID,
+            self.slots.values(),
+            self._max_event_history,
+            self._max_intent_ranking,
         )
 
     def generate_all_prior_trackers(self):
@@ -255,68 +326,15 @@ class DialogueStateTracker(object):
         The resulting array is representing
         the trackers before each action."""
 
-        tracker = self.init_copy()
-
-        ignored_trackers = []
-        latest_message = tracker.latest_message
-
-        for i, event in enumerate(self.applied_events()):
-            if isinstance(event, UserUttered):
-                if tracker.active_form.get("name") is None:
-                    # store latest user message before the form
-                    latest_message = event
-
-            elif isinstance(event, Form):
-                # form got either activated or deactivated, so override
-                # tracker's latest message
-                tracker.latest_message = latest_message
-
-            elif isinstance(event, ActionExecuted):
-                # yields the intermediate state
-                if tracker.active_form.get("name") is None:
-                    yield tracker
-
-                elif tracker.active_form.get("rejected"):
-                    for tr in ignored_trackers:
-                        yield tr
-                    ignored_trackers = []
-
-                    if not tracker.active_form.get(
-                        "validate"
-                    ) or event.action_name != tracker.active_form.get("name"):
-                        # persist latest user message
-                        # that was rejected by the form
-                        latest_message = tracker.latest_message
-                    else:
-                        # form was called with validation, so
-                        # override tracker's latest message
-                        tracker.latest_message = latest_message
-
-                    yield tracker
-
-                elif event.action_name != tracker.active_form.get("name"):
-                    # it is not known whether the form will be
-                    # successfully executed, so store this tracker for later
-                    tr = tracker.copy()
-                    # form was called with validation, so
-                    # override tracker's latest message
-                    tr.latest_message = latest_message
-                    ignored_trackers.append(tr)
+        prior_trackers = _PriorTrackers(self.init_copy())
 
-                if event.action_name == tracker.active_form.get("name"):
-                    # the form was successfully executed, so
-                    # remove all stored trackers
-                    ignored_trackers = []
-
-            tracker.update(event)
+        for event in self.applied_events():
+            for tr in prior_trackers.apply(event):
+                yield tr
 
         # yields the final state
-        if tracker.active_form.get("name") is None:
-            yield tracker
-        elif tracker.active_form.get("rejected"):
-            for tr in ignored_trackers:
-                yield tr
-            yield tracker
+        for tr in prior_trackers.final_trackers():
+            yield tr
 
     def applied_events(self) -> List[Event]:
         """Returns all actions that should be applied - w/o reverted events."""
@@ -369,12 +387,53 @@ class DialogueStateTracker(object):
 
         self._reset()
         self.events.extend(dialogue.events)
+        self._num_unpersisted_events += len(dialogue.events)
         self.replay_events()
 
+    def snapshot(self) -> Dict[Text, Any]:
+        """Return the materialized state of the tracker.
+
+        Together with the events of the tracker the snapshot recreates the
+        tracker without replaying the events, see `from_snapshot`."""
+
+        latest_event_time = None
+        if len(self.events) > 0:
+            latest_event_time = self.events[-1].timestamp
+
+        return {
+            "num_events": len(self.events),
+            "latest_event_time": latest_event_time,
+            "slots": self.current_slot_values(),
+            "latest_message": self.latest_message.as_dict(),
+            "latest_bot_utterance": self.latest_bot_utterance.as_dict(),
+            "latest_action_name": self.latest_action_name,
+            "followup_action": self.followup_action,
+            "paused": self._paused,
+            "active_form": copy.deepcopy(self.active_form),
+        }
+
     def copy(self):
         """Creates a duplicate of this tracker"""
         return self.travel_back_in_time(float("inf"))
 
+    def snapshot_copy(self) -> "DialogueStateTracker":
+        """Creates a duplicate of this tracker from its snapshot.
+
+        The events aren't replayed and the duplicate has the same unpersisted
+        events, so a tracker store can persist it while this tracker is
+        changed."""
+
+        tracker = DialogueStateTracker(
+            self.sender_id,
+            self.slots.values(),
+            self._max_event_history,
+            self._max_intent_ranking,
+        )
+        tracker.events.extend(self.events)
+        tracker._restore_snapshot(self.snapshot())
+        tracker._num_unpersisted_events = self._num_unpersisted_events
+        return tracker
+
     def travel_back_in_time(self, target_time: float) -> "DialogueStateTracker":
         """Creates a new tracker with a state at a specific timestamp.
 
@@ -405,9 +464,42 @@ class DialogueStateTracker(object):
         if not isinstance(event, Event):  # pragma: no cover
             raise ValueError("event to log must be an instance of a subclass of Event.")
 
+        if self._max_event_history and len(self.events) >= self._max_event_history:
+            # the oldest event is dropped, which changes the applied events
+            self._invalidate_past_states()
+
+        if self._max_intent_ranking is not None and isinstance(event, UserUttered):
+            event = event.with_intent_ranking_length(self._max_intent_ranking)
+
         self.events.append(event)
+        self._num_unpersisted_events += 1
         event.apply_to(self)
 
+        if self._past_states_cache is not None:
+            self._unfeaturized_events.append(event)
+
+    def unpersisted_events(self) -> List[Event]:
+        """Return the events which were added since the tracker was last
+        persisted to or loaded from a tracker store."""
+
+        num_events = min(self._num_unpersisted_events, len(self.events))
+        return list(itertools.islice(self.events, len(self.events) - num_events, None))
+
+    def mark_events_persisted(self, num_events: Optional[int] = None) -> None:
+        """Mark the events of the tracker as persisted.
+
+        Tracker stores call this after saving or loading the tracker, so
+        the next save only has to store and stream the new events. If
+        `num_events` is given, only the oldest `num_events` unpersisted
+        events are marked, e.g. the ones of a `snapshot_copy`."""
+
+        if num_events is None:
+            self._num_unpersisted_events = 0
+        else:
+            self._num_unpersisted_events = max(
+                0, self._num_unpersisted_events - num_events
+            )
+
     def export_stories(self, e2e=False) -> Text:
         """Dump the tracker as a story in the Rasa Core story format.
 
@@ -487,6 +579,32 @@ class DialogueStateTracker(object):
         self.latest_bot_utterance = BotUttered.empty()
         self.followup_action = ACTION_LISTEN_NAME
         self.active_form = {}
+        # restarts and reverts reset the tracker, after which the
+        # applied events can't be derived incrementally any more
+        self._invalidate_past_states()
+
+    def _restore_snapshot(self, snapshot: Dict[Text, Any]) -> None:
+        """Set the state of the tracker to the one of a snapshot."""
+
+        self._reset_slots()
+        for key, value in snapshot["slots"].items():
+            if key in self.slots:
+                self.slots[key].value = value
+        self._paused = snapshot["paused"]
+        self.latest_action_name = snapshot["latest_action_name"]
+        self.latest_message = Event.from_parameters(snapshot["latest_message"])
+        self.latest_bot_utterance = Event.from_parameters(
+            snapshot["latest_bot_utterance"]
+        )
+        self.followup_action = snapshot["followup_action"]
+        self.active_form = copy.deepcopy(snapshot["active_form"])
+        self._invalidate_past_states()
+
+    def _invalidate_past_states(self) -> None:
+        """Drop the cached past states, they are rebuilt on the next access."""
+
+        self._past_states_cache = None
+        self._unfeaturized_events = []
 
     def _reset_slots(self) -> None:
         """Set all the slots to their initial value."""
@@ -547,3 +665,172 @@ class DialogueStateTracker(object):
             if e["entity"] in self.slots.keys()
         ]
         return new_slots
+
+
+class _PriorTrackers(object):
+    """Replays applied events and collects the trackers before each action.
+
+    This holds the state of `DialogueStateTracker.generate_all_prior_trackers`
+    so that the replay can be continued when new events are applied.
+    `copy_tracker` copies the replayed tracker while a form might reject
+    the action, by default including its events."""
+
+    def __init__(
+        self,
+        tracker: DialogueStateTracker,
+        copy_tracker: Optional[
+            Callable[[DialogueStateTracker], DialogueStateTracker]
+        ] = None,
+    ) -> None:
+        self.tracker = tracker
+        self.copy_tracker = copy_tracker or DialogueStateTracker.copy
+        self.ignored_trackers = []
+        self.latest_message = tracker.latest_message
+
+    def apply(self, event: Event) -> Iterator[DialogueStateTracker]:
+        """Yield the trackers completed by `event` and apply it afterwards.
+
+        The generator must be exhausted, as the event is only applied to the
+        replayed tracker once all prior trackers were yielded."""
+
+        tracker = self.tracker
+
+        if isinstance(event, UserUttered):
+            if tracker.active_form.get("name") is None:
+                # store latest user message before the form
+                self.latest_message = event
+
+        elif isinstance(event, Form):
+            # form got either activated or deactivated, so override
+            # tracker's latest message
+            tracker.latest_message = self.latest_message
+
+        elif isinstance(event, ActionExecuted):
+            # yields the intermediate state
+            if tracker.active_form.get("name") is None:
+                yield tracker
+
+            elif tracker.active_form.get("rejected"):
+                for tr in self.ignored_trackers:
+                    yield tr
+                self.ignored_trackers = []
+
+                if not tracker.active_form.get(
+                    "validate"
+                ) or event.action_name != tracker.active_form.get("name"):
+                    # persist latest user message
+                    # that was rejected by the form
+                    self.latest_message = tracker.latest_message
+                else:
+                    # form was called with validation, so
+                    # override tracker's latest message
+                    tracker.latest_message = self.latest_message
+
+                yield tracker
+
+            elif event.action_name != tracker.active_form.get("name"):
+                # it is not known whether the form will be
+                # successfully executed, so store this tracker for later
+                tr = self.copy_tracker(tracker)
+                # form was called with validation, so
+                # override tracker's latest message
+                tr.latest_message = self.latest_message
+                self.ignored_trackers.append(tr)
+
+            if event.action_name == tracker.active_form.get("name"):
+                # the form was successfully executed, so
+                # remove all stored trackers
+                self.ignored_trackers = []
+
+        tracker.update(event)
+
+    def final_trackers(self) -> Iterator[DialogueStateTracker]:
+        """Yield the trackers representing the current end of the history."""
+
+        tracker = self.tracker
+
+        if tracker.active_form.get("name") is None:
+            yield tracker
+        elif tracker.active_form.get("rejected"):
+            for tr in self.ignored_trackers:
+                yield tr
+            yield tracker
+
+
+def _max_history(*max_histories: Optional[int]) -> Optional[int]:
+    """Return the largest of the histories, `None` stands for all states."""
+
+    if any(h is None for h in max_histories):
+        return None
+    return max(max_histories)
+
+
+def _state_copy(tracker: DialogueStateTracker) -> DialogueStateTracker:
+    """Copy the state of a tracker without its events."""
+
+    copied = tracker.init_copy()
+    copied._restore_snapshot(tracker.snapshot())
+    return copied
+
+
+class _PastStatesCache(object):
+    """Latest `max_history` states of all prior trackers which won't change
+    by appending events (all of them if `max_history` is `None`).
+
+    The events are replayed on a tracker which only keeps its state, not the
+    events themselves."""
+
+    def __init__(
+        self,
+        domain: "Domain",
+        tracker: DialogueStateTracker,
+        max_history: Optional[int] = None,
+    ) -> None:
+        from rasa.core.channels import UserMessage
+
+        self.domain = domain
+        self.max_history = max_history
+        replayed = DialogueStateTracker(
+            UserMessage.DEFAULT_SENDER_ID,
+            tracker.slots.values(),
+            max_event_history=1,
+            max_intent_ranking=tracker._max_intent_ranking,
+        )
+        self.prior_trackers = _PriorTrackers(replayed, _state_copy)
+        self.states = deque(maxlen=max_history)
+
+    def covers(self, domain: "Domain", max_history: Optional[int]) -> bool:
+        """Check if the cache keeps the states for `max_history`."""
+
+        return domain is self.domain and (
+            self.max_history is None
+            or (max_history is not None and max_history <= self.max_history)
+        )
+
+    def _featurize(self, tracker: DialogueStateTracker) -> frozenset:
+        return frozenset(self.domain.get_active_states(tracker).items())
+
+    def extend(self, applied_events: List[Event]) -> None:
+        """Featurize the prior trackers completed by the new events."""
+
+        for event in applied_events:
+            self.states.extend(
+                self._featurize(tr) for tr in self.prior_trackers.apply(event)
+            )
+
+    def past_states(self, max_history: Optional[int] = None) -> deque:
+        """Return the latest `max_history` of the cached states followed by
+        the current final states."""
+
+        final_states = [
+            self._featurize(tr) for tr in self.prior_trackers.final_trackers()
+        ]
+        if max_history is None:
+            return deque(itertools.chain(self.states, final_states))
+
+        # only the needed states are taken from the end of the cached ones
+        num_cached = max(max_history - len(final_states), 0)
+        states = list(itertools.islice(reversed(self.states), num_cached))
+        states.reverse()
+        states.extend(final_states)
+        return deque(states[max(len(states) - max_history, 0) :])
@@ -54,8 +54,11 @@ class TrackerWithCachedStates(DialogueStateTracker):
         # T/F property to filter augmented stories
         self.is_augmented = is_augmented
 
-    def past_states(self, domain: Domain) -> deque:
-        """Return the states of the tracker based on the logged events."""
+    def past_states(self, domain: Domain, max_history: Optional[int] = None) -> deque:
+        """Return the states of the tracker based on the logged events.
+
+        All states are returned regardless of `max_history`, as they are
+        extended with every update."""
 
         # we need to make sure this is the same domain, otherwise things will
         # go south. but really, the same tracker shouldn't be used across
@@ -65,7 +68,7 @@ class TrackerWithCachedStates(DialogueStateTracker):
         # if don't have it cached, we use the domain to calculate the states
         # from the events
         if self._states is None:
-            self._states = super(TrackerWithCachedStates, self).past_states(domain)
+            self._states = self._past_states_from_history(domain)
 
         return self._states
 
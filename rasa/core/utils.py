@@ -8,6 +8,7 @@ import os
 import re
 import sys
 import tempfile
+import warnings
 from pathlib import Path
 from typing import Union
 from asyncio import Future
@@ -16,11 +17,6 @@ from io import StringIO
 from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING, Text, Tuple, Callable
 
 import aiohttp
-from aiohttp import InvalidURL
-from requests.exceptions import InvalidURL
-from sanic import Sanic
-from sanic.request import Request
-from sanic.views import CompositionView
 
 from rasa.utils.endpoints import read_endpoint_config
 
@@ -28,6 +24,8 @@ logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from random import Random
+    from sanic import Sanic
+    from sanic.request import Request
 
 
 def configure_file_logging(loglevel, logfile):
@@ -276,11 +274,12 @@ def read_json_file(filename: Union[Text, Path]) -> Dict:
         return json.load(f)
 
 
-def list_routes(app: Sanic):
+def list_routes(app: "Sanic"):
     """List all the routes of a sanic application.
 
     Mainly used for debugging."""
     from urllib.parse import unquote
+    from sanic.views import CompositionView
 
     output = {}
 
@@ -341,7 +340,7 @@ def cap_length(s, char_limit=20, append_ellipsis=True):
         return s
 
 
-def write_request_body_to_file(request: Request, path: Text):
+def write_request_body_to_file(request: "Request", path: Text):
     """Writes the body of `request` to `path`."""
 
     with open(path, "w+b") as f:
@@ -440,6 +439,7 @@ async def download_file_from_url(url: Text) -> Text:
 
     Returns the file path of the temp file that contains the
     downloaded content."""
+    from requests.exceptions import InvalidURL
     from rasa.nlu import utils as nlu_utils
 
     if not nlu_utils.is_url(url):
@@ -475,8 +475,9 @@ class AvailableEndpoints(object):
             endpoint_file, endpoint_type="tracker_store"
         )
         event_broker = read_endpoint_config(endpoint_file, endpoint_type="event_broker")
+        lock_store = read_endpoint_config(endpoint_file, endpoint_type="lock_store")
 
-        return cls(nlg, nlu, action, model, tracker_store, event_broker)
+        return cls(nlg, nlu, action, model, tracker_store, event_broker, lock_store)
 
     def __init__(
         self,
@@ -486,6 +487,7 @@ class AvailableEndpoints(object):
         model=None,
         tracker_store=None,
         event_broker=None,
+        lock_store=None,
     ):
         self.model = model
         self.action = action
@@ -493,6 +495,7 @@ class AvailableEndpoints(object):
         self.nlg = nlg
         self.tracker_store = tracker_store
         self.event_broker = event_broker
+        self.lock_store = lock_store
 
 
 # noinspection PyProtectedMember
@@ -541,9 +544,18 @@ class LockCounter(asyncio.Lock):
     The counter can be used to discard the lock when there is no coroutine
     waiting for it. For this to work, there should not be any execution yield
     between retrieving the lock and acquiring it, otherwise there might be
-    race conditions."""
+    race conditions.
+
+    Deprecated, conversations are locked with a
+    :class:`rasa.core.lock_store.LockStore`."""
 
     def __init__(self) -> None:
+        warnings.warn(
+            "`LockCounter` is deprecated, use a `rasa.core.lock_store.LockStore` "
+            "to lock conversations instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         super().__init__()
         self.wait_counter = 0
 
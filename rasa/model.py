@@ -1,3 +1,4 @@
+import atexit
 import glob
 import json
 import logging
@@ -6,16 +7,20 @@ import shutil
 import tarfile
 import tempfile
 from _md5 import md5
-from typing import Text, Tuple, Union, Optional, List, Dict, Any
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Set, Text, Tuple, Union
 
 import yaml.parser
 
 import rasa.utils.io
 from rasa.constants import (
     DEFAULT_MODELS_PATH,
+    DEFAULT_MODEL_CACHE_SIZE,
     CONFIG_MANDATORY_KEYS_CORE,
     CONFIG_MANDATORY_KEYS_NLU,
     CONFIG_MANDATORY_KEYS,
+    ENV_MODEL_CACHE_DIRECTORY,
+    ENV_MODEL_CACHE_SIZE,
 )
 
 # Type alias for the fingerprint
@@ -38,6 +43,20 @@ FINGERPRINT_STORIES_KEY = "stories"
 FINGERPRINT_NLU_DATA_KEY = "messages"
 FINGERPRINT_TRAINED_AT_KEY = "trained_at"
 
+# directory of the model cache which maps model archives to the fingerprint
+# of the model they contain
+MODEL_CACHE_ARCHIVES_DIRECTORY = ".archives"
+# prefix of the directories in which models are unpacked before they are
+# moved to the model cache
+MODEL_CACHE_UNPACKING_PREFIX = ".unpacking-"
+# directory of the model cache which marks the models used by a process, so
+# they aren't evicted while they are loaded
+MODEL_CACHE_IN_USE_DIRECTORY = ".in-use"
+
+# temporary directories of models unpacked outside of the model cache, and
+# the processes which unpacked them
+_temporary_model_directories = {}  # type: Dict[Text, int]
+
 
 def get_model(model_path: Text = DEFAULT_MODELS_PATH) -> Optional[Text]:
     """Gets a model and unpacks it.
@@ -130,7 +149,9 @@ def unpack_model(model_file: Text, working_directory: Optional[Text] = None) ->
     Args:
         model_file: Path to zipped model.
         working_directory: Location where the model should be unpacked to.
-                           If `None` a temporary directory will be created.
+                           If `None` the model is unpacked to the model cache
+                           if one is configured, or else to a temporary
+                           directory.
 
     Returns:
         Path to unpacked Rasa model.
@@ -139,7 +160,14 @@ def unpack_model(model_file: Text, working_directory: Optional[Text] = None) ->
     import tarfile
 
     if working_directory is None:
-        working_directory = tempfile.mkdtemp()
+        cache_directory = get_model_cache_directory()
+        if cache_directory:
+            unpacked = _unpack_model_to_cache(
+                lambda: tarfile.open(model_file), cache_directory, model_file
+            )
+            if unpacked:
+                return unpacked
+        working_directory = _temporary_model_directory()
 
     tar = tarfile.open(model_file)
 
@@ -154,6 +182,265 @@ def unpack_model(model_file: Text, working_directory: Optional[Text] = None) ->
     return working_directory
 
 
+def unpack_model_content(content: bytes) -> Text:
+    """Unpacks a downloaded zipped Rasa model.
+
+    Args:
+        content: The zipped model.
+
+    Returns:
+        Path to unpacked Rasa model, which is in the model cache if one is
+        configured.
+    """
+
+    cache_directory = get_model_cache_directory()
+    if cache_directory:
+        try:
+            unpacked = _unpack_model_to_cache(
+                lambda: tarfile.open(fileobj=BytesIO(content)), cache_directory
+            )
+            if unpacked:
+                return unpacked
+        except tarfile.TarError:
+            # other archive formats, e.g. zip files, aren't cached
+            pass
+
+    return rasa.utils.io.unarchive(content, _temporary_model_directory())
+
+
+def get_model_cache_directory() -> Optional[Text]:
+    """Returns the directory of the model cache.
+
+    Unpacked models are only cached if the environment variable
+    `MODEL_CACHE_DIRECTORY` is set.
+    """
+
+    return os.environ.get(ENV_MODEL_CACHE_DIRECTORY) or None
+
+
+def is_cached_model(unpacked_model_path: Text) -> bool:
+    """Checks whether an unpacked model belongs to the model cache."""
+
+    cache_directory = get_model_cache_directory()
+    if not cache_directory:
+        return False
+
+    parent = os.path.dirname(os.path.abspath(unpacked_model_path))
+    return parent == os.path.abspath(cache_directory)
+
+
+def remove_unpacked_model(unpacked_model_path: Text) -> None:
+    """Removes an unpacked model unless it is kept in the model cache.
+
+    Cached models aren't used by this process anymore afterwards, so they
+    can be evicted from the model cache."""
+
+    if is_cached_model(unpacked_model_path):
+        try:
+            os.remove(_in_use_marker(unpacked_model_path))
+        except OSError:
+            pass
+    else:
+        _temporary_model_directories.pop(unpacked_model_path, None)
+        shutil.rmtree(unpacked_model_path, ignore_errors=True)
+
+
+def _temporary_model_directory() -> Text:
+    directory = tempfile.mkdtemp()
+    _temporary_model_directories[directory] = os.getpid()
+    return directory
+
+
+@atexit.register
+def _remove_temporary_model_directories() -> None:
+    """Removes the models which were unpacked to temporary directories and
+    not removed with `remove_unpacked_model`."""
+
+    for directory, pid in list(_temporary_model_directories.items()):
+        # forked processes don't remove the models of their parent
+        if pid == os.getpid():
+            shutil.rmtree(directory, ignore_errors=True)
+    _temporary_model_directories.clear()
+
+
+def _unpack_model_to_cache(
+    open_archive: Callable[[], tarfile.TarFile],
+    cache_directory: Text,
+    model_file: Optional[Text] = None,
+) -> Optional[Text]:
+    """Unpacks a model into the model cache, unless it's already cached.
+
+    The unpacked models are keyed by their fingerprint. Models are unpacked
+    to a temporary directory which is renamed once the model is complete,
+    so other processes never use partially unpacked models.
+
+    Returns:
+        Path to the unpacked model or `None` if the model has no fingerprint.
+    """
+
+    os.makedirs(cache_directory, exist_ok=True)
+
+    # looking up the fingerprint of a known archive avoids decompressing it
+    key = _cached_archive_key(cache_directory, model_file)
+    if key is None or not os.path.isdir(os.path.join(cache_directory, key)):
+        with open_archive() as tar:
+            key = _fingerprint_key(tar)
+        if key is None:
+            return None
+
+    model_directory = os.path.join(cache_directory, key)
+    if os.path.isdir(model_directory):
+        logger.debug("Using cached model '{}'.".format(model_directory))
+    else:
+        unpacking_directory = tempfile.mkdtemp(
+            prefix=MODEL_CACHE_UNPACKING_PREFIX, dir=cache_directory
+        )
+        with open_archive() as tar:
+            tar.extractall(unpacking_directory)
+        try:
+            os.rename(unpacking_directory, model_directory)
+            logger.debug("Extracted model to '{}'.".format(model_directory))
+        except OSError:
+            # another process unpacked the same model in the meantime
+            shutil.rmtree(unpacking_directory, ignore_errors=True)
+
+    # the modification time marks the recently used models
+    os.utime(model_directory)
+    _mark_in_use(model_directory)
+    _cache_archive_key(cache_directory, model_file, key)
+    _evict_cached_models(cache_directory, model_directory)
+
+    return model_directory
+
+
+def _fingerprint_key(tar: tarfile.TarFile) -> Optional[Text]:
+    for member in tar:
+        if os.path.normpath(member.name) == FINGERPRINT_FILE_PATH:
+            return md5(tar.extractfile(member).read()).hexdigest()
+    return None
+
+
+def _archive_marker(cache_directory: Text, model_file: Text) -> Text:
+    stat = os.stat(model_file)
+    archive = "{}:{}:{}".format(
+        os.path.abspath(model_file), stat.st_size, stat.st_mtime
+    )
+    return os.path.join(
+        cache_directory,
+        MODEL_CACHE_ARCHIVES_DIRECTORY,
+        md5(archive.encode("utf-8")).hexdigest(),
+    )
+
+
+def _cached_archive_key(
+    cache_directory: Text, model_file: Optional[Text]
+) -> Optional[Text]:
+    if model_file is None:
+        return None
+
+    marker = _archive_marker(cache_directory, model_file)
+    if os.path.isfile(marker):
+        return rasa.utils.io.read_file(marker)
+    return None
+
+
+def _cache_archive_key(
+    cache_directory: Text, model_file: Optional[Text], key: Text
+) -> None:
+    if model_file is None:
+        return
+
+    marker = _archive_marker(cache_directory, model_file)
+    os.makedirs(os.path.dirname(marker), exist_ok=True)
+    # write the marker atomically, other processes might read it
+    temporary_marker = "{}.{}".format(marker, os.getpid())
+    with open(temporary_marker, "w") as f:
+        f.write(key)
+    os.replace(temporary_marker, marker)
+
+
+def _in_use_marker(model_directory: Text, pid: Optional[int] = None) -> Text:
+    cache_directory, key = os.path.split(os.path.abspath(model_directory))
+    return os.path.join(
+        cache_directory,
+        MODEL_CACHE_IN_USE_DIRECTORY,
+        "{}.{}".format(key, pid or os.getpid()),
+    )
+
+
+def _mark_in_use(model_directory: Text) -> None:
+    """Marks a cached model as used by this process until it's removed with
+    `remove_unpacked_model` or the process exits."""
+
+    marker = _in_use_marker(model_directory)
+    os.makedirs(os.path.dirname(marker), exist_ok=True)
+    open(marker, "w").close()
+
+
+def _process_exists(pid: int) -> bool:
+    if os.name == "nt":
+        # `os.kill` would terminate the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # the process exists, but belongs to another user
+        return True
+    return True
+
+
+def _models_in_use(cache_directory: Text) -> Set[Text]:
+    """Returns the keys of the cached models which are used by a running
+    process and removes the markers of processes which exited."""
+
+    in_use_directory = os.path.join(cache_directory, MODEL_CACHE_IN_USE_DIRECTORY)
+    if not os.path.isdir(in_use_directory):
+        return set()
+
+    in_use = set()
+    for marker in os.listdir(in_use_directory):
+        key, _, pid = marker.rpartition(".")
+        if pid.isdigit() and _process_exists(int(pid)):
+            in_use.add(key)
+        else:
+            try:
+                os.remove(os.path.join(in_use_directory, marker))
+            except OSError:
+                pass
+    return in_use
+
+
+def _evict_cached_models(cache_directory: Text, keep: Text) -> None:
+    """Removes the least recently used models if the cache holds more than
+    `MODEL_CACHE_SIZE` models.
+
+    Models which are used by a running process, e.g. another worker of the
+    server, are never removed, so the cache might hold more models."""
+
+    max_size = int(os.environ.get(ENV_MODEL_CACHE_SIZE, DEFAULT_MODEL_CACHE_SIZE))
+    cached_models = [
+        entry.path
+        for entry in os.scandir(cache_directory)
+        if entry.is_dir() and not entry.name.startswith(".")
+    ]
+    cached_models.sort(key=os.path.getmtime)
+
+    excess = len(cached_models) - max_size
+    if excess <= 0:
+        return
+
+    in_use = _models_in_use(cache_directory)
+    for path in cached_models:
+        if excess <= 0:
+            break
+        if path != keep and os.path.basename(path) not in in_use:
+            logger.debug("Removing model '{}' from the model cache.".format(path))
+            shutil.rmtree(path, ignore_errors=True)
+            excess -= 1
+
+
 def get_model_subdirectories(unpacked_model_path: Text) -> Tuple[Text, Text]:
     """Returns paths for core and nlu model directories.
 
@@ -414,7 +701,9 @@ def should_retrain(new_fingerprint: Fingerprint, old_model: Text, train_path: Te
     if old_model is None or not os.path.exists(old_model):
         return retrain_core, retrain_nlu
 
-    unpacked = unpack_model(old_model)
+    # the old model is unpacked to its own directory, since parts of it are
+    # moved to the new model
+    unpacked = unpack_model(old_model, tempfile.mkdtemp())
     last_fingerprint = fingerprint_from_path(unpacked)
 
     old_core, old_nlu = get_model_subdirectories(unpacked)
@@ -571,9 +571,23 @@ class EmbeddingIntentClassifier(Component):
     ) -> Tuple[np.ndarray, List[float]]:
         """Load tf graph and calculate message similarities"""
 
-        message_sim = self.session.run(
+        return self._calculate_message_sims(X, all_Y)[0]
+
+    # noinspection PyPep8Naming
+    def _calculate_message_sims(
+        self, X: np.ndarray, all_Y: np.ndarray
+    ) -> List[Tuple[np.ndarray, List[float]]]:
+        """Calculate the similarities of all messages in `X` with a single
+        run of the tf graph"""
+
+        message_sims = self.session.run(
             self.sim_op, feed_dict={self.a_in: X, self.b_in: all_Y}
         )
+        return [self._rank_message_sim(message_sim) for message_sim in message_sims]
+
+    def _rank_message_sim(
+        self, message_sim: np.ndarray
+    ) -> Tuple[np.ndarray, List[float]]:
         message_sim = message_sim.flatten()  # sim is a matrix
 
         intent_ids = message_sim.argsort()[::-1]
@@ -593,8 +607,11 @@ class EmbeddingIntentClassifier(Component):
     def process(self, message: "Message", **kwargs: Any) -> None:
         """Return the most likely intent and its similarity to the input."""
 
-        intent = {"name": None, "confidence": 0.0}
-        intent_ranking = []
+        self.process_batch([message], **kwargs)
+
+    def process_batch(self, messages: List["Message"], **kwargs: Any) -> None:
+        """Return the most likely intents of all messages, which are
+        classified with a single run of the tf graph."""
 
         if self.session is None:
             logger.error(
@@ -602,22 +619,31 @@ class EmbeddingIntentClassifier(Component):
                 "component is either not trained or "
                 "didn't receive enough training data"
             )
+            for message in messages:
+                message.set(
+                    "intent", {"name": None, "confidence": 0.0}, add_to_output=True
+                )
+                message.set("intent_ranking", [], add_to_output=True)
+            return
 
-        else:
-            # get features (bag of words) for a message
-            # noinspection PyPep8Naming
-            X = message.get("text_features").reshape(1, -1)
+        # get features (bag of words) for the messages
+        # noinspection PyPep8Naming
+        X = np.stack([message.get("text_features") for message in messages])
+
+        # stack encoded_all_intents on top of each other
+        # to create candidates for test examples
+        # noinspection PyPep8Naming
+        all_Y = self._create_all_Y(X.shape[0])
 
-            # stack encoded_all_intents on top of each other
-            # to create candidates for test examples
-            # noinspection PyPep8Naming
-            all_Y = self._create_all_Y(X.shape[0])
+        # load tf graph and session
+        message_sims = self._calculate_message_sims(X, all_Y)
 
-            # load tf graph and session
-            intent_ids, message_sim = self._calculate_message_sim(X, all_Y)
+        for message, x, (intent_ids, message_sim) in zip(messages, X, message_sims):
+            intent = {"name": None, "confidence": 0.0}
+            intent_ranking = []
 
-            # if X contains all zeros do not predict some label
-            if X.any() and intent_ids.size > 0:
+            # if x contains all zeros do not predict some label
+            if x.any() and intent_ids.size > 0:
                 intent = {
                     "name": self.inv_intent_dict[intent_ids[0]],
                     "confidence": message_sim[0],
@@ -630,8 +656,8 @@ class EmbeddingIntentClassifier(Component):
                     for intent_idx, score in ranking
                 ]
 
-        message.set("intent", intent, add_to_output=True)
-        message.set("intent_ranking", intent_ranking, add_to_output=True)
+            message.set("intent", intent, add_to_output=True)
+            message.set("intent_ranking", intent_ranking, add_to_output=True)
 
     def persist(self, file_name: Text, model_dir: Text) -> Dict[Text, Any]:
         """Persist this model into the passed directory.
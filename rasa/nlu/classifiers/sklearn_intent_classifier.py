@@ -136,18 +136,27 @@ class SklearnIntentClassifier(Component):
     def process(self, message: Message, **kwargs: Any) -> None:
         """Return the most likely intent and its probability for a message."""
 
+        self.process_batch([message], **kwargs)
+
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Return the most likely intents and their probabilities for all
+        messages, which are classified together."""
+
         if not self.clf:
             # component is either not trained or didn't
             # receive enough training data
-            intent = None
-            intent_ranking = []
-        else:
-            X = message.get("text_features").reshape(1, -1)
-            intent_ids, probabilities = self.predict(X)
-            intents = self.transform_labels_num2str(np.ravel(intent_ids))
-            # `predict` returns a matrix as it is supposed
-            # to work for multiple examples as well, hence we need to flatten
-            probabilities = probabilities.flatten()
+            for message in messages:
+                message.set("intent", None, add_to_output=True)
+                message.set("intent_ranking", [], add_to_output=True)
+            return
+
+        X = np.stack([message.get("text_features") for message in messages])
+        all_intent_ids, all_probabilities = self.predict(X)
+
+        for message, intent_ids, probabilities in zip(
+            messages, all_intent_ids, all_probabilities
+        ):
+            intents = self.transform_labels_num2str(intent_ids)
 
             if intents.size > 0 and probabilities.size > 0:
                 ranking = list(zip(list(intents), list(probabilities)))[
@@ -164,8 +173,8 @@ class SklearnIntentClassifier(Component):
                 intent = {"name": None, "confidence": 0.0}
                 intent_ranking = []
 
-        message.set("intent", intent, add_to_output=True)
-        message.set("intent_ranking", intent_ranking, add_to_output=True)
+            message.set("intent", intent, add_to_output=True)
+            message.set("intent_ranking", intent_ranking, add_to_output=True)
 
     def predict_prob(self, X: np.ndarray) -> np.ndarray:
         """Given a bow vector of an input text, predict the intent label.
@@ -190,7 +199,9 @@ class SklearnIntentClassifier(Component):
         # sort the probabilities retrieving the indices of
         # the elements in sorted order
         sorted_indices = np.fliplr(np.argsort(pred_result, axis=1))
-        return sorted_indices, pred_result[:, sorted_indices]
+        # pick the sorted probabilities row by row
+        rows = np.arange(pred_result.shape[0])[:, np.newaxis]
+        return sorted_indices, pred_result[rows, sorted_indices]
 
     def persist(self, file_name: Text, model_dir: Text) -> Optional[Dict[Text, Any]]:
         """Persist this model into the passed directory."""
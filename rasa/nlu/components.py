@@ -181,6 +181,12 @@ class Component(object, metaclass=ComponentMetaclass):
     # This is an important feature for backwards compatibility of components.
     language_list = None
 
+    # Whether the output of the component depends on the time of the
+    # message, e.g. because dates are resolved relative to it. The parse
+    # results of pipelines with such components are only cached for the
+    # same time.
+    time_dependent = False
+
     def __init__(self, component_config: Optional[Dict[Text, Any]] = None) -> None:
 
         if not component_config:
@@ -285,6 +291,17 @@ class Component(object, metaclass=ComponentMetaclass):
         of components previous to this one."""
         pass
 
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Process several incoming messages at once.
+
+        Components which can process several messages faster than one
+        after the other (e.g. with a single run of their model) should
+        overwrite this method, by default every message is processed
+        on its own."""
+
+        for message in messages:
+            self.process(message, **kwargs)
+
     def persist(self, file_name: Text, model_dir: Text) -> Optional[Dict[Text, Any]]:
         """Persist this component to disk for future loading."""
 
@@ -50,6 +50,9 @@ class DucklingHTTPExtractor(EntityExtractor):
 
     provides = ["entities"]
 
+    # dates are resolved relative to the reference time of the message
+    time_dependent = True
+
     defaults = {
         # by default all dimensions recognized by duckling are returned
         # dimensions can be configured to contain an array of strings
@@ -266,6 +266,25 @@ class CountVectorsFeaturizer(Featurizer):
                 "text_features", self._combine_with_existing_text_features(message, bag)
             )
 
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Featurize all messages with a single call of the vectorizer."""
+
+        if self.vectorizer is None:
+            logger.error(
+                "There is no trained CountVectorizer: "
+                "component is either not trained or "
+                "didn't receive enough training data"
+            )
+        else:
+            message_texts = [self._get_message_text(m) for m in messages]
+
+            bags = self.vectorizer.transform(message_texts).toarray()
+            for message, bag in zip(messages, bags):
+                message.set(
+                    "text_features",
+                    self._combine_with_existing_text_features(message, bag),
+                )
+
     def persist(self, file_name: Text, model_dir: Text) -> Optional[Dict[Text, Any]]:
         """Persist this model into the passed directory.
 
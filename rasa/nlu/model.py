@@ -16,6 +16,7 @@ from rasa.nlu.config import RasaNLUModelConfig, component_config_from_pipeline
 from rasa.nlu.persistor import Persistor
 from rasa.nlu.training_data import TrainingData, Message
 from rasa.nlu.utils import create_dir, write_json_to_file
+from rasa.utils.parse_cache import ParseCache
 
 MODEL_NAME_PREFIX = "nlu_"
 
@@ -87,6 +88,12 @@ class Metadata(object):
         else:
             return []
 
+    @property
+    def fingerprint(self) -> Text:
+        """Identifies the trained model, e.g. to key its cached results."""
+
+        return "{}:{}".format(self.model_dir, self.get("trained_at"))
+
     @property
     def number_of_components(self):
         return len(self.get("pipeline", []))
@@ -280,6 +287,7 @@ class Interpreter(object):
         model_dir: Text,
         component_builder: Optional[ComponentBuilder] = None,
         skip_validation: bool = False,
+        cache_size: int = 0,
     ) -> "Interpreter":
         """Create an interpreter based on a persisted model.
 
@@ -290,6 +298,8 @@ class Interpreter(object):
             model_dir: The path of the model to load
             component_builder: The
                 :class:`rasa.nlu.components.ComponentBuilder` to use.
+            cache_size: The number of parse results to cache, results
+                aren't cached if it is `0`.
 
         Returns:
             An interpreter that uses the loaded model.
@@ -298,13 +308,16 @@ class Interpreter(object):
         model_metadata = Metadata.load(model_dir)
 
         Interpreter.ensure_model_compatibility(model_metadata)
-        return Interpreter.create(model_metadata, component_builder, skip_validation)
+        return Interpreter.create(
+            model_metadata, component_builder, skip_validation, cache_size
+        )
 
     @staticmethod
     def create(
         model_metadata: Metadata,
         component_builder: Optional[ComponentBuilder] = None,
         skip_validation: bool = False,
+        cache_size: int = 0,
     ) -> "Interpreter":
         """Load stored model and components defined by the provided metadata."""
 
@@ -338,19 +351,34 @@ class Interpreter(object):
                     "{}".format(component.name, e)
                 )
 
-        return Interpreter(pipeline, context, model_metadata)
+        return Interpreter(pipeline, context, model_metadata, cache_size)
 
     def __init__(
         self,
         pipeline: List[Component],
         context: Optional[Dict[Text, Any]],
         model_metadata: Optional[Metadata] = None,
+        cache_size: int = 0,
     ) -> None:
 
         self.pipeline = pipeline
         self.context = context if context is not None else {}
         self.model_metadata = model_metadata
 
+        self.cache = None  # type: Optional[ParseCache]
+        if cache_size > 0:
+            self.cache = ParseCache(
+                cache_size,
+                self.fingerprint,
+                any(component.time_dependent for component in pipeline),
+            )
+
+    @property
+    def fingerprint(self) -> Optional[Text]:
+        if self.model_metadata is None:
+            return None
+        return self.model_metadata.fingerprint
+
     def parse(
         self,
         text: Text,
@@ -370,6 +398,14 @@ class Interpreter(object):
             output["text"] = ""
             return output
 
+        # only the output properties are cached, the others can be large
+        # objects like the spacy documents of the message
+        use_cache = self.cache is not None and only_output_properties
+        if use_cache:
+            output = self.cache.get(text, time)
+            if output is not None:
+                return output
+
         message = Message(text, self.default_output_attributes(), time=time)
 
         for component in self.pipeline:
@@ -377,4 +413,64 @@ class Interpreter(object):
 
         output = self.default_output_attributes()
         output.update(message.as_dict(only_output_properties=only_output_properties))
+
+        if use_cache:
+            self.cache.set(text, output, time)
         return output
+
+    def parse_batch(
+        self,
+        texts: List[Text],
+        time: Optional[datetime.datetime] = None,
+        only_output_properties: bool = True,
+    ) -> List[Dict[Text, Any]]:
+        """Parse several input texts at once.
+
+        Every component of the pipeline processes all messages together,
+        which is faster than parsing them one after the other for
+        components which implement a batched `process_batch`."""
+
+        if self.cache is None or not only_output_properties:
+            return self._parse_batch(texts, time, only_output_properties)
+
+        # only the texts without cached results are parsed
+        outputs = [self.cache.get(text, time) for text in texts]
+        missing = [i for i, output in enumerate(outputs) if output is None]
+        parsed = self._parse_batch(
+            [texts[i] for i in missing], time, only_output_properties
+        )
+        for i, output in zip(missing, parsed):
+            self.cache.set(texts[i], output, time)
+            outputs[i] = output
+        return outputs
+
+    def _parse_batch(
+        self,
+        texts: List[Text],
+        time: Optional[datetime.datetime],
+        only_output_properties: bool,
+    ) -> List[Dict[Text, Any]]:
+        messages = [
+            Message(text, self.default_output_attributes(), time=time)
+            for text in texts
+            if text
+        ]
+
+        if messages:
+            for component in self.pipeline:
+                component.process_batch(messages, **self.context)
+
+        outputs = []
+        parsed = iter(messages)
+        for text in texts:
+            output = self.default_output_attributes()
+            if text:
+                message = next(parsed)
+                output.update(
+                    message.as_dict(only_output_properties=only_output_properties)
+                )
+            else:
+                # see `parse` for why empty texts aren't processed
+                output["text"] = ""
+            outputs.append(output)
+        return outputs
@@ -1,35 +1,17 @@
 """This is a somewhat delicate package. It contains all registered components
 and preconfigured templates.
 
-Hence, it imports all of the components. To avoid cycles, no component should
-import this in module scope."""
+The components are imported when they are first used, e.g. tensorflow is only
+imported if a pipeline contains the `EmbeddingIntentClassifier`. To avoid
+cycles, no component should import this in module scope."""
 
 import logging
+import sys
 import typing
 from typing import Any, Dict, List, Optional, Text, Type
 
 from rasa.nlu import utils
-from rasa.nlu.classifiers.embedding_intent_classifier import EmbeddingIntentClassifier
-from rasa.nlu.classifiers.keyword_intent_classifier import KeywordIntentClassifier
-from rasa.nlu.classifiers.mitie_intent_classifier import MitieIntentClassifier
-from rasa.nlu.classifiers.sklearn_intent_classifier import SklearnIntentClassifier
-from rasa.nlu.extractors.crf_entity_extractor import CRFEntityExtractor
-from rasa.nlu.extractors.duckling_http_extractor import DucklingHTTPExtractor
-from rasa.nlu.extractors.entity_synonyms import EntitySynonymMapper
-from rasa.nlu.extractors.mitie_entity_extractor import MitieEntityExtractor
-from rasa.nlu.extractors.spacy_entity_extractor import SpacyEntityExtractor
-from rasa.nlu.featurizers.count_vectors_featurizer import CountVectorsFeaturizer
-from rasa.nlu.featurizers.mitie_featurizer import MitieFeaturizer
-from rasa.nlu.featurizers.ngram_featurizer import NGramFeaturizer
-from rasa.nlu.featurizers.regex_featurizer import RegexFeaturizer
-from rasa.nlu.featurizers.spacy_featurizer import SpacyFeaturizer
 from rasa.nlu.model import Metadata
-from rasa.nlu.tokenizers.jieba_tokenizer import JiebaTokenizer
-from rasa.nlu.tokenizers.mitie_tokenizer import MitieTokenizer
-from rasa.nlu.tokenizers.spacy_tokenizer import SpacyTokenizer
-from rasa.nlu.tokenizers.whitespace_tokenizer import WhitespaceTokenizer
-from rasa.nlu.utils.mitie_utils import MitieNLP
-from rasa.nlu.utils.spacy_utils import SpacyNLP
 
 if typing.TYPE_CHECKING:
     from rasa.nlu.components import Component
@@ -38,38 +20,64 @@ if typing.TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-# Classes of all known components. If a new component should be added,
-# its class name should be listed here.
-component_classes = [
+# Module paths of all known components. If a new component should be added,
+# its module path should be listed here.
+component_paths = [
     # utils
-    SpacyNLP,
-    MitieNLP,
+    "rasa.nlu.utils.spacy_utils.SpacyNLP",
+    "rasa.nlu.utils.mitie_utils.MitieNLP",
     # tokenizers
-    MitieTokenizer,
-    SpacyTokenizer,
-    WhitespaceTokenizer,
-    JiebaTokenizer,
+    "rasa.nlu.tokenizers.mitie_tokenizer.MitieTokenizer",
+    "rasa.nlu.tokenizers.spacy_tokenizer.SpacyTokenizer",
+    "rasa.nlu.tokenizers.whitespace_tokenizer.WhitespaceTokenizer",
+    "rasa.nlu.tokenizers.jieba_tokenizer.JiebaTokenizer",
     # extractors
-    SpacyEntityExtractor,
-    MitieEntityExtractor,
-    CRFEntityExtractor,
-    DucklingHTTPExtractor,
-    EntitySynonymMapper,
+    "rasa.nlu.extractors.spacy_entity_extractor.SpacyEntityExtractor",
+    "rasa.nlu.extractors.mitie_entity_extractor.MitieEntityExtractor",
+    "rasa.nlu.extractors.crf_entity_extractor.CRFEntityExtractor",
+    "rasa.nlu.extractors.duckling_http_extractor.DucklingHTTPExtractor",
+    "rasa.nlu.extractors.entity_synonyms.EntitySynonymMapper",
     # featurizers
-    SpacyFeaturizer,
-    MitieFeaturizer,
-    NGramFeaturizer,
-    RegexFeaturizer,
-    CountVectorsFeaturizer,
+    "rasa.nlu.featurizers.spacy_featurizer.SpacyFeaturizer",
+    "rasa.nlu.featurizers.mitie_featurizer.MitieFeaturizer",
+    "rasa.nlu.featurizers.ngram_featurizer.NGramFeaturizer",
+    "rasa.nlu.featurizers.regex_featurizer.RegexFeaturizer",
+    "rasa.nlu.featurizers.count_vectors_featurizer.CountVectorsFeaturizer",
     # classifiers
-    SklearnIntentClassifier,
-    MitieIntentClassifier,
-    KeywordIntentClassifier,
-    EmbeddingIntentClassifier,
+    "rasa.nlu.classifiers.sklearn_intent_classifier.SklearnIntentClassifier",
+    "rasa.nlu.classifiers.mitie_intent_classifier.MitieIntentClassifier",
+    "rasa.nlu.classifiers.keyword_intent_classifier.KeywordIntentClassifier",
+    "rasa.nlu.classifiers.embedding_intent_classifier.EmbeddingIntentClassifier",
 ]
 
-# Mapping from a components name to its class to allow name based lookup.
-registered_components = {c.name: c for c in component_classes}
+# Mapping from a components name to its module path to allow name based lookup.
+registered_component_paths = {p.rpartition(".")[2]: p for p in component_paths}
+
+
+def _load_component_classes() -> Dict[Text, Any]:
+    classes = [utils.class_from_module_path(p) for p in component_paths]
+    return {
+        # Classes of all known components.
+        "component_classes": classes,
+        # Mapping from a components name to its class.
+        "registered_components": {c.name: c for c in classes},
+    }
+
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        if name not in {"component_classes", "registered_components"}:
+            raise AttributeError(
+                "module '{}' has no attribute '{}'".format(__name__, name)
+            )
+        # importing all components is expensive, only do it once
+        globals().update(_load_component_classes())
+        return globals()[name]
+
+
+else:  # pragma: no cover
+    globals().update(_load_component_classes())
 
 # DEPRECATED ensures compatibility, will be remove in future versions
 old_style_names = {
@@ -135,7 +143,7 @@ def pipeline_template(s: Text) -> Optional[List[Dict[Text, Text]]]:
 def get_component_class(component_name: Text) -> Type["Component"]:
     """Resolve component name to a registered components class."""
 
-    if component_name not in registered_components:
+    if component_name not in registered_component_paths:
         if component_name not in old_style_names:
             try:
                 return utils.class_from_module_path(component_name)
@@ -145,7 +153,7 @@ def get_component_class(component_name: Text) -> Type["Component"]:
                     "component name. Check your configured pipeline and make "
                     "sure the mentioned component is not misspelled. If you "
                     "are creating your own component, make sure it is either "
-                    "listed as part of the `component_classes` in "
+                    "listed as part of the `component_paths` in "
                     "`rasa.nlu.registry.py` or is a proper name of a class "
                     "in a module.".format(component_name)
                 )
@@ -159,7 +167,7 @@ def get_component_class(component_name: Text) -> Type["Component"]:
             )
             component_name = old_style_names[component_name]
 
-    return registered_components[component_name]
+    return utils.class_from_module_path(registered_component_paths[component_name])
 
 
 def load_component_by_meta(
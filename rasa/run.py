@@ -1,12 +1,11 @@
 import logging
 import os
-import shutil
 import typing
 from typing import Dict, Text
 
 from rasa.constants import DOCS_BASE_URL
 from rasa.cli.utils import minimal_kwargs, print_warning, print_error
-from rasa.model import get_model
+from rasa.model import get_model, remove_unpacked_model
 
 logger = logging.getLogger(__name__)
 
@@ -65,10 +64,11 @@ def run(
         **kwargs
     )
 
-    shutil.rmtree(model_path)
+    remove_unpacked_model(model_path)
 
 
 def create_agent(model: Text, endpoints: Text = None) -> "Agent":
+    from rasa.core.lock_store import LockStore
     from rasa.core.tracker_store import TrackerStore
     from rasa.core import broker
     from rasa.core.utils import AvailableEndpoints
@@ -80,10 +80,12 @@ def create_agent(model: Text, endpoints: Text = None) -> "Agent":
     _tracker_store = TrackerStore.find_tracker_store(
         None, _endpoints.tracker_store, _broker
     )
+    _lock_store = LockStore.find_lock_store(_endpoints.lock_store)
 
     return Agent.load(
         model,
         generator=_endpoints.nlg,
         tracker_store=_tracker_store,
         action_endpoint=_endpoints.action,
+        lock_store=_lock_store,
     )
@@ -1,10 +1,11 @@
+import json
 import logging
 import os
 import tempfile
 import traceback
 from functools import wraps
 from inspect import isawaitable
-from typing import Any, Callable, List, Optional, Text, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Text, Union
 
 from sanic import Sanic, response
 from sanic.request import Request
@@ -20,11 +21,13 @@ from rasa.constants import (
     MINIMUM_COMPATIBLE_VERSION,
     DEFAULT_MODELS_PATH,
     DEFAULT_DOMAIN_PATH,
+    DEFAULT_PARSE_BATCH_SIZE,
     DOCS_BASE_URL,
 )
 from rasa.core.agent import load_agent, Agent
 from rasa.core.channels import UserMessage, CollectingOutputChannel
 from rasa.core.events import Event
+from rasa.core.lock_store import LockStore
 from rasa.core.test import test
 from rasa.core.trackers import DialogueStateTracker, EventVerbosity
 from rasa.core.utils import dump_obj_as_str_to_file
@@ -175,8 +178,10 @@ def event_verbosity_parameter(
         )
 
 
-def obtain_tracker_store(agent: "Agent", conversation_id: Text) -> DialogueStateTracker:
-    tracker = agent.tracker_store.get_or_create_tracker(conversation_id)
+async def obtain_tracker_store(
+    agent: "Agent", conversation_id: Text
+) -> DialogueStateTracker:
+    tracker = await agent.tracker_store.async_get_or_create_tracker(conversation_id)
     if not tracker:
         raise ErrorResponse(
             409,
@@ -192,6 +197,59 @@ def validate_request_body(request: Request, error_message: Text):
         raise ErrorResponse(400, "BadRequest", error_message)
 
 
+def _parse_batch_messages(
+    request: Request, emulator: NoEmulator
+) -> List[Dict[Text, Any]]:
+    """Normalise the messages of a batch parse request.
+
+    The messages can be texts or objects with a `text`, and optionally a
+    `message_id` and the reference `time` of the message."""
+
+    messages = request.json
+    if isinstance(messages, dict):
+        messages = messages.get("messages")
+    if not isinstance(messages, list):
+        raise ErrorResponse(
+            400,
+            "BadRequest",
+            "Request body has to be a list of messages or an object with "
+            "a list of `messages`.",
+        )
+
+    normalised = []
+    for message in messages:
+        if not isinstance(message, dict):
+            message = {"text": message}
+        try:
+            data = emulator.normalise_request_json(message)
+        except (KeyError, TypeError):
+            raise ErrorResponse(
+                400,
+                "BadRequest",
+                "Every message of the batch needs a `text`.",
+                {"message": message},
+            )
+        data["message_id"] = message.get("message_id")
+        normalised.append(data)
+    return normalised
+
+
+def _parse_batches(
+    messages: List[Dict[Text, Any]], batch_size: int
+) -> Iterator[List[Dict[Text, Any]]]:
+    """Split the messages into batches of at most `batch_size` consecutive
+    messages which have the same reference time."""
+
+    batch = []
+    for message in messages:
+        if batch and (len(batch) >= batch_size or batch[0]["time"] != message["time"]):
+            yield batch
+            batch = []
+        batch.append(message)
+    if batch:
+        yield batch
+
+
 async def authenticate(request: Request):
     raise exceptions.AuthenticationFailed(
         "Direct JWT authentication not supported. You should already have "
@@ -237,9 +295,12 @@ async def _load_agent(
     model_path: Optional[Text] = None,
     model_server: Optional[EndpointConfig] = None,
     remote_storage: Optional[Text] = None,
+    lock_store: Optional[LockStore] = None,
 ) -> Agent:
     try:
-        loaded_agent = await load_agent(model_path, model_server, remote_storage)
+        loaded_agent = await load_agent(
+            model_path, model_server, remote_storage, lock_store=lock_store
+        )
     except Exception as e:
         logger.debug(traceback.format_exc())
         raise ErrorResponse(
@@ -322,6 +383,7 @@ def create_app(
             {
                 "model_file": app.agent.model_directory,
                 "fingerprint": fingerprint_from_path(app.agent.model_directory),
+                "nlu_cache": app.agent.interpreter.cache_info(),
             }
         )
 
@@ -342,7 +404,7 @@ def create_app(
         verbosity = event_verbosity_parameter(request, EventVerbosity.AFTER_RESTART)
         until_time = rasa.utils.endpoints.float_arg(request, "until")
 
-        tracker = obtain_tracker_store(app.agent, conversation_id)
+        tracker = await obtain_tracker_store(app.agent, conversation_id)
 
         try:
             if until_time is not None:
@@ -372,12 +434,12 @@ def create_app(
         evt = Event.from_parameters(request.json)
         verbosity = event_verbosity_parameter(request, EventVerbosity.AFTER_RESTART)
 
-        tracker = obtain_tracker_store(app.agent, conversation_id)
+        tracker = await obtain_tracker_store(app.agent, conversation_id)
 
         if evt:
             try:
                 tracker.update(evt)
-                app.agent.tracker_store.save(tracker)
+                await app.agent.tracker_store.async_save(tracker)
                 return response.json(tracker.current_state(verbosity))
             except Exception as e:
                 logger.debug(traceback.format_exc())
@@ -417,7 +479,7 @@ def create_app(
             )
 
             # will override an existing tracker with the same id!
-            app.agent.tracker_store.save(tracker)
+            await app.agent.tracker_store.async_save(tracker)
             return response.json(tracker.current_state(verbosity))
         except Exception as e:
             logger.debug(traceback.format_exc())
@@ -442,7 +504,7 @@ def create_app(
             )
 
         # retrieve tracker and set to requested state
-        tracker = obtain_tracker_store(app.agent, conversation_id)
+        tracker = await obtain_tracker_store(app.agent, conversation_id)
 
         until_time = rasa.utils.endpoints.float_arg(request, "until")
 
@@ -495,7 +557,7 @@ def create_app(
                 "An unexpected error occurred. Error: {}".format(e),
             )
 
-        tracker = obtain_tracker_store(app.agent, conversation_id)
+        tracker = await obtain_tracker_store(app.agent, conversation_id)
         state = tracker.current_state(verbosity)
         return response.json({"tracker": state, "messages": out.messages})
 
@@ -505,7 +567,7 @@ def create_app(
     async def predict(request: Request, conversation_id: Text):
         try:
             # Fetches the appropriate bot response in a json format
-            responses = app.agent.predict_next(conversation_id)
+            responses = await app.agent.async_predict_next(conversation_id)
             responses["scores"] = sorted(
                 responses["scores"], key=lambda k: (-k["score"], k["action"])
             )
@@ -782,6 +844,57 @@ def create_app(
                 500, "ParsingError", "An unexpected error occurred. Error: {}".format(e)
             )
 
+    @app.post("/model/parse/batch")
+    @requires_auth(app, auth_token)
+    async def parse_batch(request: Request):
+        validate_request_body(
+            request,
+            "No messages defined in request_body. Add a list of messages to "
+            "the request body in order to obtain their intents and entities.",
+        )
+        emulator = _create_emulator(request.args.get("emulation_mode"))
+        try:
+            batch_size = int(request.args.get("batch_size", DEFAULT_PARSE_BATCH_SIZE))
+        except ValueError:
+            batch_size = 0
+        if batch_size < 1:
+            raise ErrorResponse(
+                400,
+                "BadRequest",
+                "Invalid parameter value for 'batch_size'. Should be a positive "
+                "integer.",
+                {"parameter": "batch_size", "in": "query"},
+            )
+
+        messages = _parse_batch_messages(request, emulator)
+        interpreter = app.agent.interpreter
+
+        async def stream(resp):
+            # the results are written as soon as their batch is parsed, one
+            # JSON object per line
+            for batch in _parse_batches(messages, batch_size):
+                try:
+                    results = await interpreter.parse_batch(
+                        [m["text"] for m in batch], batch[0]["time"]
+                    )
+                except Exception as e:
+                    logger.debug(traceback.format_exc())
+                    error = ErrorResponse(
+                        500,
+                        "ParsingError",
+                        "An unexpected error occurred. Error: {}".format(e),
+                    )
+                    await resp.write(json.dumps(error.error_info) + "\n")
+                    return
+
+                for message, result in zip(batch, results):
+                    response_data = emulator.normalise_response_json(result)
+                    if message["message_id"] is not None:
+                        response_data["message_id"] = message["message_id"]
+                    await resp.write(json.dumps(response_data) + "\n")
+
+        return response.stream(stream, content_type="application/x-ndjson")
+
     @app.put("/model")
     @requires_auth(app, auth_token)
     async def load_model(request: Request):
@@ -791,7 +904,12 @@ def create_app(
         model_server = request.json.get("model_server", None)
         remote_storage = request.json.get("remote_storage", None)
 
-        app.agent = await _load_agent(model_path, model_server, remote_storage)
+        # keep the lock store, so conversations stay locked while the model
+        # is replaced
+        lock_store = app.agent.lock_store if app.agent else None
+        app.agent = await _load_agent(
+            model_path, model_server, remote_storage, lock_store
+        )
 
         logger.debug("Successfully loaded model '{}'.".format(model_path))
         return response.json(None, status=204)
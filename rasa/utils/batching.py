@@ -0,0 +1,61 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+
+class Batcher(object):
+    """Collects items which are submitted at about the same time by
+    concurrent coroutines and processes them together.
+
+    A batch is processed once it holds `max_batch_size` items or once its
+    first item waited for `batch_window` seconds, so no item waits longer
+    than `batch_window` seconds for its batch. `process_batch` returns
+    one result per item of the batch."""
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        batch_window: float,
+        max_batch_size: int,
+    ) -> None:
+        self.process_batch = process_batch
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+
+        self._batch = []  # type: List[Tuple[Any, asyncio.Future]]
+        self._timer = None  # type: Optional[asyncio.Handle]
+
+    async def submit(self, item: Any) -> Any:
+        """Add the item to the current batch and return its result once the
+        batch was processed."""
+
+        loop = asyncio.get_event_loop()
+        result = loop.create_future()
+        self._batch.append((item, result))
+
+        if len(self._batch) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_window, self._flush)
+
+        return await result
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._batch = self._batch, []
+        if batch:
+            asyncio.ensure_future(self._process(batch))
+
+    async def _process(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        try:
+            processed = await self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, result in batch:
+                if not result.done():
+                    result.set_exception(e)
+        else:
+            for (_, result), item_result in zip(batch, processed):
+                if not result.done():
+                    result.set_result(item_result)
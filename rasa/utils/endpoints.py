@@ -1,13 +1,19 @@
+import asyncio
 import logging
 import os
 
 import aiohttp
-from typing import Any, Optional, Text, Dict
-
-from sanic.request import Request
+from typing import Any, Optional, Text, Dict, Iterable, TYPE_CHECKING
 
 import rasa.utils.io
-from rasa.constants import DEFAULT_REQUEST_TIMEOUT
+from rasa.constants import (
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_CONNECTION_LIMIT,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from sanic.request import Request
 
 
 logger = logging.getLogger(__name__)
@@ -37,7 +43,11 @@ def read_endpoint_config(
 
 
 class EndpointConfig(object):
-    """Configuration for an external HTTP endpoint."""
+    """Configuration for an external HTTP endpoint.
+
+    Requests to the endpoint share a lazily created session, which keeps
+    up to `connection_limit` connections (`connection_limit_per_host` per
+    host, `0` means no limit) alive for `keepalive_timeout` seconds."""
 
     def __init__(
         self,
@@ -47,6 +57,9 @@ class EndpointConfig(object):
         basic_auth: Dict[Text, Text] = None,
         token: Optional[Text] = None,
         token_name: Text = "token",
+        connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+        connection_limit_per_host: int = 0,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
         **kwargs
     ):
         self.url = url
@@ -55,9 +68,15 @@ class EndpointConfig(object):
         self.basic_auth = basic_auth
         self.token = token
         self.token_name = token_name
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
         self.type = kwargs.pop("store_type", kwargs.pop("type", None))
         self.kwargs = kwargs
 
+        self._session = None
+        self._session_loop = None
+
     @staticmethod
     def _concat_url(base: Text, subpath: Optional[Text]) -> Text:
         """Append a subpath to a base url.
@@ -77,7 +96,7 @@ class EndpointConfig(object):
             subpath = subpath[1:]
         return url + subpath
 
-    def session(self):
+    def _create_session(self) -> aiohttp.ClientSession:
         # create authentication parameters
         if self.basic_auth:
             auth = aiohttp.BasicAuth(
@@ -86,12 +105,45 @@ class EndpointConfig(object):
         else:
             auth = None
 
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+
         return aiohttp.ClientSession(
             headers=self.headers,
             auth=auth,
+            connector=connector,
             timeout=aiohttp.ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT),
         )
 
+    def session(self) -> aiohttp.ClientSession:
+        """Return the session used for requests to this endpoint.
+
+        The session is shared between all requests to keep connections
+        alive - don't close it, use `close_session` instead. A new session
+        is created if the previous one was closed or belongs to another
+        event loop."""
+
+        loop = asyncio.get_event_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            self._session = self._create_session()
+            self._session_loop = loop
+        return self._session
+
+    async def close_session(self) -> None:
+        """Close the shared session and its pooled connections."""
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
     def combine_parameters(self, kwargs=None):
         # construct GET parameters
         params = self.params.copy()
@@ -127,19 +179,18 @@ class EndpointConfig(object):
             del kwargs["headers"]
 
         url = self._concat_url(self.url, subpath)
-        async with self.session() as session:
-            async with session.request(
-                method,
-                url,
-                headers=headers,
-                params=self.combine_parameters(kwargs),
-                **kwargs
-            ) as resp:
-                if resp.status >= 400:
-                    raise ClientResponseError(
-                        resp.status, resp.reason, await resp.content.read()
-                    )
-                return await resp.json()
+        async with self.session().request(
+            method,
+            url,
+            headers=headers,
+            params=self.combine_parameters(kwargs),
+            **kwargs
+        ) as resp:
+            if resp.status >= 400:
+                raise ClientResponseError(
+                    resp.status, resp.reason, await resp.content.read()
+                )
+            return await resp.json()
 
     @classmethod
     def from_dict(cls, data):
@@ -162,6 +213,14 @@ class EndpointConfig(object):
         return not self.__eq__(other)
 
 
+async def close_sessions(endpoints: Iterable[Optional[EndpointConfig]]) -> None:
+    """Close the sessions of all passed endpoints which are configured."""
+
+    for endpoint in endpoints:
+        if endpoint is not None:
+            await endpoint.close_session()
+
+
 class ClientResponseError(aiohttp.ClientError):
     def __init__(self, status, message, text):
         self.status = status
@@ -170,7 +229,7 @@ class ClientResponseError(aiohttp.ClientError):
         super().__init__("{}, {}, body='{}'".format(status, message, text))
 
 
-def bool_arg(request: Request, name: Text, default: bool = True) -> bool:
+def bool_arg(request: "Request", name: Text, default: bool = True) -> bool:
     """Return a passed boolean argument of the request or a default.
 
     Checks the `name` parameter of the request if it contains a valid
@@ -180,7 +239,7 @@ def bool_arg(request: Request, name: Text, default: bool = True) -> bool:
 
 
 def float_arg(
-    request: Request, key: Text, default: Optional[float] = None
+    request: "Request", key: Text, default: Optional[float] = None
 ) -> Optional[float]:
     """Return a passed argument cast as a float or None.
 
@@ -0,0 +1,117 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Text, Tuple
+
+
+class ParseCache(object):
+    """Least recently used cache of the parse results of a NLU model.
+
+    The results are keyed by the text and the fingerprint of the model. If
+    the model contains time dependent components, e.g. the
+    `DucklingHTTPExtractor` which resolves dates relative to the reference
+    time of the message, the results are keyed by the reference time in
+    seconds as well.
+
+    The texts aren't normalized (e.g. stripped or lowercased), as the results
+    contain the text, and the positions and values of the entities within
+    it. Whether the casing matters also depends on the pipeline, e.g. the
+    `CRFEntityExtractor` uses it as a feature.
+
+    If `ttl` is set, the results expire after this many seconds, e.g. if the
+    model might change without the cache being cleared.
+
+    The cache is thread safe, so models which parse messages in a thread
+    pool can share it."""
+
+    def __init__(
+        self,
+        max_size: int,
+        fingerprint: Optional[Hashable] = None,
+        time_dependent: bool = False,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.max_size = max_size
+        self.fingerprint = fingerprint
+        self.time_dependent = time_dependent
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, text: Text, reference_time: Any = None) -> Optional[Tuple]:
+        if not text:
+            return None
+
+        if not self.time_dependent:
+            return self.fingerprint, text, None
+
+        if reference_time is None:
+            reference_time = time.time()
+        try:
+            return self.fingerprint, text, int(reference_time)
+        except (TypeError, ValueError):
+            # the result can't be reused if the time isn't a timestamp
+            return None
+
+    def get(self, text: Text, reference_time: Any = None) -> Optional[Dict[Text, Any]]:
+        """Return a copy of the cached result, `None` if it isn't cached."""
+
+        key = self._key(text, reference_time)
+        if key is None:
+            return None
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._cache[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._cache.move_to_end(key)
+        # callers may modify the results they got
+        return copy.deepcopy(entry[1])
+
+    def set(
+        self, text: Text, result: Dict[Text, Any], reference_time: Any = None
+    ) -> None:
+        """Cache a copy of the result, evicting the least recently used
+        results if the cache is full."""
+
+        key = self._key(text, reference_time)
+        if key is None or self.max_size <= 0:
+            return
+
+        expires = float("inf") if self.ttl is None else time.time() + self.ttl
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._cache[key] = (expires, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached results, e.g. after the model changed."""
+
+        with self._lock:
+            self._cache.clear()
+
+    def cache_info(self) -> Dict[Text, Any]:
+        """Return the cache statistics, e.g. to monitor the hit ratio."""
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._cache),
+                "max_size": self.max_size,
+            }
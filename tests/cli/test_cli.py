@@ -1,5 +1,38 @@
+import subprocess
+import sys
+
 import pytest
 
+# modules which shouldn't be imported just to start the cli
+HEAVY_MODULES = ["tensorflow", "keras", "sklearn", "sqlalchemy", "pkg_resources"]
+
+
+def imported_modules(code):
+    """Return the top level modules imported by `code` and the total
+    import time in seconds, measured with `python -X importtime`."""
+
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+    modules = set()
+    total = 0
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the header of the table
+        modules.add(name.strip().split(".")[0])
+        if not name.startswith("  "):
+            # only top level imports, the nested ones are part of them
+            total += int(cumulative)
+
+    return modules, total / 1e6
+
 
 @pytest.mark.repeat(3)
 def test_cli_start(run):
@@ -14,6 +47,26 @@ def test_cli_start(run):
     assert duration < 3  # startup of cli should not take longer than 3 seconds
 
 
+@pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="'-X importtime' requires Python 3.7"
+)
+def test_cli_start_imports():
+    modules, import_time = imported_modules("import rasa.__main__")
+
+    assert not modules.intersection(HEAVY_MODULES)
+    assert import_time < 1.5
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="lazy imports require Python 3.7")
+def test_registries_import_components_lazily():
+    modules, _ = imported_modules(
+        "import rasa.nlu.registry as r; import rasa.core.policies as p; "
+        "r.get_component_class('WhitespaceTokenizer'); p.MemoizationPolicy"
+    )
+
+    assert not modules.intersection(["tensorflow", "keras", "sklearn"])
+
+
 def test_data_convert_help(run):
     output = run("--help")
 
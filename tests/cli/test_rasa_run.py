@@ -6,7 +6,7 @@ def test_run_help(run):
                 [--cors [CORS [CORS ...]]] [--enable-api]
                 [--remote-storage REMOTE_STORAGE] [--credentials CREDENTIALS]
                 [--connector CONNECTOR] [--jwt-secret JWT_SECRET]
-                [--jwt-method JWT_METHOD]
+                [--jwt-method JWT_METHOD] [--workers WORKERS]
                 {actions} ... [model-as-positional-argument]"""
 
     lines = help_text.split("\n")
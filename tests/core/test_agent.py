@@ -1,6 +1,7 @@
 import asyncio
 from typing import Text
 
+import mock
 import pytest
 from async_generator import async_generator, yield_
 from sanic import Sanic, response
@@ -12,9 +13,11 @@ from tests.core import utilities
 from rasa.core.agent import Agent, load_agent
 from rasa.core.channels.channel import UserMessage
 from rasa.core.domain import InvalidDomain
-from rasa.core.interpreter import INTENT_MESSAGE_PREFIX
+from rasa.core.interpreter import INTENT_MESSAGE_PREFIX, RegexInterpreter
 from rasa.core.policies.memoization import AugmentedMemoizationPolicy
+from rasa.model import get_model
 from rasa.utils.endpoints import EndpointConfig
+from rasa.utils.parse_cache import ParseCache
 
 
 @pytest.fixture(scope="session")
@@ -111,6 +114,48 @@ def test_agent_wrong_use_of_load(tmpdir, default_domain):
         agent.load(training_data_file)
 
 
+def test_agent_prediction_batcher(default_domain, monkeypatch):
+    agent = Agent(default_domain, policies=[AugmentedMemoizationPolicy()])
+    assert agent.prediction_batcher is None
+
+    monkeypatch.setenv("PREDICTION_BATCH_WINDOW", "0.01")
+    monkeypatch.setenv("MAX_PREDICTION_BATCH_SIZE", "8")
+    agent = Agent(default_domain, policies=[AugmentedMemoizationPolicy()])
+
+    assert agent.prediction_batcher.batch_window == 0.01
+    assert agent.prediction_batcher.max_batch_size == 8
+    assert agent.create_processor().prediction_batcher is agent.prediction_batcher
+
+
+def test_agent_update_model_clears_parse_cache(default_domain):
+    interpreter = RegexInterpreter()
+    interpreter.cache = ParseCache(10)
+    interpreter.cache.set("hello", {"text": "hello"})
+    agent = Agent(
+        default_domain, policies=[AugmentedMemoizationPolicy()], interpreter=interpreter
+    )
+
+    agent.update_model(default_domain, agent.policy_ensemble, None)
+
+    assert agent.interpreter.cache_info()["size"] == 0
+
+
+def test_agent_update_model_closes_previous_interpreter(default_domain):
+    previous = RegexInterpreter()
+    agent = Agent(
+        default_domain, policies=[AugmentedMemoizationPolicy()], interpreter=previous
+    )
+
+    with mock.patch.object(previous, "close") as close:
+        agent.update_model(
+            default_domain, agent.policy_ensemble, None, RegexInterpreter()
+        )
+        close.assert_called_once_with()
+
+        agent.update_model(default_domain, agent.policy_ensemble, None)
+        close.assert_called_once_with()
+
+
 async def test_agent_with_model_server_in_thread(
     model_server, tmpdir, zipped_moodbot_model, moodbot_domain, moodbot_metadata
 ):
@@ -138,6 +183,44 @@ async def test_agent_with_model_server_in_thread(
     jobs.kill_scheduler()
 
 
+async def test_agent_loads_updated_model_in_background(trained_model):
+    agent = Agent()
+    model_directory = get_model(trained_model)
+
+    loading = asyncio.ensure_future(
+        rasa.core.agent._load_and_set_updated_model(agent, model_directory, "new")
+    )
+    ticks = 0
+    while not loading.done():
+        # the previous model is used until the new one is ready
+        assert agent.policy_ensemble is None
+        ticks += 1
+        await asyncio.sleep(0.01)
+    await loading
+
+    # the event loop kept running while the model was loaded
+    assert ticks > 1
+    assert agent.fingerprint == "new"
+    assert agent.is_ready()
+
+
+async def test_agent_keeps_model_if_updated_model_fails_to_load(
+    trained_model, tmpdir, caplog
+):
+    agent = Agent()
+    await rasa.core.agent._load_and_set_updated_model(
+        agent, get_model(trained_model), "old"
+    )
+    broken_model = tmpdir.mkdir("core")
+    broken_model.join("domain.yml").write("intents: [")
+
+    await rasa.core.agent._load_and_set_updated_model(agent, tmpdir.strpath, "broken")
+
+    assert agent.fingerprint == "old"
+    assert agent.is_ready()
+    assert "Failed to load model with fingerprint broken" in caplog.text
+
+
 async def test_wait_time_between_pulls_without_interval(model_server, monkeypatch):
 
     monkeypatch.setattr(
@@ -1,4 +1,8 @@
 import json
+import time
+
+import mock
+import pika
 
 from rasa.core import broker
 from rasa.core.broker import FileProducer, PikaProducer, KafkaProducer
@@ -25,6 +29,68 @@ def test_pika_broker_from_config():
     assert actual.queue == "queue"
 
 
+def _mock_pika_connection(producer, channel, failures=0):
+    """Replace the connection of the producer with a mocked channel."""
+
+    def open_connection():
+        if open_connection.failures > 0:
+            open_connection.failures -= 1
+            raise pika.exceptions.AMQPConnectionError("broker is down")
+        producer.connection = mock.Mock(is_open=True)
+        producer.channel = channel
+
+    open_connection.failures = failures
+    producer._open_connection = open_connection
+
+
+def test_pika_broker_publishes_buffered_events():
+    producer = PikaProducer(
+        "localhost", "username", "password", queue="queue", batch_size=2
+    )
+    channel = mock.Mock()
+    _mock_pika_connection(producer, channel)
+
+    for e in TEST_EVENTS:
+        producer.publish(e.as_dict())
+    producer.close(timeout=10)
+
+    published = [
+        Event.from_parameters(json.loads(args[2]))
+        for args, _ in channel.basic_publish.call_args_list
+    ]
+    assert published == TEST_EVENTS
+
+
+def test_pika_broker_is_closed_at_exit():
+    producer = PikaProducer("localhost", "username", "password", queue="queue")
+    _mock_pika_connection(producer, mock.Mock())
+
+    with mock.patch("atexit.register") as register:
+        producer.publish(TEST_EVENTS[0].as_dict())
+        producer.publish(TEST_EVENTS[1].as_dict())
+    producer.close()
+
+    register.assert_called_once_with(producer.close)
+
+
+def test_pika_broker_reconnects_after_failure():
+    producer = PikaProducer(
+        "localhost", "username", "password", queue="queue", retry_delay=0
+    )
+    channel = mock.Mock()
+    _mock_pika_connection(producer, channel, failures=2)
+
+    producer.publish(TEST_EVENTS[0].as_dict())
+
+    # closing the producer stops retrying, so wait for the event first
+    deadline = time.time() + 10
+    while not channel.basic_publish.called and time.time() < deadline:
+        time.sleep(0.01)
+    producer.close(timeout=10)
+
+    assert channel.basic_publish.call_count == 1
+
+
 def test_no_broker_in_config():
     cfg = read_endpoint_config(DEFAULT_ENDPOINTS_FILE, "event_broker")
 
@@ -110,3 +176,19 @@ def test_kafka_broker_from_config():
     assert actual.sasl_username == expected.sasl_username
     assert actual.sasl_password == expected.sasl_password
     assert actual.topic == expected.topic
+
+
+def test_file_broker_logs_encoded_events(tmpdir):
+    log_file_path = tmpdir.join("events.log").strpath
+
+    actual = broker.from_endpoint_config(
+        EndpointConfig(type="file", path=log_file_path, binary=True, compress=True)
+    )
+    events = [
+        {"sender_id": "myuser", "event": "action", "name": "action_listen"},
+        {"sender_id": "myuser", "event": "user", "text": "hi", "timestamp": 1.5},
+    ]
+    for event in events:
+        actual.publish(event)
+
+    assert list(FileProducer.read_binary_events(log_file_path)) == events
@@ -59,6 +59,70 @@ class ConstantPolicy(Policy):
         return result
 
 
+class FeaturizationRecordingPolicy(ConstantPolicy):
+    def __init__(self, priority: int = None, predict_index: int = None) -> None:
+        super(FeaturizationRecordingPolicy, self).__init__(priority, predict_index)
+        self.featurization = None
+
+    def predict_action_probabilities(self, tracker, domain, featurization=None):
+        self.featurization = featurization
+        return super(FeaturizationRecordingPolicy, self).predict_action_probabilities(
+            tracker, domain
+        )
+
+
+def test_policies_share_featurization():
+    domain = Domain.load("data/test_domains/default.yml")
+    tracker = DialogueStateTracker.from_events("test", [UserUttered("hi")], [])
+
+    first = FeaturizationRecordingPolicy(priority=1, predict_index=0)
+    second = FeaturizationRecordingPolicy(priority=2, predict_index=1)
+    # policies which don't accept a featurization are still supported
+    ensemble = SimplePolicyEnsemble(
+        [first, second, ConstantPolicy(priority=3, predict_index=2)]
+    )
+
+    ensemble.probabilities_using_best_policy(tracker, domain)
+
+    assert first.featurization is not None
+    assert first.featurization is second.featurization
+    assert first.featurization.tracker is tracker
+
+
+class BatchRecordingPolicy(ConstantPolicy):
+    def __init__(self, priority: int = None, predict_index: int = None) -> None:
+        super(BatchRecordingPolicy, self).__init__(priority, predict_index)
+        self.batches = []
+
+    def predict_action_probabilities_batch(self, trackers, domain, featurizations=None):
+        self.batches.append(trackers)
+        return super(BatchRecordingPolicy, self).predict_action_probabilities_batch(
+            trackers, domain, featurizations
+        )
+
+
+def test_policies_predict_batch():
+    domain = Domain.load("data/test_domains/default.yml")
+    trackers = [
+        DialogueStateTracker.from_events(str(i), [UserUttered("hi")], [])
+        for i in range(3)
+    ]
+
+    batched = BatchRecordingPolicy(priority=1, predict_index=0)
+    ensemble = SimplePolicyEnsemble(
+        [batched, ConstantPolicy(priority=2, predict_index=1)]
+    )
+
+    predictions = ensemble.probabilities_using_best_policy_batch(trackers, domain)
+
+    # all trackers are predicted with a single call of the policy
+    assert batched.batches == [trackers]
+    assert predictions == [
+        ensemble.probabilities_using_best_policy(tracker, domain)
+        for tracker in trackers
+    ]
+
+
 def test_policy_priority():
     domain = Domain.load("data/test_domains/default.yml")
     tracker = DialogueStateTracker.from_events("test", [UserUttered("hi")], [])
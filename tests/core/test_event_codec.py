@@ -0,0 +1,144 @@
+import json
+import pickle
+import time
+
+import pytest
+
+from rasa.core.event_codec import EventCodec
+from rasa.core.events import (
+    ActionExecuted,
+    Restarted,
+    SlotSet,
+    UserUttered,
+    deserialise_events,
+)
+from tests.core.conftest import TEST_DIALOGUES
+from tests.core.utilities import read_dialogue_file
+
+
+@pytest.mark.parametrize("filename", TEST_DIALOGUES)
+@pytest.mark.parametrize("compress", [False, True])
+def test_codec_round_trip(filename, compress):
+    codec = EventCodec(compress=compress)
+    events = read_dialogue_file(filename).events
+
+    decoded = codec.decode(codec.encode(events))
+
+    assert decoded == events
+    assert [e.as_dict() for e in decoded] == [e.as_dict() for e in events]
+
+
+def test_codec_keeps_timestamps():
+    now = time.time()
+    events = [
+        ActionExecuted("action_listen", timestamp=now),
+        UserUttered("hi", timestamp=now + 0.25),
+        SlotSet("name", 1.5, timestamp=0.1),
+        ActionExecuted("utter_greet", timestamp=now - 1),
+    ]
+    codec = EventCodec()
+
+    decoded = codec.decode(codec.encode(events))
+
+    assert [e.timestamp for e in decoded] == [e.timestamp for e in events]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_codec_decodes_events_since_restart(compress):
+    now = time.time()
+    events = [
+        ActionExecuted("action_listen", timestamp=now),
+        UserUttered("hi", timestamp=now + 1),
+        Restarted(timestamp=now + 2),
+        ActionExecuted("action_listen", timestamp=now + 3),
+        UserUttered("hi again", timestamp=now + 4),
+    ]
+    codec = EventCodec(compress=compress)
+
+    decoded = codec.decode_since_restart(codec.encode(events))
+
+    assert decoded == events[2:]
+    assert [e.timestamp for e in decoded] == [e.timestamp for e in events[2:]]
+    assert codec.decode_since_restart(codec.encode(events[:2])) == events[:2]
+
+
+def test_codec_decodes_dicts():
+    event = {"sender_id": "myuser", "event": "action", "name": "action_listen"}
+    codec = EventCodec()
+
+    assert codec.decode_dicts(codec.encode_dicts([event])) == [event]
+
+
+def test_codec_rejects_invalid_data():
+    codec = EventCodec()
+    encoded = codec.encode([ActionExecuted("action_listen")])
+
+    with pytest.raises(ValueError):
+        codec.decode(pickle.dumps([]))
+    with pytest.raises(ValueError):
+        codec.decode(encoded[:-3])
+
+
+@pytest.mark.parametrize("filename", TEST_DIALOGUES)
+def test_codec_is_smaller_than_pickle_and_json(filename):
+    events = read_dialogue_file(filename).events
+    # the dialogues are repeated to resemble longer conversations, the
+    # events are recreated from json as they would be by a tracker store
+    dumped = json.dumps([e.as_dict() for e in events * 10])
+    events = deserialise_events(json.loads(dumped))
+
+    encoded = EventCodec().encode(events)
+    pickled = pickle.dumps(events)
+
+    assert len(encoded) < len(pickled)
+    assert len(encoded) < len(dumped)
+    assert len(EventCodec(compress=True).encode(events)) < len(encoded)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("filename", TEST_DIALOGUES)
+def test_codec_benchmark_against_pickle_and_json(filename, record_property):
+    events = read_dialogue_file(filename).events
+    # the dialogues are repeated to resemble longer conversations, which
+    # are restarted before the last repetition
+    dumped = json.dumps([e.as_dict() for e in events * 10])
+    events = deserialise_events(json.loads(dumped))
+    events.insert(len(events) * 9 // 10, Restarted(timestamp=events[-1].timestamp))
+
+    def timed(f, *args):
+        start = time.perf_counter()
+        for _ in range(10):
+            result = f(*args)
+        return result, (time.perf_counter() - start) / 10
+
+    codec = EventCodec()
+    encoded, encode_time = timed(codec.encode, events)
+    decoded, decode_time = timed(codec.decode, encoded)
+    since_restart, decode_since_restart_time = timed(
+        codec.decode_since_restart, encoded
+    )
+    pickled, pickle_time = timed(pickle.dumps, events)
+    _, unpickle_time = timed(pickle.loads, pickled)
+    dumped, json_time = timed(lambda: json.dumps([e.as_dict() for e in events]))
+    _, json_load_time = timed(lambda: deserialise_events(json.loads(dumped)))
+
+    for name, value in [
+        ("codec_bytes", len(encoded)),
+        ("codec_encode_seconds", encode_time),
+        ("codec_decode_seconds", decode_time),
+        ("codec_decode_since_restart_seconds", decode_since_restart_time),
+        ("pickle_bytes", len(pickled)),
+        ("pickle_dump_seconds", pickle_time),
+        ("pickle_load_seconds", unpickle_time),
+        ("json_bytes", len(dumped)),
+        ("json_dump_seconds", json_time),
+        ("json_load_seconds", json_load_time),
+    ]:
+        record_property(name, value)
+
+    assert decoded == events
+    assert since_restart == events[len(events) * 9 // 10 :]
+    assert len(encoded) < len(pickled)
+    assert len(encoded) < len(dumped)
+    # the events before the restart aren't decoded
+    assert decode_since_restart_time < decode_time / 2
@@ -1,7 +1,11 @@
 import pytz
 from datetime import datetime
 import copy
+import pickle
+import time
+import tracemalloc
 
+import mock
 import pytest
 from dateutil import parser
 from rasa.core.events import (
@@ -20,7 +24,9 @@ from rasa.core.events import (
     FollowupAction,
     UserUtteranceReverted,
     AgentUttered,
+    deserialise_events,
 )
+from rasa.core import events, utils
 
 
 @pytest.mark.parametrize(
@@ -227,3 +233,203 @@ def test_json_parse_agent():
     evt = {"event": "agent", "text": "Hey, how are you?"}
     # DOCS END
     assert Event.from_parameters(evt) == AgentUttered("Hey, how are you?")
+
+
+@pytest.fixture
+def custom_event_type_name():
+    type_name = "custom_registered_event"
+    yield type_name
+    # don't leave the custom event in the registry of the other tests
+    events._event_types.pop(type_name, None)
+    events._unknown_event_types.discard(type_name)
+
+
+def test_resolve_by_type_registers_custom_events(custom_event_type_name):
+    class CustomEvent(Event):
+        type_name = custom_event_type_name
+
+    assert Event.resolve_by_type(custom_event_type_name) is CustomEvent
+    assert Event.resolve_by_type("action") is ActionExecuted
+    with pytest.raises(ValueError):
+        Event.resolve_by_type("unknown_event")
+
+
+def test_resolve_by_type_refreshes_registry_once_per_unknown_type():
+    with mock.patch.object(
+        Event, "refresh_registry", wraps=Event.refresh_registry
+    ) as refresh_registry:
+        for _ in range(3):
+            assert Event.resolve_by_type("unknown_event", default=SlotSet) is SlotSet
+            assert Event.resolve_by_type("topic") is None
+
+    assert refresh_registry.call_count <= 1
+
+
+@pytest.mark.benchmark
+def test_deserialise_events_benchmark():
+    events = []
+    for i in range(250):
+        events.extend(
+            [
+                ActionExecuted("action_listen", timestamp=i),
+                UserUttered("hi", {"name": "greet", "confidence": 1.0}, timestamp=i),
+                SlotSet("name", "Peter", timestamp=i),
+                ActionExecuted("utter_greet", timestamp=i),
+            ]
+        )
+    serialised = [e.as_dict() for e in events]
+
+    def resolve_by_walking_subclasses(type_name):
+        # how event classes were resolved before the registry
+        return next(c for c in utils.all_subclasses(Event) if c.type_name == type_name)
+
+    start = time.perf_counter()
+    walked = [resolve_by_walking_subclasses(e["event"]) for e in serialised]
+    walk_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resolved = [Event.resolve_by_type(e["event"]) for e in serialised]
+    registry_time = time.perf_counter() - start
+
+    deserialised = deserialise_events(serialised)
+
+    assert resolved == walked
+    assert deserialised == events
+    assert registry_time < walk_time
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        UserUttered("/greet", {"name": "greet", "confidence": 1.0}, []),
+        SlotSet("my_slot", "value"),
+        Restarted(),
+        ActionExecuted("my_action", "policy_0_MemoizationPolicy", 1.0),
+        BotUttered("my_text", {"my_data": 1}),
+        ReminderScheduled("my_action", datetime.now()),
+    ],
+)
+def test_events_use_slots(event):
+    assert not hasattr(event, "__dict__")
+
+    restored = pickle.loads(pickle.dumps(event))
+    assert restored == event
+    assert restored.as_dict() == event.as_dict()
+    assert copy.deepcopy(event) == event
+
+
+def test_unpickle_events_pickled_with_dict_state():
+    # this is how events were pickled before they had `__slots__`
+    event = ActionExecuted.__new__(ActionExecuted)
+    event.__setstate__(
+        {
+            "action_name": "my_action",
+            "policy": None,
+            "confidence": None,
+            "unpredictable": False,
+            "timestamp": 1,
+        }
+    )
+
+    assert event == ActionExecuted("my_action")
+    assert event.timestamp == 1
+
+
+def test_event_names_are_interned():
+    name = "".join(["my", "_action"])
+
+    assert ActionExecuted(name).action_name is ActionExecuted("my_action").action_name
+
+
+def test_user_uttered_does_not_change_intent_of_caller():
+    intent = {"name": "greet", "confidence": 1.0}
+    parse_data = {"intent": intent, "entities": [], "text": "hi"}
+    event = UserUttered("hi", intent, [], parse_data)
+
+    assert event.intent == intent
+    assert event.intent is not intent
+    assert event.parse_data["intent"] is event.intent
+    assert parse_data["intent"] is intent
+
+
+def test_user_uttered_with_intent_ranking_length():
+    ranking = [{"name": "intent_{}".format(i), "confidence": 0.1} for i in range(10)]
+    parse_data = {"intent": ranking[0], "entities": [], "intent_ranking": ranking}
+    event = UserUttered("hi", ranking[0], [], parse_data, timestamp=1)
+
+    trimmed = event.with_intent_ranking_length(2)
+
+    assert trimmed == event
+    assert trimmed.timestamp == event.timestamp
+    assert trimmed.parse_data["intent_ranking"] == ranking[:2]
+    assert len(event.parse_data["intent_ranking"]) == 10
+    assert event.with_intent_ranking_length(10) is event
+
+
+class _DictEvent(object):
+    """Event with a `__dict__`, like the events before they had `__slots__`."""
+
+    def __init__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+def _conversation():
+    """Create 100 events, 25 turns of a conversation."""
+
+    events = []
+    for i in range(25):
+        ranking = [
+            {"name": "intent_{}".format(j), "confidence": 1.0 / (j + 1)}
+            for j in range(10)
+        ]
+        parse_data = {
+            "intent": dict(ranking[0]),
+            "entities": [],
+            "intent_ranking": ranking,
+            "text": "hello there {}".format(i),
+        }
+        events.extend(
+            [
+                ActionExecuted("action_listen", "policy_0_MemoizationPolicy", 1.0),
+                UserUttered(parse_data["text"], parse_data["intent"], [], parse_data),
+                SlotSet("name", "Peter"),
+                ActionExecuted("utter_greet", "policy_0_MemoizationPolicy", 1.0),
+            ]
+        )
+    return events
+
+
+def _allocated_memory(create):
+    tracemalloc.start()
+    try:
+        created = create()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del created
+    return size
+
+
+@pytest.mark.benchmark
+def test_event_memory_benchmark():
+    num_trackers = 10000
+    before = _allocated_memory(
+        lambda: [
+            [_DictEvent(e.__getstate__()) for e in _conversation()]
+            for _ in range(num_trackers)
+        ]
+    )
+    after = _allocated_memory(lambda: [_conversation() for _ in range(num_trackers)])
+    trimmed = _allocated_memory(
+        lambda: [
+            [
+                e.with_intent_ranking_length(1) if isinstance(e, UserUttered) else e
+                for e in _conversation()
+            ]
+            for _ in range(num_trackers)
+        ]
+    )
+
+    assert after < before
+    assert trimmed < after
@@ -1,8 +1,14 @@
+from rasa.core.actions.action import ACTION_LISTEN_NAME
+from rasa.core.domain import Domain
+from rasa.core.events import ActionExecuted, UserUttered
 from rasa.core.featurizers import (
     TrackerFeaturizer,
     BinarySingleStateFeaturizer,
     LabelTokenizerSingleStateFeaturizer,
+    MaxHistoryTrackerFeaturizer,
+    FeaturizationContext,
 )
+from rasa.core.trackers import DialogueStateTracker
 import numpy as np
 
 
@@ -109,3 +115,52 @@ def test_label_tokenizer_featurizer_handles_probabilistic_intents():
         {"intent_a": 0.5, "prev_b": 0.2, "intent_d": 1.0, "prev_action_listen": 1.0}
     )
     assert (encoded == np.array([0.5, 1.0, 1.5, 0.0, 0.2])).all()
+
+
+def _featurization_tracker(domain):
+    tracker = DialogueStateTracker("default", domain.slots)
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+    tracker.update(UserUttered("/greet", {"name": "greet", "confidence": 1.0}))
+    return tracker
+
+
+def _prepared_featurizer(domain, max_history):
+    featurizer = MaxHistoryTrackerFeaturizer(
+        BinarySingleStateFeaturizer(), max_history=max_history
+    )
+    featurizer.state_featurizer.prepare_from_domain(domain)
+    return featurizer
+
+
+def test_featurization_context_shares_compatible_featurizations():
+    domain = Domain.load("data/test_domains/default.yml")
+    tracker = _featurization_tracker(domain)
+    featurization = FeaturizationContext(tracker, domain)
+
+    first = _prepared_featurizer(domain, max_history=3)
+    second = _prepared_featurizer(domain, max_history=3)
+    other = _prepared_featurizer(domain, max_history=2)
+
+    states = featurization.prediction_states(first)
+    assert states == first.prediction_states([tracker], domain)
+    assert featurization.prediction_states(second) is states
+    assert featurization.prediction_states(other) is not states
+
+    X = featurization.create_X(first)
+    assert (X == first.create_X([tracker], domain)).all()
+    assert featurization.create_X(second) is X
+    assert featurization.create_X(other) is not X
+
+
+def test_featurization_context_is_reset_by_new_events():
+    domain = Domain.load("data/test_domains/default.yml")
+    tracker = _featurization_tracker(domain)
+    featurization = FeaturizationContext(tracker, domain)
+    featurizer = _prepared_featurizer(domain, max_history=3)
+
+    states = featurization.prediction_states(featurizer)
+    tracker.update(ActionExecuted("utter_greet"))
+    updated_states = featurization.prediction_states(featurizer)
+
+    assert updated_states is not states
+    assert updated_states == featurizer.prediction_states([tracker], domain)
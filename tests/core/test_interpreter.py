@@ -1,12 +1,21 @@
+import asyncio
+import gc
+import threading
+import time
+
+import mock
 import pytest
 from aioresponses import aioresponses
 
 from rasa.core.interpreter import (
     INTENT_MESSAGE_PREFIX,
     RasaNLUHttpInterpreter,
+    RasaNLUInterpreter,
     RegexInterpreter,
 )
+from rasa.model import get_model, get_model_subdirectories
 from rasa.utils.endpoints import EndpointConfig
+from rasa.utils.parse_cache import ParseCache
 from tests.utilities import latest_request, json_of_latest_request
 
 
@@ -108,3 +117,270 @@ async def test_http_interpreter():
         }
 
         assert query == response
+
+
+async def test_http_interpreter_caches_parse_results():
+    with aioresponses() as mocked:
+        # the NLU server only answers once
+        mocked.post("https://example.com/parse", payload={"text": "hello"})
+
+        endpoint = EndpointConfig("https://example.com", cache_size=10)
+        interpreter = RasaNLUHttpInterpreter(endpoint=endpoint)
+
+        assert await interpreter.parse("hello") == {"text": "hello"}
+        assert await interpreter.parse("hello") == {"text": "hello"}
+        assert interpreter.cache_info()["hits"] == 1
+
+
+async def test_http_interpreter_cached_results_expire():
+    with aioresponses() as mocked:
+        # the NLU server loads another model after the first message
+        mocked.post("https://example.com/parse", payload={"text": "hello"})
+        mocked.post("https://example.com/parse", payload={"text": "bonjour"})
+
+        endpoint = EndpointConfig("https://example.com", cache_size=10, cache_ttl=60)
+        interpreter = RasaNLUHttpInterpreter(endpoint=endpoint)
+        assert interpreter.cache.ttl == 60
+
+        assert await interpreter.parse("hello") == {"text": "hello"}
+        with mock.patch("time.time", return_value=time.time() + 61):
+            assert await interpreter.parse("hello") == {"text": "bonjour"}
+        assert interpreter.cache_info()["hits"] == 0
+
+
+class SlowInterpreter(object):
+    """Stands in for an NLU pipeline which needs some time per message."""
+
+    def __init__(self, duration):
+        self.duration = duration
+        self.batch_sizes = []
+        self.times = []
+        # number of messages which are parsed at the same time
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def parse(self, text):
+        self._sleep()
+        return {"text": text}
+
+    def parse_batch(self, texts, reference_time=None):
+        # a batch takes about as long as a single message
+        self.batch_sizes.append(len(texts))
+        self.times.append(reference_time)
+        self._sleep()
+        return [{"text": text} for text in texts]
+
+    def _sleep(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.active, self.max_active)
+        time.sleep(self.duration)
+        with self._lock:
+            self.active -= 1
+
+
+def slow_nlu_interpreter(execution_mode, duration=0.05, **kwargs):
+    interpreter = RasaNLUInterpreter(
+        "some/model", lazy_init=True, execution_mode=execution_mode, **kwargs
+    )
+    interpreter.interpreter = SlowInterpreter(duration)
+    return interpreter
+
+
+async def test_nlu_interpreter_parses_in_threads():
+    interpreter = slow_nlu_interpreter("thread", max_workers=4)
+
+    texts = ["message {}".format(i) for i in range(8)]
+    results = await asyncio.gather(*[interpreter.parse(t) for t in texts])
+    interpreter.close()
+
+    assert [r["text"] for r in results] == texts
+    # the messages are parsed by several of the four workers at once
+    assert 1 < interpreter.interpreter.max_active <= 4
+
+
+async def test_nlu_interpreter_limits_pending_messages():
+    interpreter = slow_nlu_interpreter("thread", max_workers=4, max_pending=1)
+
+    await asyncio.gather(*[interpreter.parse("hi") for _ in range(4)])
+    interpreter.close()
+
+    # only one message at a time is handed to the workers
+    assert interpreter.interpreter.max_active == 1
+
+
+async def test_nlu_interpreter_parses_inline_after_close():
+    interpreter = slow_nlu_interpreter("thread", max_workers=4)
+    await interpreter.parse("hi")
+    interpreter.close()
+
+    result = await interpreter.parse("hello")
+
+    assert result["text"] == "hello"
+    # closing the interpreter doesn't start new workers for the closed model
+    assert interpreter._executor is None
+
+
+def test_nlu_interpreter_execution_mode_from_environment(monkeypatch):
+    monkeypatch.setenv("NLU_EXECUTION_MODE", "thread")
+    monkeypatch.setenv("NLU_MAX_WORKERS", "3")
+    interpreter = RasaNLUInterpreter("some/model", lazy_init=True)
+
+    assert interpreter.execution_mode == "thread"
+    assert interpreter.max_workers == 3
+
+    with pytest.raises(ValueError):
+        RasaNLUInterpreter("some/model", lazy_init=True, execution_mode="gpu")
+
+
+async def test_nlu_interpreter_parses_in_processes(trained_nlu_model):
+    _, nlu_model = get_model_subdirectories(get_model(trained_nlu_model))
+    inline = RasaNLUInterpreter(nlu_model)
+    interpreter = RasaNLUInterpreter(nlu_model, execution_mode="process")
+
+    expected = await inline.parse("hello")
+    result = await interpreter.parse("hello")
+    interpreter.close()
+
+    assert interpreter.interpreter is None
+    assert result["intent"] == expected["intent"]
+
+    # the model is loaded in this process to parse messages after the close
+    result = await interpreter.parse("hello")
+    assert interpreter._executor is None
+    assert result["intent"] == expected["intent"]
+
+
+def test_process_interpreter_keeps_latest_model(monkeypatch):
+    from rasa.core import interpreter
+    from rasa.nlu.model import Interpreter
+
+    monkeypatch.setattr(interpreter, "_process_interpreters", {})
+    monkeypatch.setattr(Interpreter, "load", lambda model_directory: model_directory)
+
+    interpreter._process_interpreter("first/model")
+    interpreter._process_interpreter("second/model")
+
+    assert interpreter._process_interpreters == {"second/model": "second/model"}
+
+
+@pytest.mark.parametrize("execution_mode", ["inline", "thread"])
+async def test_nlu_interpreter_batches_messages_within_window(execution_mode):
+    interpreter = slow_nlu_interpreter(execution_mode, duration=0.01, batch_window=0.05)
+
+    texts = ["message {}".format(i) for i in range(5)]
+    results = await asyncio.gather(*[interpreter.parse(t) for t in texts])
+    interpreter.close()
+
+    # the messages were parsed in a single batch and got their own results
+    assert [r["text"] for r in results] == texts
+    assert interpreter.interpreter.batch_sizes == [5]
+
+
+async def test_nlu_interpreter_limits_batch_size():
+    interpreter = slow_nlu_interpreter(
+        "inline", duration=0.01, batch_window=60, max_batch_size=4
+    )
+
+    texts = ["message {}".format(i) for i in range(8)]
+    # full batches don't wait for the end of the batch window
+    results = await asyncio.wait_for(
+        asyncio.gather(*[interpreter.parse(t) for t in texts]), timeout=30
+    )
+
+    assert [r["text"] for r in results] == texts
+    assert interpreter.interpreter.batch_sizes == [4, 4]
+
+
+async def test_nlu_interpreter_batch_errors_reach_all_messages():
+    interpreter = slow_nlu_interpreter("inline", batch_window=0.01)
+    interpreter.interpreter = None  # the model can't be loaded
+
+    results = await asyncio.gather(
+        interpreter.parse("hi"), interpreter.parse("hello"), return_exceptions=True
+    )
+
+    assert all(isinstance(r, Exception) for r in results)
+
+
+async def test_nlu_interpreter_caches_parse_results():
+    interpreter = slow_nlu_interpreter("inline", duration=0.01)
+    interpreter.cache = ParseCache(10)
+
+    await interpreter.parse("hello")
+    await interpreter.parse("hello")
+    results = await interpreter.parse_batch(["hello", "hi", "hello there"])
+
+    assert [r["text"] for r in results] == ["hello", "hi", "hello there"]
+    # only the texts without cached results were parsed
+    assert interpreter.interpreter.batch_sizes == [2]
+    assert interpreter.cache_info()["hits"] == 2
+
+    interpreter.clear_cache()
+    assert interpreter.cache_info()["size"] == 0
+
+
+@pytest.mark.parametrize("execution_mode", ["inline", "thread"])
+async def test_nlu_interpreter_parses_batch_with_reference_time(execution_mode):
+    interpreter = slow_nlu_interpreter(execution_mode, duration=0.01)
+    interpreter.cache = ParseCache(10, time_dependent=True)
+
+    await interpreter.parse_batch(["hello"], 1559000000)
+    await interpreter.parse_batch(["hello"], 1559000000)
+    await interpreter.parse_batch(["hello"], 1559000060)
+    interpreter.close()
+
+    # the results are cached per reference time
+    assert interpreter.interpreter.times == [1559000000, 1559000060]
+
+
+def test_nlu_interpreter_cache_from_environment(trained_nlu_model, monkeypatch):
+    _, nlu_model = get_model_subdirectories(get_model(trained_nlu_model))
+    monkeypatch.setenv("NLU_CACHE_SIZE", "100")
+    interpreter = RasaNLUInterpreter(nlu_model)
+
+    assert interpreter.cache.max_size == 100
+    assert interpreter.cache.fingerprint.startswith(nlu_model)
+    # the pipeline of the model has no time dependent components
+    assert not interpreter.cache.time_dependent
+    assert RasaNLUInterpreter(nlu_model, cache_size=0).cache is None
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("execution_mode", ["inline", "thread"])
+async def test_concurrent_parse_latency_benchmark(execution_mode):
+    interpreter = slow_nlu_interpreter(execution_mode, max_workers=4)
+    latencies = []
+
+    async def parse(text):
+        start = time.perf_counter()
+        await interpreter.parse(text)
+        latencies.append(time.perf_counter() - start)
+
+    async def heartbeat():
+        # measures how long the event loop is blocked by the parsing
+        delays = []
+        for _ in range(10):
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            delays.append(time.perf_counter() - start - 0.01)
+        return max(delays)
+
+    # a garbage collection during the measurement would block the event loop
+    gc.collect()
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        heartbeat(), *[parse("message {}".format(i)) for i in range(8)]
+    )
+    total = time.perf_counter() - start
+    interpreter.close()
+
+    if execution_mode == "inline":
+        # the messages are parsed one after the other on the event loop
+        assert results[0] >= 0.05
+        assert total >= 8 * 0.05
+    else:
+        assert results[0] < 0.05
+        assert total < 8 * 0.05
+        assert max(latencies) < 8 * 0.05
@@ -0,0 +1,220 @@
+import asyncio
+import functools
+import threading
+import time
+
+import fakeredis
+import mock
+import pytest
+import redis
+
+from rasa.core.lock_store import InMemoryLockStore, LockError, LockStore, RedisLockStore
+from rasa.utils.endpoints import EndpointConfig
+
+
+def _fake_redis_lock_store(**kwargs):
+    with mock.patch("redis.StrictRedis", fakeredis.FakeStrictRedis):
+        store = RedisLockStore(**kwargs)
+    store.red.flushall()
+    return store
+
+
+@pytest.fixture(params=["in_memory", "redis"])
+def lock_store(request):
+    if request.param == "redis":
+        return _fake_redis_lock_store()
+    return InMemoryLockStore()
+
+
+def test_tickets_are_served_in_order(lock_store):
+    first = lock_store.issue_ticket("some_id", 10)
+    second = lock_store.issue_ticket("some_id", 10)
+
+    assert first < second
+    assert lock_store.now_serving("some_id") == first
+    assert lock_store.now_serving("other_id") is None
+
+    lock_store.remove_ticket("some_id", first)
+    assert lock_store.now_serving("some_id") == second
+
+    lock_store.remove_ticket("some_id", second)
+    assert not lock_store.is_locked("some_id")
+
+
+def test_expired_tickets_are_skipped(lock_store):
+    first = lock_store.issue_ticket("some_id", 0.01)
+    second = lock_store.issue_ticket("some_id", 10)
+    time.sleep(0.02)
+
+    assert first < second
+    assert lock_store.now_serving("some_id") == second
+
+
+async def test_lock_serializes_conversation(lock_store):
+    handled = []
+
+    async def handle(i):
+        async with lock_store.lock("some_id"):
+            handled.append(("start", i))
+            await asyncio.sleep(0.01)
+            handled.append(("end", i))
+
+    await asyncio.gather(*[handle(i) for i in range(3)])
+
+    # the messages are handled one after the other, in the order they arrived
+    assert handled == [
+        ("start", 0),
+        ("end", 0),
+        ("start", 1),
+        ("end", 1),
+        ("start", 2),
+        ("end", 2),
+    ]
+    assert not lock_store.is_locked("some_id")
+
+
+async def test_lock_is_shared_between_redis_lock_stores():
+    # both stores use the same Redis server, like two processes would
+    server = fakeredis.FakeServer()
+    with mock.patch(
+        "redis.StrictRedis", functools.partial(fakeredis.FakeStrictRedis, server=server)
+    ):
+        stores = [RedisLockStore(), RedisLockStore()]
+
+    async with stores[0].lock("some_id"):
+        assert stores[1].is_locked("some_id")
+        with pytest.raises(LockError):
+            async with stores[1].lock("some_id", wait_timeout=0.05):
+                pass
+
+    async with stores[1].lock("some_id"):
+        assert stores[0].is_locked("some_id")
+
+
+def test_redis_lock_store_queues_tickets_in_order():
+    store = _fake_redis_lock_store()
+    original_get = redis.client.Pipeline.get
+    interleaved = []
+
+    def get(pipeline, key):
+        value = original_get(pipeline, key)
+        if not interleaved:
+            # another process draws a ticket while this one draws its ticket
+            interleaved.append(None)
+            interleaved.append(store.issue_ticket("some_id", 10))
+        return value
+
+    with mock.patch.object(redis.client.Pipeline, "get", get):
+        ticket = store.issue_ticket("some_id", 10)
+
+    assert interleaved == [None, 1]
+    assert ticket == 2
+    assert store.now_serving("some_id") == 1
+
+
+async def test_lock_times_out(lock_store):
+    async with lock_store.lock("some_id"):
+        with pytest.raises(LockError):
+            async with lock_store.lock("some_id", wait_timeout=0.05):
+                pass
+
+    # the ticket of the timed out message doesn't block the conversation
+    async with lock_store.lock("some_id", wait_timeout=0.05):
+        pass
+
+
+async def test_lock_expires_after_lifetime(lock_store):
+    # a ticket which was never removed, e.g. because its process crashed
+    lock_store.issue_ticket("some_id", 0.05)
+
+    async with lock_store.lock("some_id", wait_timeout=1):
+        assert lock_store.is_locked("some_id")
+
+
+async def test_redis_lock_store_checks_less_often_while_waiting():
+    lock_store = _fake_redis_lock_store()
+    lock_store.issue_ticket("some_id", 10)
+    delays = []
+    original_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        delays.append(delay)
+        await original_sleep(delay)
+
+    with mock.patch.object(asyncio, "sleep", sleep):
+        with pytest.raises(LockError):
+            async with lock_store.lock("some_id", wait_timeout=0.5):
+                pass
+
+    assert delays[:4] == [0.01, 0.02, 0.04, 0.08]
+    assert max(delays) == 0.1
+
+
+async def test_redis_lock_store_doesnt_block_event_loop():
+    store = _fake_redis_lock_store()
+    threads = set()
+    now_serving = store.now_serving
+
+    def now_serving_in_thread(conversation_id):
+        threads.add(threading.get_ident())
+        return now_serving(conversation_id)
+
+    store.now_serving = now_serving_in_thread
+    async with store.lock("some_id"):
+        pass
+
+    assert threads and threading.get_ident() not in threads
+
+
+async def test_in_memory_lock_store_wakes_up_waiting_tickets():
+    lock_store = InMemoryLockStore()
+    handled = []
+
+    async def handle(i):
+        async with lock_store.lock("some_id"):
+            handled.append(i)
+            await asyncio.sleep(0)
+
+    with mock.patch.object(asyncio, "sleep", wraps=asyncio.sleep) as sleep:
+        await asyncio.gather(*[handle(i) for i in range(3)])
+
+    assert handled == [0, 1, 2]
+    # the waiting tickets don't poll whether they are served
+    assert all(call[0] == (0,) for call in sleep.call_args_list)
+    assert not lock_store.queues
+
+
+async def test_in_memory_lock_store_wakes_up_when_ticket_expires():
+    lock_store = InMemoryLockStore()
+    lock_store.issue_ticket("some_id", 0.05)
+
+    start = time.time()
+    async with lock_store.lock("some_id"):
+        assert time.time() - start < 0.5
+
+
+def test_in_memory_lock_store_waits_without_timeout_by_default():
+    assert InMemoryLockStore().wait_timeout is None
+
+
+def test_in_memory_lock_store_tickets_dont_expire_by_default():
+    lock_store = InMemoryLockStore()
+    ticket = lock_store.issue_ticket("some_id", lock_store.lock_lifetime)
+
+    with mock.patch("time.time", return_value=time.time() + 24 * 60 * 60):
+        assert lock_store.now_serving("some_id") == ticket
+
+
+def test_find_lock_store():
+    assert isinstance(LockStore.find_lock_store(None), InMemoryLockStore)
+
+    store = LockStore.find_lock_store(EndpointConfig(type="in_memory", wait_timeout=5))
+    assert isinstance(store, InMemoryLockStore)
+    assert store.wait_timeout == 5
+
+    with mock.patch("redis.StrictRedis", fakeredis.FakeStrictRedis):
+        store = LockStore.find_lock_store(
+            EndpointConfig(url="localhost", type="redis", lock_lifetime=30)
+        )
+    assert isinstance(store, RedisLockStore)
+    assert store.lock_lifetime == 30
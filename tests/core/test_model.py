@@ -1,4 +1,7 @@
 import os
+import shutil
+import subprocess
+import sys
 import tempfile
 import time
 from typing import Text, Optional, List
@@ -7,6 +10,7 @@ import pytest
 
 import rasa
 import rasa.data as data
+import rasa.model
 import rasa.core
 import rasa.nlu
 from rasa.constants import DEFAULT_CONFIG_PATH, DEFAULT_DATA_PATH, DEFAULT_DOMAIN_PATH
@@ -24,12 +28,15 @@ from rasa.model import (
     get_latest_model,
     get_model,
     get_model_subdirectories,
+    is_cached_model,
     model_fingerprint,
     nlu_fingerprint_changed,
     Fingerprint,
     should_retrain,
     FINGERPRINT_CONFIG_CORE_KEY,
     FINGERPRINT_CONFIG_NLU_KEY,
+    remove_unpacked_model,
+    unpack_model_content,
 )
 
 
@@ -59,6 +66,107 @@ def test_get_model_from_directory_with_subdirectories(trained_model):
     assert os.path.exists(unpacked_nlu)
 
 
+def _cached_models(cache_directory: Text) -> List[Text]:
+    return [d for d in os.listdir(cache_directory) if not d.startswith(".")]
+
+
+def test_get_model_from_cache(trained_model, tmpdir, monkeypatch):
+    monkeypatch.setenv("MODEL_CACHE_DIRECTORY", tmpdir.strpath)
+
+    unpacked = get_model(trained_model)
+    assert is_cached_model(unpacked)
+    assert os.path.exists(os.path.join(unpacked, "core"))
+
+    # the cached models are keyed by their fingerprint, not the archive
+    copied_model = os.path.join(tempfile.mkdtemp(), "copy.tar.gz")
+    shutil.copy(trained_model, copied_model)
+    assert get_model(trained_model) == unpacked
+    assert get_model(copied_model) == unpacked
+    with open(trained_model, "rb") as f:
+        assert unpack_model_content(f.read()) == unpacked
+
+    remove_unpacked_model(unpacked)
+    assert os.path.exists(unpacked)
+    assert _cached_models(tmpdir.strpath) == [os.path.basename(unpacked)]
+
+
+def test_model_cache_evicts_least_recently_used_models(
+    trained_model, tmpdir, monkeypatch
+):
+    other_model = set_fingerprint(trained_model, _fingerprint(stories=["others"]))
+    monkeypatch.setenv("MODEL_CACHE_DIRECTORY", tmpdir.strpath)
+    monkeypatch.setenv("MODEL_CACHE_SIZE", "1")
+
+    unpacked = get_model(trained_model)
+    # models are only evicted once they aren't used anymore
+    remove_unpacked_model(unpacked)
+    other_unpacked = get_model(other_model)
+
+    assert other_unpacked != unpacked
+    assert _cached_models(tmpdir.strpath) == [os.path.basename(other_unpacked)]
+
+
+def test_model_cache_keeps_models_in_use(trained_model, tmpdir, monkeypatch):
+    other_model = set_fingerprint(trained_model, _fingerprint(stories=["others"]))
+    monkeypatch.setenv("MODEL_CACHE_DIRECTORY", tmpdir.strpath)
+    monkeypatch.setenv("MODEL_CACHE_SIZE", "1")
+
+    unpacked = get_model(trained_model)
+    other_unpacked = get_model(other_model)
+
+    # the first model is still used by this process
+    assert sorted(_cached_models(tmpdir.strpath)) == sorted(
+        [os.path.basename(unpacked), os.path.basename(other_unpacked)]
+    )
+
+
+def test_model_cache_evicts_models_of_exited_processes(
+    trained_model, tmpdir, monkeypatch
+):
+    other_model = set_fingerprint(trained_model, _fingerprint(stories=["others"]))
+    monkeypatch.setenv("MODEL_CACHE_DIRECTORY", tmpdir.strpath)
+    monkeypatch.setenv("MODEL_CACHE_SIZE", "1")
+
+    unpacked = get_model(trained_model)
+    remove_unpacked_model(unpacked)
+    # the model was used by a process which exited without releasing it
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    open(rasa.model._in_use_marker(unpacked, exited.pid), "w").close()
+
+    other_unpacked = get_model(other_model)
+
+    assert _cached_models(tmpdir.strpath) == [os.path.basename(other_unpacked)]
+    assert os.listdir(os.path.join(tmpdir.strpath, ".in-use")) == [
+        os.path.basename(rasa.model._in_use_marker(other_unpacked))
+    ]
+
+
+def test_temporary_models_are_removed_at_exit(trained_model, monkeypatch):
+    monkeypatch.delenv("MODEL_CACHE_DIRECTORY", raising=False)
+    monkeypatch.setattr(rasa.model, "_temporary_model_directories", {})
+
+    unpacked = get_model(trained_model)
+    assert os.path.exists(unpacked)
+    assert not is_cached_model(unpacked)
+
+    rasa.model._remove_temporary_model_directories()
+
+    assert not os.path.exists(unpacked)
+
+
+def test_model_without_fingerprint_is_not_cached(trained_model, tmpdir, monkeypatch):
+    model_without_fingerprint = set_fingerprint(
+        trained_model, _fingerprint(), use_fingerprint=False
+    )
+    monkeypatch.setenv("MODEL_CACHE_DIRECTORY", tmpdir.strpath)
+
+    unpacked = get_model(model_without_fingerprint)
+
+    assert not is_cached_model(unpacked)
+    assert _cached_models(tmpdir.strpath) == []
+
+
 def _fingerprint(
     config: Optional[Text] = None,
     config_nlu: Optional[Text] = None,
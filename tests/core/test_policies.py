@@ -1,3 +1,4 @@
+import time
 from unittest.mock import patch
 
 import numpy as np
@@ -124,6 +125,23 @@ class PolicyTestCollection(object):
             )
             assert predicted_probabilities == actual_probabilities
 
+    async def test_predict_batch(self, trained_policy, default_domain):
+        trackers = await train_trackers(default_domain, augmentation_factor=0)
+        trackers.append(
+            DialogueStateTracker(UserMessage.DEFAULT_SENDER_ID, default_domain.slots)
+        )
+
+        batch = trained_policy.predict_action_probabilities_batch(
+            trackers, default_domain
+        )
+
+        assert len(batch) == len(trackers)
+        for tracker, probabilities in zip(trackers, batch):
+            expected = trained_policy.predict_action_probabilities(
+                tracker, default_domain
+            )
+            assert probabilities == pytest.approx(expected, abs=1e-6)
+
     def test_prediction_on_empty_tracker(self, trained_policy, default_domain):
         tracker = DialogueStateTracker(
             UserMessage.DEFAULT_SENDER_ID, default_domain.slots
@@ -160,6 +178,48 @@ class TestKerasPolicy(PolicyTestCollection):
         p = KerasPolicy(featurizer, priority)
         return p
 
+    async def test_predict_batch_with_single_forward_pass(
+        self, trained_policy, default_domain
+    ):
+        trackers = await train_trackers(default_domain, augmentation_factor=20)
+        trackers = trackers[:64]
+        one_by_one = [
+            trained_policy.predict_action_probabilities(t, default_domain)
+            for t in trackers
+        ]
+
+        with patch.object(
+            trained_policy.model, "predict", wraps=trained_policy.model.predict
+        ) as predict:
+            batched = trained_policy.predict_action_probabilities_batch(
+                trackers, default_domain
+            )
+
+        # the features of the max history featurizer all have the same shape
+        predict.assert_called_once()
+        assert np.allclose(batched, one_by_one)
+
+    @pytest.mark.benchmark
+    async def test_predict_batch_benchmark(
+        self, trained_policy, default_domain, record_property
+    ):
+        trackers = await train_trackers(default_domain, augmentation_factor=20)
+        trackers = trackers[:64]
+        trained_policy.predict_action_probabilities_batch(trackers[:2], default_domain)
+
+        start = time.perf_counter()
+        for tracker in trackers:
+            trained_policy.predict_action_probabilities(tracker, default_domain)
+        one_by_one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        trained_policy.predict_action_probabilities_batch(trackers, default_domain)
+        batched = time.perf_counter() - start
+
+        record_property("one_by_one_seconds", one_by_one)
+        record_property("batched_seconds", batched)
+        assert batched < one_by_one
+
 
 class TestKerasPolicyWithTfConfig(PolicyTestCollection):
     @pytest.fixture(scope="module")
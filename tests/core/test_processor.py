@@ -18,6 +18,7 @@ from rasa.core.events import (
 )
 from rasa.core.interpreter import RasaNLUHttpInterpreter
 from rasa.core.processor import MessageProcessor
+from rasa.utils.batching import Batcher
 from rasa.utils.endpoints import EndpointConfig
 from tests.utilities import json_of_latest_request, latest_request
 
@@ -60,6 +61,16 @@ async def test_parsing(default_processor: MessageProcessor):
     assert parsed["entities"][0]["entity"] == "name"
 
 
+async def test_predict_next(default_processor: MessageProcessor):
+    prediction = default_processor.predict_next("predict")
+    async_prediction = await default_processor.async_predict_next("async_predict")
+
+    assert prediction["scores"] == async_prediction["scores"]
+    assert prediction["policy"] == async_prediction["policy"]
+    assert default_processor.tracker_store.retrieve("predict") is not None
+    assert default_processor.tracker_store.retrieve("async_predict") is not None
+
+
 async def test_http_parsing():
     message = UserMessage("lunch?")
 
@@ -206,3 +217,32 @@ async def test_reminder_restart(
     # retrieve the updated tracker
     t = default_processor.tracker_store.retrieve(sender_id)
     assert len(t.events) == 4  # nothing should have been executed
+
+
+async def test_predictions_of_concurrent_conversations_are_batched(
+    default_processor: MessageProcessor
+):
+    batch_sizes = []
+    policy_ensemble = default_processor.policy_ensemble
+    domain = default_processor.domain
+
+    async def predict(trackers):
+        batch_sizes.append(len(trackers))
+        return policy_ensemble.probabilities_using_best_policy_batch(trackers, domain)
+
+    default_processor.prediction_batcher = Batcher(predict, 0.05, 32)
+    channels = [CollectingOutputChannel() for _ in range(3)]
+
+    await asyncio.gather(
+        *[
+            default_processor.handle_message(
+                UserMessage("/greet", channel, sender_id="sender_{}".format(i))
+            )
+            for i, channel in enumerate(channels)
+        ]
+    )
+
+    # the conversations predicted their actions together
+    assert batch_sizes and all(size == len(channels) for size in batch_sizes)
+    outputs = [[m["text"] for m in channel.messages] for channel in channels]
+    assert outputs[0] and all(output == outputs[0] for output in outputs[1:])
@@ -1,4 +1,11 @@
+import os
+
+import mock
+
 from rasa.core import run
+from rasa.core.constants import DEFAULT_SERVER_PORT
+from rasa.core.utils import AvailableEndpoints
+from rasa.model import get_model
 
 CREDENTIALS_FILE = "examples/moodbot/credentials.yml"
 
@@ -40,3 +47,67 @@ def test_create_single_input_channels_by_class_wo_credentials():
 
     assert len(channels) == 1
     assert channels[0].name() == "rest"
+
+
+def test_serve_application_with_workers(trained_rasa_model, monkeypatch):
+    from sanic import Sanic
+
+    from rasa.constants import ENV_MODEL_CACHE_DIRECTORY
+    from rasa.model import get_model_cache_directory, is_cached_model
+
+    monkeypatch.delenv(ENV_MODEL_CACHE_DIRECTORY, raising=False)
+    runs = []
+
+    def run_app(app, **kwargs):
+        # the workers find the model unpacked in the shared model cache
+        cache_directory = get_model_cache_directory()
+        assert is_cached_model(get_model(trained_rasa_model))
+        runs.append((kwargs, cache_directory))
+
+    monkeypatch.setattr(Sanic, "run", run_app)
+
+    run.serve_application(
+        trained_rasa_model,
+        channel="rasa.core.channels.channel.RestInput",
+        endpoints=AvailableEndpoints(),
+        workers=3,
+    )
+
+    (kwargs, cache_directory), = runs
+    assert kwargs["workers"] == 3
+    # the temporary model cache is removed when the server stops
+    assert not os.path.exists(cache_directory)
+    assert get_model_cache_directory() is None
+
+
+def test_serve_command_line_with_single_worker(monkeypatch):
+    from sanic import Sanic
+
+    runs = []
+    monkeypatch.setattr(Sanic, "run", lambda app, **kwargs: runs.append(kwargs))
+
+    run.serve_application(channel="cmdline", workers=3)
+
+    assert runs == [{"host": "0.0.0.0", "port": DEFAULT_SERVER_PORT}]
+
+
+async def test_close_interpreter_on_server_stop():
+    from sanic import Sanic
+
+    app = Sanic(__name__)
+    app.agent = mock.Mock()
+
+    await run.close_interpreter(app, None)
+
+    app.agent.interpreter.close.assert_called_once_with()
+
+
+async def test_close_event_broker_on_server_stop():
+    from sanic import Sanic
+
+    app = Sanic(__name__)
+    app.event_broker = mock.Mock()
+
+    await run.close_event_broker(app, None)
+
+    app.event_broker.close.assert_called_once_with()
@@ -1,11 +1,25 @@
+import time
+
+import fakeredis
+import mock
+import pytest
+import redis
+
+from rasa.core.actions.action import ACTION_LISTEN_NAME
 from rasa.core.channels import UserMessage
 from rasa.core.domain import Domain
-from rasa.core.events import SlotSet, ActionExecuted, Restarted
+from rasa.core.events import SlotSet, ActionExecuted, Restarted, UserUttered
 from rasa.core.tracker_store import (
     TrackerStore,
     InMemoryTrackerStore,
     RedisTrackerStore,
+    MongoTrackerStore,
+    SQLTrackerStore,
+    CachingTrackerStore,
+    NUM_EVENTS_SINCE_RESTART,
+    _num_events_since_restart,
 )
+from rasa.core.trackers import DialogueStateTracker
 from rasa.utils.endpoints import EndpointConfig, read_endpoint_config
 from tests.core.conftest import DEFAULT_ENDPOINTS_FILE
 
@@ -120,3 +134,840 @@ def test_tracker_store_from_invalid_string(default_domain):
     tracker_store = TrackerStore.find_tracker_store(default_domain, store_config)
 
     assert isinstance(tracker_store, InMemoryTrackerStore)
+
+
+def _fake_redis_tracker_store(domain, **kwargs):
+    with mock.patch("redis.StrictRedis", fakeredis.FakeStrictRedis):
+        store = RedisTrackerStore(domain, **kwargs)
+    store.red.flushall()
+    return store
+
+
+def _append_turn(tracker, text="/greet"):
+    tracker.update(UserUttered(text, {"name": "greet", "confidence": 1.0}))
+    tracker.update(ActionExecuted("utter_greet"))
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+
+
+def test_redis_append_only_store_appends_new_events(default_domain):
+    store = _fake_redis_tracker_store(default_domain, append_only=True)
+    tracker = store.get_or_create_tracker("myuser")
+    assert store.red.llen("myuser") == 1
+
+    _append_turn(tracker)
+    store.save(tracker)
+    assert store.red.llen("myuser") == 4
+
+    retrieved = store.retrieve("myuser")
+    assert retrieved == tracker
+
+    _append_turn(retrieved)
+    store.save(retrieved)
+    assert store.red.llen("myuser") == 7
+    assert store.retrieve("myuser") == retrieved
+
+
+def test_redis_append_only_store_retrieves_events_since_restart(default_domain):
+    store = _fake_redis_tracker_store(default_domain, append_only=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    tracker.update(Restarted())
+    _append_turn(tracker, "/goodbye")
+    store.save(tracker)
+
+    retrieved = store.retrieve("myuser")
+
+    assert list(retrieved.events) == list(tracker.events)[4:]
+    assert retrieved.current_state() == tracker.current_state()
+
+
+def test_redis_append_only_store_reads_events_from_latest_restart(default_domain):
+    store = _fake_redis_tracker_store(default_domain, append_only=True)
+    tracker = store.get_or_create_tracker("myuser")
+    assert store.red.get("myuser:restart") == b"0"
+
+    _append_turn(tracker)
+    store.save(tracker)
+    tracker.update(Restarted())
+    _append_turn(tracker, "/goodbye")
+    store.save(tracker)
+    # the index is stored in the same transaction as the appended events
+    assert store.red.get("myuser:restart") == b"4"
+
+    with mock.patch.object(store.red, "lrange", wraps=store.red.lrange) as lrange:
+        retrieved = store.retrieve("myuser")
+
+    lrange.assert_called_once_with("myuser", 4, -1)
+    assert list(retrieved.events) == list(tracker.events)[4:]
+    assert "myuser:restart" not in [k.decode() for k in store.keys()]
+
+
+def test_redis_append_only_store_retrieves_events_without_restart_index(default_domain):
+    store = _fake_redis_tracker_store(default_domain, append_only=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    tracker.update(Restarted())
+    _append_turn(tracker, "/goodbye")
+    store.save(tracker)
+
+    # lists which were appended before the restart index was stored
+    store.red.delete("myuser:restart")
+
+    assert list(store.retrieve("myuser").events) == list(tracker.events)[4:]
+
+
+def test_redis_append_only_store_retrieves_events_replaced_after_reading_index(
+    default_domain
+):
+    store = _fake_redis_tracker_store(default_domain, append_only=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    tracker.update(Restarted())
+    _append_turn(tracker, "/goodbye")
+    store.save(tracker)
+
+    # the events are replaced by the ones of a new tracker after the index of
+    # the old restart was read
+    replaced = DialogueStateTracker.from_events(
+        "myuser", list(tracker.events)[:4] * 2, default_domain.slots
+    )
+    store.red.delete("myuser")
+    store._append_events("myuser", list(replaced.events))
+
+    assert store.retrieve("myuser") == replaced
+
+
+def test_redis_append_only_store_replaces_events_of_new_trackers(default_domain):
+    store = _fake_redis_tracker_store(default_domain, append_only=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    replaced = DialogueStateTracker.from_events(
+        "myuser", [ActionExecuted(ACTION_LISTEN_NAME)], default_domain.slots
+    )
+    store.save(replaced)
+
+    assert store.retrieve("myuser") == replaced
+
+
+def test_redis_append_only_store_rewrites_expired_events(default_domain):
+    store = _fake_redis_tracker_store(default_domain, append_only=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+    retrieved = store.retrieve("myuser")
+
+    # the stored events expire while the tracker is handled
+    store.red.delete("myuser")
+    _append_turn(retrieved)
+    store.save(retrieved)
+
+    assert store.red.llen("myuser") == 7
+    assert store.retrieve("myuser") == retrieved
+
+
+def test_redis_append_only_store_sets_expiry(default_domain):
+    store = _fake_redis_tracker_store(default_domain, append_only=True, record_exp=60)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    assert 0 < store.red.ttl("myuser") <= 60
+    assert 0 < store.red.ttl("myuser:restart") <= 60
+
+
+def test_redis_append_only_store_migrates_pickled_trackers(default_domain):
+    store = _fake_redis_tracker_store(default_domain, record_exp=60)
+    for sender_id in ["first", "second"]:
+        tracker = store.get_or_create_tracker(sender_id)
+        _append_turn(tracker)
+        store.save(tracker)
+
+    store.append_only = True
+    # pickled trackers are converted lazily when they are retrieved
+    assert len(store.retrieve("first").events) == 4
+    assert store.red.type("first") == b"list"
+    assert store.red.type("second") == b"string"
+
+    assert store.migrate_pickled_trackers() == 1
+    assert store.red.type("second") == b"list"
+    assert store.retrieve("second") == tracker
+    assert 0 < store.red.ttl("second") <= 60
+    assert store.red.get("second:restart") == b"0"
+
+
+def _bytes_written_per_turn(store, turns):
+    written = []
+
+    def send_packed_command(connection, command, *args, **kwargs):
+        if isinstance(command, bytes):
+            command = [command]
+        written[-1] += sum(len(chunk) for chunk in command)
+        return original(connection, command, *args, **kwargs)
+
+    original = redis.Connection.send_packed_command
+    with mock.patch.object(
+        redis.Connection, "send_packed_command", send_packed_command
+    ):
+        for _ in range(turns):
+            written.append(0)
+            tracker = store.get_or_create_tracker("benchmark")
+            _append_turn(tracker)
+            store.save(tracker)
+    return written
+
+
+def test_redis_append_only_store_bytes_written_per_turn(default_domain):
+    # the `EventCodec` stores repeated strings only once, so the stored
+    # conversations grow slower than pickled ones and it takes more turns
+    # until storing the whole conversation costs as much as before
+    turns = 80
+    stored = _bytes_written_per_turn(_fake_redis_tracker_store(default_domain), turns)
+    appended = _bytes_written_per_turn(
+        _fake_redis_tracker_store(default_domain, append_only=True), turns
+    )
+
+    # storing the whole conversation writes more with every turn, while
+    # appending the new events writes about the same amount per turn
+    assert stored[-1] > 5 * stored[1]
+    assert appended[-1] < 1.1 * appended[1]
+    assert sum(appended) < sum(stored) / 4
+
+
+def test_num_events_since_restart():
+    events = [UserUttered("hi"), Restarted(), UserUttered("hi"), SlotSet("a", 1)]
+
+    assert _num_events_since_restart(events) == 3
+    assert _num_events_since_restart(events[:1]) == 1
+    assert _num_events_since_restart([]) == 0
+
+
+def _mongomock_tracker_store(domain, **kwargs):
+    # skips the Mongo tracker store tests if mongomock isn't installed
+    mongomock = pytest.importorskip("mongomock")
+
+    with mock.patch("pymongo.MongoClient", mongomock.MongoClient), mock.patch(
+        "pymongo.database.Database", lambda client, name: client[name]
+    ):
+        return MongoTrackerStore(domain, **kwargs)
+
+
+def test_mongo_store_pushes_new_events(default_domain):
+    store = _mongomock_tracker_store(default_domain)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    tracker = store.retrieve("myuser")
+    _append_turn(tracker, "/goodbye")
+    conversations = store.conversations
+    with mock.patch.object(
+        conversations, "update_one", wraps=conversations.update_one
+    ) as update_one:
+        store.save(tracker)
+
+    update_one.assert_called_once()
+    _, update = update_one.call_args[0]
+    assert update["$push"] == {
+        "events": {"$each": [e.as_dict() for e in list(tracker.events)[-3:]]}
+    }
+    assert update["$inc"] == {NUM_EVENTS_SINCE_RESTART: 3}
+    # only the fields which changed with the new events are set
+    assert set(update["$set"]) == {"latest_message", "latest_event_time"}
+
+    stored = store.conversations.find_one({"sender_id": "myuser"})
+    assert stored[NUM_EVENTS_SINCE_RESTART] == len(tracker.events)
+    assert store.retrieve("myuser") == tracker
+
+
+def test_mongo_store_skips_saving_unchanged_tracker(default_domain):
+    store = _mongomock_tracker_store(default_domain)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    conversations = store.conversations
+    with mock.patch.object(conversations, "update_one") as update_one:
+        store.save(tracker)
+        store.save(store.retrieve("myuser"))
+        update_one.assert_not_called()
+
+
+def test_mongo_store_replaces_conversation_without_restart_count(default_domain):
+    store = _mongomock_tracker_store(default_domain)
+    tracker = DialogueStateTracker("myuser", default_domain.slots)
+    tracker.update(Restarted())
+    _append_turn(tracker)
+    # conversations stored by previous versions don't count the events
+    # since their latest restart
+    store.conversations.insert_one(
+        {"sender_id": "myuser", "events": [e.as_dict() for e in tracker.events]}
+    )
+
+    tracker = store.retrieve("myuser")
+    _append_turn(tracker, "/goodbye")
+    store.save(tracker)
+
+    stored = store.conversations.find_one({"sender_id": "myuser"})
+    assert stored["events"] == [e.as_dict() for e in tracker.events]
+    assert stored[NUM_EVENTS_SINCE_RESTART] == len(tracker.events)
+    assert stored["latest_message"] == tracker.latest_message.parse_data
+    assert store.retrieve("myuser") == tracker
+
+
+def test_mongo_store_retrieves_events_since_restart(default_domain):
+    store = _mongomock_tracker_store(default_domain, retrieve_since_restart=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    tracker = store.retrieve("myuser")
+    _append_turn(tracker)
+    tracker.update(Restarted())
+    _append_turn(tracker, "/goodbye")
+    store.save(tracker)
+
+    stored = store.conversations.find_one({"sender_id": "myuser"})
+    assert len(stored["events"]) == len(tracker.events)
+    assert stored[NUM_EVENTS_SINCE_RESTART] == 4
+
+    # only the events since the restart are fetched
+    retrieved = store.retrieve("myuser")
+    assert list(retrieved.events) == list(tracker.events)[-4:]
+    assert retrieved.current_state() == tracker.current_state()
+
+    # the restart count of following saves is incremented
+    _append_turn(retrieved)
+    store.save(retrieved)
+    assert list(store.retrieve("myuser").events) == list(retrieved.events)
+
+
+def _sql_tracker_store(domain, tmpdir, **kwargs):
+    return SQLTrackerStore(domain, db=tmpdir.join("rasa.db").strpath, **kwargs)
+
+
+def test_sql_store_appends_new_events(default_domain, tmpdir):
+    store = _sql_tracker_store(default_domain, tmpdir)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    retrieved = store.retrieve("myuser")
+    assert retrieved == tracker
+
+    _append_turn(retrieved)
+    store.save(retrieved)
+    assert store.retrieve("myuser") == retrieved
+    assert store.keys() == ["myuser"]
+
+    with store.session_scope() as session:
+        assert session.query(store.SQLEvent).count() == len(retrieved.events)
+
+
+def test_sql_store_retrieves_events_since_restart(default_domain, tmpdir):
+    store = _sql_tracker_store(default_domain, tmpdir, retrieve_since_restart=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    tracker.update(Restarted())
+    _append_turn(tracker, "/goodbye")
+    store.save(tracker)
+
+    retrieved = store.retrieve("myuser")
+
+    assert list(retrieved.events) == list(tracker.events)[4:]
+    assert retrieved.current_state() == tracker.current_state()
+
+
+def test_sql_store_saves_retrieved_tracker_with_single_insert(default_domain, tmpdir):
+    from sqlalchemy import event
+
+    store = _sql_tracker_store(default_domain, tmpdir)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    tracker = store.retrieve("myuser")
+    _append_turn(tracker)
+
+    statements = []
+    event.listen(
+        store.engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    store.save(tracker)
+
+    # the new events are known without querying the stored events
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT INTO events")
+
+
+def test_sql_store_recreates_tracker_from_snapshot(default_domain, tmpdir):
+    store = _sql_tracker_store(default_domain, tmpdir, snapshots=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    tracker.update(SlotSet("name", "Peter"))
+    store.save(tracker)
+
+    with mock.patch.object(DialogueStateTracker, "from_events") as from_events:
+        retrieved = store.retrieve("myuser")
+        # the snapshot is up to date, the events don't have to be replayed
+        from_events.assert_not_called()
+
+    assert retrieved == tracker
+    assert retrieved.current_state() == tracker.current_state()
+
+
+def test_sql_store_ignores_stale_snapshot(default_domain, tmpdir):
+    store = _sql_tracker_store(default_domain, tmpdir, snapshots=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    # a snapshot from a different domain is replaced by a full replay
+    store.domain = Domain.load("examples/moodbot/domain.yml")
+    with mock.patch.object(DialogueStateTracker, "from_snapshot") as from_snapshot:
+        retrieved = store.retrieve("myuser")
+        from_snapshot.assert_not_called()
+
+    assert retrieved == tracker
+
+
+def test_sql_store_bulk_inserts_events_of_new_tracker(default_domain, tmpdir):
+    from sqlalchemy import event
+
+    store = _sql_tracker_store(default_domain, tmpdir)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    tracker.update(SlotSet("name", "Peter"))
+
+    executed = []
+    event.listen(
+        store.engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, context, executemany: (
+            executed.append((statement, executemany))
+        ),
+    )
+    store.save(tracker)
+
+    inserts = [
+        (statement, executemany)
+        for statement, executemany in executed
+        if statement.startswith("INSERT")
+    ]
+    assert inserts == [(inserts[0][0], True)]
+
+    with store.session_scope() as session:
+        rows = [
+            (row.type_name, row.intent_name, row.action_name)
+            for row in session.query(store.SQLEvent).order_by(store.SQLEvent.id)
+        ]
+    assert rows == [
+        ("action", None, ACTION_LISTEN_NAME),
+        ("user", "greet", None),
+        ("action", None, "utter_greet"),
+        ("action", None, ACTION_LISTEN_NAME),
+        ("slot", None, "name"),
+    ]
+    assert store.retrieve("myuser") == tracker
+
+
+def test_sql_store_retrieves_events_since_latest_restart(default_domain, tmpdir):
+    store = _sql_tracker_store(default_domain, tmpdir, retrieve_since_restart=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    tracker.update(Restarted())
+    store.save(tracker)
+
+    tracker = store.retrieve("myuser")
+    assert list(tracker.events) == [Restarted(tracker.events[0].timestamp)]
+
+    # the events of a later save start from the latest restart
+    _append_turn(tracker)
+    tracker.update(Restarted())
+    _append_turn(tracker, "/goodbye")
+    store.save(tracker)
+
+    # restarts of other conversations don't matter
+    other = store.get_or_create_tracker("otheruser")
+    other.update(Restarted())
+    _append_turn(other)
+    store.save(other)
+
+    retrieved = store.retrieve("myuser")
+    assert list(retrieved.events) == list(tracker.events)[4:]
+    assert retrieved.current_state() == tracker.current_state()
+    assert len(store.retrieve("otheruser").events) == len(other.events) - 1
+
+    # without the option the whole conversation is retrieved
+    store.retrieve_since_restart = False
+    assert len(store.retrieve("myuser").events) == 1 + 4 + 4 + 3
+
+
+@pytest.mark.benchmark
+def test_sql_store_benchmark(default_domain, tmpdir):
+    num_conversations = 10000
+    num_events = 200
+    events_per_save = 40
+
+    def save_event_by_event(store, tracker):
+        # how `SQLTrackerStore.save` stored the events before the bulk insert
+        from sqlalchemy import func
+
+        with store.session_scope() as session:
+            max_timestamp = (
+                session.query(func.max(store.SQLEvent.timestamp))
+                .filter_by(sender_id=tracker.sender_id)
+                .scalar()
+            )
+            for e in tracker.events:
+                if max_timestamp is None or e.timestamp > max_timestamp:
+                    # noinspection PyArgumentList
+                    session.add(store.SQLEvent(**store._as_row(tracker.sender_id, e)))
+
+    def save_conversations(store, save):
+        start = time.perf_counter()
+        for i in range(num_conversations):
+            tracker = DialogueStateTracker(str(i), default_domain.slots)
+            while len(tracker.events) < num_events:
+                _append_turn(tracker)
+                if len(tracker.events) == num_events * 3 // 4:
+                    tracker.update(Restarted())
+                if len(tracker.events) % events_per_save < 3:
+                    save(store, tracker)
+            save(store, tracker)
+        return time.perf_counter() - start
+
+    def retrieve_conversations(store):
+        start = time.perf_counter()
+        for i in range(num_conversations):
+            assert store.retrieve(str(i)) is not None
+        return time.perf_counter() - start
+
+    bulk_store = SQLTrackerStore(default_domain, db=tmpdir.join("bulk.db").strpath)
+    bulk_time = save_conversations(bulk_store, SQLTrackerStore.save)
+    legacy_store = SQLTrackerStore(default_domain, db=tmpdir.join("legacy.db").strpath)
+    legacy_time = save_conversations(legacy_store, save_event_by_event)
+
+    with bulk_store.session_scope() as session:
+        num_rows = session.query(bulk_store.SQLEvent).count()
+    with legacy_store.session_scope() as session:
+        assert session.query(legacy_store.SQLEvent).count() == num_rows
+
+    full_time = retrieve_conversations(bulk_store)
+    bulk_store.retrieve_since_restart = True
+    since_restart_time = retrieve_conversations(bulk_store)
+
+    assert bulk_time < legacy_time
+    assert since_restart_time < full_time
+
+
+async def test_async_tracker_store_runs_in_executor(default_domain):
+    import threading
+
+    class ThreadRecordingTrackerStore(InMemoryTrackerStore):
+        def __init__(self, domain):
+            self.threads = []
+            super(ThreadRecordingTrackerStore, self).__init__(domain)
+
+        def save(self, tracker):
+            self.threads.append(threading.current_thread())
+            super(ThreadRecordingTrackerStore, self).save(tracker)
+
+    store = ThreadRecordingTrackerStore(default_domain)
+    tracker = await store.async_get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    await store.async_save(tracker)
+
+    assert await store.async_retrieve("myuser") == tracker
+    assert list(await store.async_keys()) == ["myuser"]
+    # the blocking calls didn't run on the thread of the event loop
+    assert len(store.threads) == 2
+    assert threading.current_thread() not in store.threads
+
+
+def _caching_tracker_store(domain, **kwargs):
+    return CachingTrackerStore(InMemoryTrackerStore(domain), **kwargs)
+
+
+def test_caching_store_returns_cached_trackers(default_domain):
+    store = _caching_tracker_store(default_domain)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    with mock.patch.object(store.store, "retrieve") as retrieve:
+        assert store.retrieve("myuser") is tracker
+        retrieve.assert_not_called()
+
+    # the wrapped store was written through
+    assert store.store.retrieve("myuser") == tracker
+    assert store.cache_info()["hits"] == 1
+
+
+def test_caching_store_evicts_least_recently_used(default_domain):
+    store = _caching_tracker_store(default_domain, max_size=2)
+    for sender_id in ["one", "two", "three"]:
+        store.get_or_create_tracker(sender_id)
+
+    assert store.cache_info()["size"] == 2
+    assert store.cache_info()["evictions"] == 1
+
+    misses = store.cache_info()["misses"]
+    # the evicted tracker is loaded from the wrapped store
+    assert store.retrieve("one") is not None
+    assert store.cache_info()["misses"] == misses + 1
+
+
+def test_caching_store_evicts_expired_trackers(default_domain):
+    store = _caching_tracker_store(default_domain, ttl=60)
+    tracker = store.get_or_create_tracker("myuser")
+
+    with mock.patch("time.time", return_value=time.time() + 61):
+        retrieved = store.retrieve("myuser")
+
+    assert retrieved is not tracker
+    assert retrieved == tracker
+
+
+def test_caching_store_limits_event_history_of_retrieved_trackers(default_domain):
+    store = _caching_tracker_store(default_domain)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    _append_turn(tracker)
+    store.save(tracker)
+    store.clear()
+
+    # set by `get_or_create_tracker`, trackers which aren't cached are
+    # retrieved from the wrapped store
+    store.max_event_history = 3
+    retrieved = store.retrieve("myuser")
+
+    assert store.store.max_event_history == 3
+    assert len(tracker.events) == 7
+    assert len(retrieved.events) == 3
+
+
+def test_caching_store_drops_unsaved_changes(default_domain):
+    store = _caching_tracker_store(default_domain)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+
+    retrieved = store.retrieve("myuser")
+
+    assert retrieved is not tracker
+    assert len(retrieved.events) == 1
+
+
+def test_caching_store_write_behind(default_domain):
+    store = _caching_tracker_store(default_domain, write_behind=True, flush_interval=60)
+    # new trackers are written immediately
+    tracker = store.get_or_create_tracker("myuser")
+    assert store.store.retrieve("myuser") == tracker
+
+    _append_turn(tracker)
+    store.save(tracker)
+    assert len(store.store.retrieve("myuser").events) == 1
+    assert store.cache_info()["pending_writes"] == 1
+
+    store.flush()
+    assert store.store.retrieve("myuser") == tracker
+    assert store.cache_info()["pending_writes"] == 0
+
+
+def test_caching_store_writes_evicted_changes(default_domain):
+    store = _caching_tracker_store(
+        default_domain, max_size=1, write_behind=True, flush_interval=60
+    )
+    tracker = store.get_or_create_tracker("one")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    store.get_or_create_tracker("two")
+
+    assert store.store.retrieve("one") == tracker
+
+
+def test_caching_store_writes_copies_of_trackers_behind(default_domain):
+    store = _caching_tracker_store(default_domain, write_behind=True, flush_interval=60)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    written = []
+    save = store.store.save
+
+    def save_while_tracker_changes(tracker_to_save):
+        # the cached tracker changes while its pending changes are written
+        _append_turn(tracker, "/goodbye")
+        written.append(tracker_to_save)
+        save(tracker_to_save)
+
+    with mock.patch.object(store.store, "save", save_while_tracker_changes):
+        store.flush()
+
+    assert written[0] is not tracker
+    assert len(store.store.retrieve("myuser").events) == 4
+    # the events added meanwhile are written with the next write
+    assert len(tracker.unpersisted_events()) == 3
+
+    store.save(tracker)
+    store.flush()
+    assert store.store.retrieve("myuser") == tracker
+
+
+def test_caching_store_from_endpoint_config(default_domain):
+    store = EndpointConfig(
+        type="redis", cache={"max_size": 10, "ttl": 30, "write_behind": True}
+    )
+    with mock.patch("redis.StrictRedis", fakeredis.FakeStrictRedis):
+        tracker_store = TrackerStore.find_tracker_store(default_domain, store)
+
+    assert isinstance(tracker_store, CachingTrackerStore)
+    assert isinstance(tracker_store.store, RedisTrackerStore)
+    assert tracker_store.max_size == 10
+    assert tracker_store.ttl == 30
+    assert tracker_store.write_behind
+    # the endpoint configuration isn't modified
+    assert "cache" in store.kwargs
+
+
+def test_tracker_store_trims_intent_ranking_from_endpoint_config(default_domain):
+    store = EndpointConfig(type="redis", max_intent_ranking=2, cache={})
+    with mock.patch("redis.StrictRedis", fakeredis.FakeStrictRedis):
+        tracker_store = TrackerStore.find_tracker_store(default_domain, store)
+
+    assert tracker_store.max_intent_ranking == 2
+    assert tracker_store.store.max_intent_ranking == 2
+
+    ranking = [{"name": "intent_{}".format(i), "confidence": 0.1} for i in range(5)]
+    parse_data = {"intent": ranking[0], "entities": [], "intent_ranking": ranking}
+    tracker = tracker_store.get_or_create_tracker("myuser")
+    tracker.update(UserUttered("hi", ranking[0], [], parse_data))
+    tracker_store.save(tracker)
+    tracker_store.clear()
+
+    retrieved = tracker_store.retrieve("myuser")
+    assert retrieved.latest_message.parse_data["intent_ranking"] == ranking[:2]
+
+
+def test_in_memory_store_appends_new_events(default_domain):
+    store = InMemoryTrackerStore(default_domain)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+
+    retrieved = store.retrieve("myuser")
+    _append_turn(retrieved)
+    store.save(retrieved)
+
+    assert len(store.store["myuser"].chunks) == 3
+    with mock.patch.object(DialogueStateTracker, "from_events") as from_events:
+        # the tracker is recreated from its snapshot
+        assert store.retrieve("myuser") == retrieved
+        from_events.assert_not_called()
+
+
+def test_in_memory_store_removes_least_recently_used(default_domain):
+    store = InMemoryTrackerStore(default_domain, max_conversations=2)
+    for sender_id in ["one", "two"]:
+        store.get_or_create_tracker(sender_id)
+    store.retrieve("one")
+    store.get_or_create_tracker("three")
+
+    assert store.keys() == ["one", "three"]
+
+
+def test_in_memory_store_limits_memory_footprint(default_domain):
+    store = InMemoryTrackerStore(default_domain)
+    store.get_or_create_tracker("one")
+    footprint = store.memory_footprint()
+    assert footprint > 0
+
+    store = InMemoryTrackerStore(default_domain, max_bytes=int(footprint * 2.5))
+    for sender_id in ["one", "two", "three"]:
+        store.get_or_create_tracker(sender_id)
+
+    assert store.keys() == ["two", "three"]
+    assert store.memory_footprint() == 2 * footprint
+
+
+def test_in_memory_store_compresses_events(default_domain):
+    stores = [
+        InMemoryTrackerStore(default_domain),
+        InMemoryTrackerStore(default_domain, compress=True),
+    ]
+    for store in stores:
+        tracker = store.init_tracker("myuser")
+        for _ in range(20):
+            _append_turn(tracker)
+        store.save(tracker)
+        assert store.retrieve("myuser") == tracker
+
+    uncompressed, compressed = [s.store["myuser"].chunks[0] for s in stores]
+    assert len(compressed) < len(uncompressed)
+
+
+def test_in_memory_store_decodes_events_since_restart(default_domain):
+    store = InMemoryTrackerStore(default_domain, retrieve_since_restart=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    store.save(tracker)
+    tracker.update(Restarted())
+    _append_turn(tracker)
+    store.save(tracker)
+    _append_turn(tracker, "/goodbye")
+    store.save(tracker)
+
+    with mock.patch.object(
+        store.codec, "decode_since_restart", wraps=store.codec.decode_since_restart
+    ) as decode_since_restart:
+        retrieved = store.retrieve("myuser")
+    # the chunk of the first save isn't decoded
+    assert decode_since_restart.call_count == 2
+
+    assert list(retrieved.events) == list(tracker.events)[4:]
+    assert retrieved.current_state() == tracker.current_state()
+
+
+def test_redis_store_decodes_events_since_restart(default_domain):
+    store = _fake_redis_tracker_store(default_domain, retrieve_since_restart=True)
+    tracker = store.get_or_create_tracker("myuser")
+    _append_turn(tracker)
+    tracker.update(Restarted())
+    _append_turn(tracker, "/goodbye")
+    store.save(tracker)
+
+    retrieved = store.retrieve("myuser")
+
+    assert list(retrieved.events) == list(tracker.events)[4:]
+    assert retrieved.current_state() == tracker.current_state()
+
+
+def test_in_memory_store_saves_all_events_of_removed_conversations(default_domain):
+    store = InMemoryTrackerStore(default_domain, max_conversations=1)
+    tracker = store.get_or_create_tracker("one")
+    _append_turn(tracker)
+    store.save(tracker)
+    tracker = store.retrieve("one")
+
+    # the conversation is removed while its tracker is handled
+    store.get_or_create_tracker("two")
+    assert store.keys() == ["two"]
+
+    _append_turn(tracker)
+    store.save(tracker)
+
+    assert store.retrieve("one").events == tracker.events
+
+
+def test_in_memory_store_removes_idle_conversations(default_domain):
+    store = InMemoryTrackerStore(default_domain, idle_timeout=60)
+    store.get_or_create_tracker("myuser")
+
+    with mock.patch("time.time", return_value=time.time() + 61):
+        assert store.retrieve("myuser") is None
+
+    assert store.memory_footprint() == 0
@@ -1,6 +1,7 @@
 import json
 
 import fakeredis
+import mock
 import pytest
 import tempfile
 import os
@@ -16,6 +17,7 @@ from rasa.core.events import (
     Restarted,
     ActionReverted,
     UserUtteranceReverted,
+    SlotSet,
 )
 from rasa.core.tracker_store import (
     InMemoryTrackerStore,
@@ -46,6 +48,8 @@ class MockRedisTrackerStore(RedisTrackerStore):
     def __init__(self, domain):
         self.red = fakeredis.FakeStrictRedis()
         self.record_exp = None
+        self.append_only = False
+        self.retrieve_since_restart = False
         TrackerStore.__init__(self, domain)
 
 
@@ -104,6 +108,60 @@ def test_tracker_store_storage_and_retrieval(store):
     assert len(other_tracker.events) == 1
 
 
+@pytest.mark.parametrize("store", stores_to_be_tested(), ids=stores_to_be_tested_ids())
+def test_tracker_store_streams_only_new_events(store):
+    event_broker = mock.Mock()
+    store.event_broker = event_broker
+    try:
+        tracker = store.get_or_create_tracker("streaming-id")
+        tracker.update(UserUttered("/greet", {"name": "greet", "confidence": 1.0}))
+        store.save(tracker)
+
+        with mock.patch.object(store, "retrieve") as retrieve:
+            tracker.update(ActionExecuted("utter_greet"))
+            tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+            store.save(tracker)
+            # saving the tracker doesn't load it from the store again
+            retrieve.assert_not_called()
+
+        published = [c[0][0]["event"] for c in event_broker.publish.call_args_list]
+        assert published == ["action", "user", "action", "action"]
+
+        # a retrieved tracker only streams events added after loading it
+        event_broker.reset_mock()
+        retrieved = store.retrieve("streaming-id")
+        assert retrieved.unpersisted_events() == []
+        retrieved.update(SlotSet("name", "rasa"))
+        store.save(retrieved)
+        published = [c[0][0] for c in event_broker.publish.call_args_list]
+        assert [(e["event"], e["name"]) for e in published] == [("slot", "name")]
+    finally:
+        store.event_broker = None
+
+
+def test_snapshot_copy_keeps_unpersisted_events(default_domain):
+    tracker = DialogueStateTracker("default", default_domain.slots)
+    tracker.update(UserUttered("/greet", {"name": "greet", "confidence": 1.0}))
+    tracker.mark_events_persisted()
+    tracker.update(SlotSet("name", "Peter"))
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+
+    copied = tracker.snapshot_copy()
+
+    assert copied == tracker
+    assert copied.current_state() == tracker.current_state()
+    assert copied.unpersisted_events() == tracker.unpersisted_events()
+
+    # the copy doesn't change with the tracker
+    tracker.update(SlotSet("name", "Paul"))
+    assert copied.get_slot("name") == "Peter"
+    assert len(copied.events) == 3
+
+    # only the events of the copy are marked as persisted
+    tracker.mark_events_persisted(len(copied.unpersisted_events()))
+    assert tracker.unpersisted_events() == [SlotSet("name", "Paul")]
+
+
 @pytest.mark.parametrize("store", stores_to_be_tested(), ids=stores_to_be_tested_ids())
 @pytest.mark.parametrize("pair", zip(TEST_DIALOGUES, EXAMPLE_DOMAINS))
 def test_tracker_store(store, pair):
@@ -356,6 +414,125 @@ def test_traveling_back_in_time(default_domain):
     assert len(list(tracker.generate_all_prior_trackers())) == 2
 
 
+@pytest.mark.parametrize("pair", zip(TEST_DIALOGUES, EXAMPLE_DOMAINS))
+def test_incremental_past_states_match_replay(pair):
+    filename, domainpath = pair
+    domain = Domain.load(domainpath)
+    dialogue = read_dialogue_file(filename)
+    tracker = DialogueStateTracker(dialogue.name, domain.slots)
+
+    for event in dialogue.events:
+        tracker.update(event)
+        # the cached states have to be identical to a full replay
+        assert tracker.past_states(domain) == tracker._past_states_from_history(domain)
+
+
+@pytest.mark.parametrize("pair", zip(TEST_DIALOGUES, EXAMPLE_DOMAINS))
+def test_incremental_past_states_with_max_history_match_replay(pair):
+    filename, domainpath = pair
+    domain = Domain.load(domainpath)
+    dialogue = read_dialogue_file(filename)
+    tracker = DialogueStateTracker(dialogue.name, domain.slots)
+
+    for event in dialogue.events:
+        tracker.update(event)
+        replayed = list(tracker._past_states_from_history(domain))
+        assert list(tracker.past_states(domain, 2)) == replayed[-2:]
+
+    cache = tracker._past_states_cache
+    # only the latest states and the state of the replayed tracker are kept
+    assert len(cache.states) <= 2
+    assert len(cache.prior_trackers.tracker.events) <= 1
+
+    # asking for more states rebuilds the cache
+    assert tracker.past_states(domain) == tracker._past_states_from_history(domain)
+    assert tracker._past_states_cache.max_history is None
+    assert len(tracker.past_states(domain, 1)) == 1
+
+
+@pytest.mark.parametrize("pair", zip(TEST_DIALOGUES, EXAMPLE_DOMAINS))
+def test_tracker_from_snapshot_matches_replay(pair):
+    filename, domainpath = pair
+    domain = Domain.load(domainpath)
+    dialogue = read_dialogue_file(filename)
+    replayed = DialogueStateTracker.from_events(
+        dialogue.name, dialogue.events, domain.slots
+    )
+
+    tracker = DialogueStateTracker(dialogue.name, domain.slots)
+    for event in dialogue.events:
+        tracker.update(event)
+        # only the events after the snapshot are replayed
+        from_snapshot = DialogueStateTracker.from_snapshot(
+            dialogue.name, dialogue.events, tracker.snapshot(), domain.slots
+        )
+
+        assert from_snapshot == replayed
+        assert from_snapshot.current_state() == replayed.current_state()
+        assert from_snapshot.latest_bot_utterance == replayed.latest_bot_utterance
+
+
+def test_tracker_from_snapshot_of_other_events(default_domain):
+    tracker = get_tracker([ActionExecuted(ACTION_LISTEN_NAME), user_uttered("hi", 1)])
+    snapshot = tracker.snapshot()
+
+    other_events = [ActionExecuted(ACTION_LISTEN_NAME), user_uttered("hi", 1)]
+    assert (
+        DialogueStateTracker.from_snapshot(
+            "default", other_events, snapshot, default_domain.slots
+        )
+        is None
+    )
+    assert (
+        DialogueStateTracker.from_snapshot(
+            "default", other_events[:1], snapshot, default_domain.slots
+        )
+        is None
+    )
+
+
+def test_past_states_cache_invalidated_by_reverts(default_domain):
+    tracker = DialogueStateTracker("default", default_domain.slots)
+
+    intent1 = {"name": "greet", "confidence": 1.0}
+    intent2 = {"name": "goodbye", "confidence": 1.0}
+    events = [
+        ActionExecuted(ACTION_LISTEN_NAME),
+        UserUttered("/greet", intent1, []),
+        ActionExecuted("utter_greet"),
+        ActionExecuted(ACTION_LISTEN_NAME),
+        UserUttered("/goodbye", intent2, []),
+        ActionExecuted("utter_goodbye"),
+        ActionReverted(),
+        UserUtteranceReverted(),
+        UserUttered("/goodbye", intent2, []),
+        ActionExecuted("utter_goodbye"),
+        ActionExecuted(ACTION_LISTEN_NAME),
+        Restarted(),
+        ActionExecuted(ACTION_LISTEN_NAME),
+        UserUttered("/greet", intent1, []),
+    ]
+
+    for event in events:
+        tracker.update(event)
+        assert tracker.past_states(default_domain) == tracker._past_states_from_history(
+            default_domain
+        )
+
+
+def test_past_states_with_max_event_history(default_domain):
+    tracker = DialogueStateTracker("default", default_domain.slots, 3)
+
+    intent = {"name": "greet", "confidence": 1.0}
+    for _ in range(3):
+        tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+        tracker.update(UserUttered("/greet", intent, []))
+        tracker.update(ActionExecuted("utter_greet"))
+        assert tracker.past_states(default_domain) == tracker._past_states_from_history(
+            default_domain
+        )
+
+
 async def test_dump_and_restore_as_json(default_agent, tmpdir_factory):
     trackers = await default_agent.load_data(DEFAULT_STORIES_FILE)
 
@@ -537,3 +714,23 @@ def test_last_executed_has_not_name():
     tracker = get_tracker(events)
 
     assert tracker.last_executed_action_has("another") is False
+
+
+def test_tracker_trims_intent_ranking(default_domain):
+    ranking = [{"name": "intent_{}".format(i), "confidence": 0.1} for i in range(10)]
+    parse_data = {"intent": ranking[0], "entities": [], "intent_ranking": ranking}
+    event = UserUttered("hi", ranking[0], [], parse_data)
+
+    tracker = DialogueStateTracker("default", default_domain.slots)
+    tracker.update(event)
+    assert tracker.latest_message.parse_data["intent_ranking"] == ranking
+
+    tracker = DialogueStateTracker(
+        "default", default_domain.slots, max_intent_ranking=3
+    )
+    tracker.update(event)
+    assert tracker.latest_message == event
+    assert tracker.latest_message.parse_data["intent_ranking"] == ranking[:3]
+    assert tracker.init_copy()._max_intent_ranking == 3
+    # the original event is unchanged
+    assert len(event.parse_data["intent_ranking"]) == 10
@@ -156,3 +156,8 @@ def test_file_in_path(file, parents):
 )
 def test_file_not_in_path(file, parents):
     assert not rasa.utils.io.is_subdirectory(file, parents)
+
+
+def test_lock_counter_is_deprecated():
+    with pytest.warns(DeprecationWarning):
+        utils.LockCounter()
@@ -1,8 +1,12 @@
+import time
+
 import rasa.nlu
 
 import pytest
 
 from rasa.nlu import registry, training_data
+from rasa.nlu.components import Component
+from rasa.nlu.config import RasaNLUModelConfig
 from rasa.nlu.model import Interpreter
 from tests.nlu import utilities
 
@@ -34,6 +38,120 @@ def test_interpreter(pipeline_template, component_builder, tmpdir):
             assert entity["entity"] in td.entities
 
 
+@pytest.mark.parametrize(
+    "pipeline",
+    [
+        registry.pipeline_template("supervised_embeddings"),
+        [
+            {"name": "WhitespaceTokenizer"},
+            {"name": "CountVectorsFeaturizer"},
+            {"name": "SklearnIntentClassifier"},
+        ],
+    ],
+)
+def test_interpreter_parse_batch(pipeline, component_builder, tmpdir):
+    interpreter = utilities.interpreter_for(
+        component_builder,
+        "data/examples/rasa/demo-rasa.json",
+        tmpdir.strpath,
+        RasaNLUModelConfig({"pipeline": pipeline}),
+    )
+
+    texts = ["good bye", "", "i am looking for an indian spot", "hello"]
+    results = interpreter.parse_batch(texts)
+
+    assert [r["text"] for r in results] == texts
+    for text, result in zip(texts, results):
+        expected = interpreter.parse(text)
+        assert result["intent"]["name"] == expected["intent"]["name"]
+        assert result["intent"]["confidence"] == pytest.approx(
+            expected["intent"]["confidence"]
+        )
+        assert result["entities"] == expected["entities"]
+
+
+@pytest.mark.benchmark
+def test_interpreter_parse_batch_benchmark(component_builder, tmpdir):
+    interpreter = utilities.interpreter_for(
+        component_builder,
+        "data/examples/rasa/demo-rasa.json",
+        tmpdir.strpath,
+        utilities.base_test_conf("supervised_embeddings"),
+    )
+    texts = ["i am looking for an indian spot number {}".format(i) for i in range(64)]
+    interpreter.parse_batch(texts[:2])  # warm up the tf session
+
+    start = time.perf_counter()
+    for text in texts:
+        interpreter.parse(text)
+    one_by_one = time.perf_counter() - start
+
+    start = time.perf_counter()
+    interpreter.parse_batch(texts)
+    batched = time.perf_counter() - start
+
+    assert batched < one_by_one
+
+
+def test_interpreter_caches_parse_results(component_builder, tmpdir):
+    trained = utilities.interpreter_for(
+        component_builder,
+        "data/examples/rasa/demo-rasa.json",
+        tmpdir.strpath,
+        RasaNLUModelConfig(
+            {
+                "pipeline": [
+                    {"name": "WhitespaceTokenizer"},
+                    {"name": "CountVectorsFeaturizer"},
+                    {"name": "SklearnIntentClassifier"},
+                ]
+            }
+        ),
+    )
+    interpreter = Interpreter(
+        trained.pipeline, trained.context, trained.model_metadata, cache_size=2
+    )
+
+    expected = trained.parse("hello")
+    result = interpreter.parse("hello")
+    result["intent"]["name"] = "changed"
+
+    assert interpreter.parse("hello") == expected
+    assert interpreter.cache.cache_info()["hits"] == 1
+    assert interpreter.cache.fingerprint == trained.model_metadata.fingerprint
+
+    results = interpreter.parse_batch(["hello", "good bye", "hi"])
+
+    assert [r["text"] for r in results] == ["hello", "good bye", "hi"]
+    assert interpreter.cache.cache_info() == {
+        "hits": 2,
+        "misses": 3,
+        "hit_ratio": 0.4,
+        "size": 2,
+        "max_size": 2,
+    }
+
+
+class TimeComponent(Component):
+    """Returns the time of the message as an entity."""
+
+    provides = ["entities"]
+
+    time_dependent = True
+
+    def process(self, message, **kwargs):
+        message.set("entities", [{"time": message.time}], add_to_output=True)
+
+
+def test_interpreter_caches_time_dependent_results_per_time():
+    interpreter = Interpreter([TimeComponent()], None, cache_size=10)
+
+    assert interpreter.parse("hi", time=1)["entities"] == [{"time": 1}]
+    assert interpreter.parse("hi", time=1)["entities"] == [{"time": 1}]
+    assert interpreter.parse("hi", time=2)["entities"] == [{"time": 2}]
+    assert interpreter.cache.cache_info()["hits"] == 1
+
+
 @pytest.mark.parametrize(
     "metadata",
     [
@@ -83,6 +83,7 @@ def test_status(rasa_app):
     assert response.status == 200
     assert "fingerprint" in response.json
     assert "model_file" in response.json
+    assert "nlu_cache" in response.json
 
 
 def test_status_secured(rasa_secured_app):
@@ -184,6 +185,49 @@ def test_parse_on_invalid_emulation_mode(rasa_app_nlu):
     assert response.status == 400
 
 
+def test_parse_batch(rasa_app):
+    payload = {
+        "messages": [
+            "hello",
+            {"text": "hello ńöñàśçií", "message_id": "some_id"},
+            {"text": "hello", "time": 1559000000},
+        ]
+    }
+    _, response = rasa_app.post("/model/parse/batch?batch_size=2", json=payload)
+
+    assert response.status == 200
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["text"] for r in results] == ["hello", "hello ńöñàśçií", "hello"]
+    assert [r.get("message_id") for r in results] == [None, "some_id", None]
+    assert all(r["intent"] for r in results)
+
+
+def test_parse_batch_with_emulation_mode(rasa_app):
+    _, response = rasa_app.post(
+        "/model/parse/batch?emulation_mode=luis", json=["hello", "hello"]
+    )
+
+    assert response.status == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["query"] for r in results] == ["hello", "hello"]
+
+
+@pytest.mark.parametrize(
+    "endpoint, payload",
+    [
+        ("/model/parse/batch", {"text": "hello"}),
+        ("/model/parse/batch", [{"message_id": "some_id"}]),
+        ("/model/parse/batch?batch_size=0", ["hello"]),
+        ("/model/parse/batch?emulation_mode=ANYTHING", ["hello"]),
+    ],
+)
+def test_parse_batch_with_invalid_request(rasa_app, endpoint, payload):
+    _, response = rasa_app.post(endpoint, json=payload)
+    assert response.status == 400
+
+
 def test_train_stack_success(
     rasa_app,
     default_domain_path,
@@ -574,6 +618,7 @@ def test_list_routes(default_agent):
         "evaluate_intents",
         "tracker_predict",
         "parse",
+        "parse_batch",
         "load_model",
         "unload_model",
         "get_domain",
@@ -1,24 +1,31 @@
+import pytest
 from aioresponses import aioresponses
-from rasa.utils.endpoints import EndpointConfig
+from rasa.utils.endpoints import EndpointConfig, read_endpoint_config
 from tests.utilities import latest_request, json_of_latest_request
 
 
-async def test_endpoint_config():
-    with aioresponses() as mocked:
-        endpoint = EndpointConfig(
-            "https://example.com/",
-            params={"A": "B"},
-            headers={"X-Powered-By": "Rasa"},
-            basic_auth={"username": "user", "password": "pass"},
-            token="mytoken",
-            token_name="letoken",
-            type="redis",
-            port=6379,
-            db=0,
-            password="password",
-            timeout=30000,
-        )
+@pytest.fixture
+async def endpoint():
+    endpoint = EndpointConfig(
+        "https://example.com/",
+        params={"A": "B"},
+        headers={"X-Powered-By": "Rasa"},
+        basic_auth={"username": "user", "password": "pass"},
+        token="mytoken",
+        token_name="letoken",
+        type="redis",
+        port=6379,
+        db=0,
+        password="password",
+        timeout=30000,
+    )
+    yield endpoint
+    # the session is shared by all requests of the endpoint
+    await endpoint.close_session()
 
+
+async def test_endpoint_config(endpoint):
+    with aioresponses() as mocked:
         mocked.post(
             "https://example.com/test?A=B&P=1&letoken=mytoken",
             payload={"ok": True},
@@ -47,7 +54,48 @@ async def test_endpoint_config():
 
         # unfortunately, the mock library won't report any headers stored on
         # the session object, so we need to verify them separately
-        async with endpoint.session() as s:
-            assert s._default_headers.get("X-Powered-By") == "Rasa"
-            assert s._default_auth.login == "user"
-            assert s._default_auth.password == "pass"
+        s = endpoint.session()
+        assert s._default_headers.get("X-Powered-By") == "Rasa"
+        assert s._default_auth.login == "user"
+        assert s._default_auth.password == "pass"
+
+
+async def test_endpoint_config_reuses_session():
+    endpoint = EndpointConfig(
+        "https://example.com/", connection_limit=7, keepalive_timeout=5
+    )
+
+    with aioresponses() as mocked:
+        mocked.post("https://example.com/test", payload={"ok": True}, repeat=True)
+
+        await endpoint.request("post", subpath="test")
+        session = endpoint.session()
+        await endpoint.request("post", subpath="test")
+
+        assert endpoint.session() is session
+        assert session.connector.limit == 7
+
+    await endpoint.close_session()
+    assert session.closed
+
+    # a closed session gets replaced by a new one
+    assert endpoint.session() is not session
+    await endpoint.close_session()
+
+
+def test_read_endpoint_config_with_connection_pool(tmpdir):
+    endpoints_file = tmpdir.join("endpoints.yml")
+    endpoints_file.write(
+        "action_endpoint:\n"
+        "  url: http://localhost:5055/webhook\n"
+        "  connection_limit: 20\n"
+        "  connection_limit_per_host: 10\n"
+        "  keepalive_timeout: 30\n"
+    )
+
+    endpoint = read_endpoint_config(endpoints_file.strpath, "action_endpoint")
+
+    assert endpoint.connection_limit == 20
+    assert endpoint.connection_limit_per_host == 10
+    assert endpoint.keepalive_timeout == 30
+    assert endpoint.kwargs == {}